@@ -15,6 +15,7 @@ from contextlib import asynccontextmanager
 
 # FastAPI imports
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
@@ -23,6 +24,7 @@ from pydantic import BaseModel
 from processors.ocr_processor import UnifiedOCRProcessor
 from validation.criteria.criteria_validator import CriteriaValidator
 from config.database import db
+from config.settings import settings
 from response_simplifier import format_api_response
 
 # Configure logging
@@ -51,9 +53,12 @@ async def lifespan(app: FastAPI):
     
     # Initialize components
     global ocr_processor, criteria_validator
+    ocr_processor = None
     
     try:
         ocr_processor = UnifiedOCRProcessor()
+        if settings.EASYOCR_PRELOAD:
+            ocr_processor.preload_models()
         criteria_validator = CriteriaValidator()
         logger.info("✅ System components initialized successfully")
         yield
@@ -61,6 +66,8 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ System initialization failed: {str(e)}")
         yield
     finally:
+        if ocr_processor:
+            ocr_processor.close()
         logger.info("🔄 Shutting down NAAC Validation System")
 
 # Create FastAPI application
@@ -99,6 +106,13 @@ def _cleanup_file(file_path: str):
     except Exception as e:
         logger.warning(f"File cleanup failed: {str(e)}")
 
+def _row_as_text(row: Dict[str, Any]) -> str:
+    """Render a structured spreadsheet row as "column: value" lines for validation"""
+    return '\n'.join(
+        f"{key}: {value}" for key, value in row.items()
+        if not key.startswith('_') and value is not None
+    )
+
 # ==========================================
 # CORE API ENDPOINTS
 # ==========================================
@@ -127,7 +141,7 @@ async def extract_text_from_document(
     
     try:
         temp_file_path = _save_uploaded_file(file)
-        extraction_result = ocr_processor.extract_text(temp_file_path, use_ocr=use_ocr)
+        extraction_result = await ocr_processor.extract_text_async(temp_file_path, use_ocr=use_ocr)
         
         return {
             "success": True,
@@ -136,6 +150,7 @@ async def extract_text_from_document(
                 "text": extraction_result.get("text", ""),
                 "text_length": len(extraction_result.get("text", "")),
                 "extraction_method": extraction_result.get("ocr_method", "direct"),
+                "page_index": extraction_result.get("page_index", []),
                 "filename": file.filename
             }
         }
@@ -161,31 +176,44 @@ async def validate_single_record(
         temp_file_path = _save_uploaded_file(file)
         
         # Get database record
-        db_record = db.get_criteria_record(criteria_code, record_id)
+        db_record = await run_in_threadpool(db.get_criteria_record, criteria_code, record_id)
         if not db_record:
             raise HTTPException(
                 status_code=404,
                 detail=f"No record found for criteria {criteria_code}, record_id {record_id}"
             )
         
-        # Extract text
-        extraction_result = ocr_processor.extract_text(temp_file_path, use_ocr=True)
+        # Extract text, stopping OCR once the record's required fields have been found
+        is_complete = None
+        if settings.VALIDATION_EARLY_EXIT:
+            is_complete = criteria_validator.required_fields_matcher(criteria_code, db_record)
+        extraction_result = await ocr_processor.extract_text_async(
+            temp_file_path, use_ocr=True, is_complete=is_complete
+        )
         if not extraction_result.get("text"):
             raise HTTPException(
                 status_code=400,
                 detail="Could not extract text from uploaded file"
             )
         
-        # Validate using criteria validator
-        validation_result = criteria_validator.validate_criteria_document(
-            criteria_code, db_record, extraction_result["text"]
+        # Validate using criteria validator (LLM call, kept off the event loop)
+        validation_result = await run_in_threadpool(
+            criteria_validator.validate_criteria_document,
+            criteria_code, db_record, extraction_result["text"], extraction_result.get("page_index")
         )
         
         # Create response structure for simplification
         original_response = {
             "success": True,
             "message": f"Validation completed for {criteria_code}",
-            "data": {"validation_result": validation_result}
+            "data": {
+                "validation_result": validation_result,
+                "extraction_info": {
+                    "pages_processed": extraction_result.get("pages_processed"),
+                    "early_exit": extraction_result.get("early_exit", False),
+                    "pages_skipped": extraction_result.get("pages_skipped", [])
+                }
+            }
         }
         
         # Return simplified response
@@ -215,7 +243,7 @@ async def validate_all_records(
         temp_file_path = _save_uploaded_file(file)
         
         # Get records for criteria
-        records = db.get_records_by_criteria(criteria_code, limit=max_records)
+        records = await run_in_threadpool(db.get_records_by_criteria, criteria_code, limit=max_records)
         if not records:
             raise HTTPException(
                 status_code=404,
@@ -223,24 +251,44 @@ async def validate_all_records(
             )
         
         # Extract text
-        extraction_result = ocr_processor.extract_text(temp_file_path, use_ocr=True)
+        extraction_result = await ocr_processor.extract_text_async(temp_file_path, use_ocr=True)
         if not extraction_result.get("text"):
             raise HTTPException(
                 status_code=400,
                 detail="Could not extract text from uploaded file"
             )
         
+        # Spreadsheets and PDF/DOCX tables: join records to rows by key so each record
+        # is validated against its own row instead of the whole flattened text
+        row_join = None
+        if Path(temp_file_path).suffix.lower() in ['.xlsx', '.xls', '.pdf', '.docx']:
+            structured = await ocr_processor.extract_records_async(
+                temp_file_path, criteria_validator.get_column_aliases(criteria_code), extraction_result
+            )
+            if structured["rows"]:
+                row_join = criteria_validator.join_records_with_rows(criteria_code, records, structured["rows"])
+        
         # Validate against each record
         validation_results = []
         decision_counts = {"ACCEPT": 0, "FLAG_FOR_REVIEW": 0, "REJECT": 0}
         
         for idx, record in enumerate(records):
-            result = criteria_validator.validate_criteria_document(
-                criteria_code, record, extraction_result["text"]
-            )
+            row = row_join["matches"][idx]["row"] if row_join else None
+            if row:
+                result = await run_in_threadpool(
+                    criteria_validator.validate_criteria_document, criteria_code, record, _row_as_text(row)
+                )
+            else:
+                result = await run_in_threadpool(
+                    criteria_validator.validate_criteria_document,
+                    criteria_code, record, extraction_result["text"], extraction_result.get("page_index")
+                )
             
             result["record_index"] = idx + 1
             result["database_record"] = record
+            result["matched_row"] = {
+                key.lstrip('_'): value for key, value in row.items() if key in ("_sheet", "_page", "_row")
+            } if row else None
             validation_results.append(result)
             
             # Count decisions
@@ -267,7 +315,12 @@ async def validate_all_records(
                     "decision_breakdown": decision_counts
                 },
                 "best_match": best_match,
-                "top_matches": filtered_results[:5]
+                "top_matches": filtered_results[:5],
+                "extraction_info": {
+                    "structured_join": {
+                        key: value for key, value in row_join.items() if key != "matches"
+                    } if row_join else None
+                }
             }
         }
         
@@ -304,7 +357,7 @@ async def list_supported_criteria():
 async def get_records_by_criteria(criteria_code: str, limit: int = 10):
     """Get records for a specific criteria"""
     try:
-        records = db.get_records_by_criteria(criteria_code, limit)
+        records = await run_in_threadpool(db.get_records_by_criteria, criteria_code, limit)
         return {
             "criteria_code": criteria_code,
             "records": records,
@@ -318,7 +371,7 @@ async def get_records_by_criteria(criteria_code: str, limit: int = 10):
 async def get_database_status():
     """Get database connection status"""
     try:
-        status = db.get_database_status()
+        status = await run_in_threadpool(db.get_database_status)
         return status
     except Exception as e:
         logger.error(f"Database status error: {str(e)}")
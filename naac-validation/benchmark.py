@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+NAAC Validation System - Extraction Benchmarks
+
+Measures throughput of the document extraction pipeline on sample uploads.
+By default the sample PDFs in ../naac-validator/uploads are used.
+
+Usage:
+    python benchmark.py cpu-ocr                     # EasyOCR pages/sec per worker count
+    python benchmark.py cpu-ocr --workers 1 2 4 8   # Custom worker counts
+    python benchmark.py cpu-ocr --pdf a.pdf b.pdf   # Custom documents
+    python benchmark.py excel                       # Streaming vs pandas Excel extraction
+    python benchmark.py excel --rows 20000          # Larger synthetic data template
+    python benchmark.py excel --file data.xlsx      # Custom workbook
+    python benchmark.py health-load                 # /health latency during extraction load
+    python benchmark.py health-load --url http://localhost:8000 --uploads 8 --seconds 20
+    python benchmark.py preprocess                  # OCR time/confidence with and without OpenCV preprocessing
+    python benchmark.py preprocess --dpi 300 --skew 0 --engines tesseract
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+import tempfile
+import tracemalloc
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+SAMPLE_DIR = Path(__file__).parent.parent / "naac-validator" / "uploads"
+
+def get_sample_pdfs(pdf_args):
+    """Resolve the PDFs to benchmark"""
+    if pdf_args:
+        return [Path(p) for p in pdf_args]
+    return sorted(SAMPLE_DIR.glob("*.pdf"))
+
+def render_pages(pdf_paths, scale=2.0):
+    """Render every page of the given PDFs to PIL images"""
+    import fitz
+    from PIL import Image
+
+    images = []
+    for pdf_path in pdf_paths:
+        with fitz.open(str(pdf_path)) as doc:
+            for page in doc:
+                pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale))
+                images.append(Image.frombytes("RGB", (pix.width, pix.height), pix.samples))
+    return images
+
+def benchmark_cpu_ocr(args):
+    """Pages/sec of the EasyOCR process pool for each worker count"""
+    from processors.cpu_ocr_pool import CPUOCRPool
+
+    pdf_paths = get_sample_pdfs(args.pdf)
+    images = render_pages(pdf_paths)
+    print(f"📄 {len(images)} pages from {len(pdf_paths)} PDFs")
+    print(f"{'workers':>8} {'seconds':>10} {'pages/sec':>10} {'per worker':>11}")
+
+    for workers in args.workers:
+        pool = CPUOCRPool(workers)
+        try:
+            pool.warm_up()  # Model loading is excluded from the timing
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(pool.ocr_page, images))
+            elapsed = time.perf_counter() - start
+        finally:
+            pool.shutdown()
+
+        pages_per_sec = len(images) / elapsed
+        print(f"{workers:>8} {elapsed:>10.2f} {pages_per_sec:>10.2f} {pages_per_sec / workers:>11.2f}")
+
+def write_sample_workbook(path, rows):
+    """Write a synthetic 2.1.1-style enrolment template with the given number of rows"""
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("2.1.1")
+    sheet.append(["Year", "Programme Name", "Programme Code", "Seats Sanctioned", "Students Admitted"])
+    for row in range(rows):
+        sheet.append([2019 + row % 5, f"Programme {row % 40}", f"PRG{row:05d}", 60, 40 + row % 20])
+    workbook.save(path)
+
+def pandas_excel_text(excel_path):
+    """The previous extraction path: every sheet loaded into a DataFrame"""
+    import pandas as pd
+
+    engine = 'openpyxl' if excel_path.suffix.lower() == '.xlsx' else 'xlrd'
+    all_sheets = pd.read_excel(excel_path, sheet_name=None, engine=engine)
+
+    text_parts = []
+    for sheet_name, df in all_sheets.items():
+        text_parts.append(f"=== Sheet: {sheet_name} ===")
+        for col in df.columns:
+            text_parts.append(f"Column: {col}")
+            for value in df[col].dropna():
+                text_parts.append(str(value))
+    return '\n'.join(text_parts)
+
+def measure(func, *args):
+    """Run func, returning (seconds, peak traced memory in MB, result)"""
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+
+    # Separate traced run: tracemalloc itself slows allocation-heavy code several times over
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), result
+
+def benchmark_excel(args):
+    """Time and peak memory of streaming vs pandas Excel text extraction"""
+    from processors.excel_reader import extract_excel_text
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.file:
+            excel_paths = [Path(f) for f in args.file]
+        else:
+            excel_paths = [Path(tmp_dir) / f"template_{args.rows}.xlsx"]
+            write_sample_workbook(excel_paths[0], args.rows)
+
+        print(f"{'file':<30} {'extractor':<10} {'seconds':>9} {'peak MB':>9} {'chars':>10}")
+        for excel_path in excel_paths:
+            runs = [
+                ("pandas", pandas_excel_text, excel_path),
+                ("streaming", lambda path: extract_excel_text(path)["text"], excel_path),
+            ]
+            for name, func, path in runs:
+                elapsed, peak_mb, text = measure(func, path)
+                print(f"{excel_path.name[:30]:<30} {name:<10} {elapsed:>9.2f} {peak_mb:>9.1f} {len(text):>10}")
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+async def poll_health(client, seconds, interval):
+    """Request /health repeatedly for the given time, returning latencies in ms"""
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get("/health")
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+async def upload_loop(client, pdf_paths, stop_event, completed):
+    """Upload documents to /extract-text back to back until stopped"""
+    index = 0
+    while not stop_event.is_set():
+        pdf_path = pdf_paths[index % len(pdf_paths)]
+        with open(pdf_path, "rb") as f:
+            response = await client.post(
+                "/extract-text",
+                files={"file": (pdf_path.name, f.read(), "application/pdf")},
+                data={"use_ocr": "true"}
+            )
+        response.raise_for_status()
+        completed.append(pdf_path.name)
+        index += 1
+
+async def run_health_load(args):
+    import httpx
+
+    pdf_paths = get_sample_pdfs(args.pdf)
+    async with httpx.AsyncClient(base_url=args.url, timeout=300) as client:
+        idle = await poll_health(client, args.seconds, args.interval)
+
+        stop_event = asyncio.Event()
+        completed = []
+        uploaders = [
+            asyncio.create_task(upload_loop(client, pdf_paths, stop_event, completed))
+            for _ in range(args.uploads)
+        ]
+        loaded = await poll_health(client, args.seconds, args.interval)
+        stop_event.set()
+        await asyncio.gather(*uploaders)
+
+    print(f"📄 {len(completed)} extractions completed by {args.uploads} concurrent uploaders")
+    print(f"{'phase':<12} {'requests':>9} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for phase, latencies in [("idle", idle), ("extracting", loaded)]:
+        print(f"{phase:<12} {len(latencies):>9} {statistics.median(latencies):>9.1f} "
+              f"{percentile(latencies, 99):>9.1f} {max(latencies):>9.1f}")
+
+def simulate_scans(pdf_paths, dpi, skew, seed=0):
+    """Render non-blank pages as grayscale "scans": rotated by skew degrees, dark border, sensor noise"""
+    import cv2
+    import fitz
+    import numpy as np
+
+    rng = np.random.RandomState(seed)
+    scans = []
+    for pdf_path in pdf_paths:
+        with fitz.open(str(pdf_path)) as doc:
+            for page in doc:
+                if not page.get_text().strip() and not page.get_images():
+                    continue
+                pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+                image = np.frombuffer(pix.samples, np.uint8).reshape(pix.height, pix.width)
+                matrix = cv2.getRotationMatrix2D((pix.width / 2, pix.height / 2), skew, 1.0)
+                image = cv2.warpAffine(image, matrix, (pix.width, pix.height), borderValue=255)
+                border = dpi // 5
+                image = cv2.copyMakeBorder(image, border, border, border, border, cv2.BORDER_CONSTANT, value=30)
+                noise = rng.normal(0, 10, image.shape)
+                image = np.clip(image + noise, 0, 255).astype(np.uint8)
+                scans.append((f"{pdf_path.name[:12]}:p{page.number + 1}", image))
+    return scans
+
+def benchmark_preprocess(args):
+    """OCR time and confidence on simulated scans, original vs OpenCV-preprocessed"""
+    from PIL import Image
+    from processors.image_preprocessing import preprocess_page
+    from processors.ocr_processor import UnifiedOCRProcessor
+
+    pdf_paths = get_sample_pdfs(args.pdf)
+    scans = simulate_scans(pdf_paths, args.dpi, args.skew)
+    print(f"📄 {len(scans)} pages from {len(pdf_paths)} PDFs, scanned at {args.dpi} DPI with {args.skew}° skew")
+
+    print(f"{'page':<18} {'pixels in':>10} {'pixels out':>11} {'saved':>6} {'deskew':>7} {'ms':>7}")
+    prepared = []
+    for name, image in scans:
+        processed, info = preprocess_page(Image.fromarray(image), dpi=args.dpi)
+        prepared.append((name, Image.fromarray(image), processed))
+        pixels_in = info["input_size"][0] * info["input_size"][1]
+        pixels_out = info["output_size"][0] * info["output_size"][1]
+        print(f"{name:<18} {pixels_in:>10} {pixels_out:>11} {info['pixel_reduction']:>6.0%} "
+              f"{info['deskew_degrees']:>7.1f} {info['ms']:>7.1f}")
+
+    processor = UnifiedOCRProcessor()
+    engines = [engine for engine in args.engines if engine in processor.ocr_methods]
+    if not engines:
+        print(f"⚠️ None of {', '.join(args.engines)} is available; install Tesseract or EasyOCR for OCR deltas")
+        processor.close()
+        return
+
+    print(f"\n{'engine':<10} {'input':<13} {'seconds':>8} {'mean conf':>10} {'escalated':>10}")
+    try:
+        for engine in engines:
+            ocr_page = processor._get_page_ocr_function(engine)
+            for label, column in (("original", 1), ("preprocessed", 2)):
+                start = time.perf_counter()
+                page_results = [ocr_page(i, page[column], {}) for i, page in enumerate(prepared)]
+                elapsed = time.perf_counter() - start
+                # Scored as the OCR pipeline scores pages (engines report no confidence for empty reads)
+                confidences = [processor._score_page(text, confidence) for text, confidence in page_results]
+                escalated = sum(1 for (text, _), confidence in zip(page_results, confidences)
+                                if processor.ocr_router.escalation_reason(text, confidence))
+                print(f"{engine:<10} {label:<13} {elapsed:>8.2f} {statistics.mean(confidences):>10.3f} "
+                      f"{escalated:>6}/{len(confidences)}")
+    finally:
+        processor.close()
+
+def benchmark_health_load(args):
+    """p50/p99 of /health on a running server, idle and while documents are being extracted"""
+    asyncio.run(run_health_load(args))
+
+def main():
+    """Main benchmark runner"""
+    parser = argparse.ArgumentParser(description="NAAC Validation System Benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    cpu_ocr = subparsers.add_parser("cpu-ocr", help="EasyOCR process pool throughput")
+    cpu_ocr.add_argument("--pdf", nargs="*", help="PDF files to OCR (default: sample uploads)")
+    cpu_ocr.add_argument("--workers", nargs="*", type=int, default=[1, 2, 4], help="Worker counts to compare")
+    cpu_ocr.set_defaults(func=benchmark_cpu_ocr)
+
+    excel = subparsers.add_parser("excel", help="Streaming vs pandas Excel extraction")
+    excel.add_argument("--file", nargs="*", help="Workbooks to extract (default: synthetic template)")
+    excel.add_argument("--rows", type=int, default=5000, help="Rows in the synthetic template")
+    excel.set_defaults(func=benchmark_excel)
+
+    health_load = subparsers.add_parser("health-load", help="/health latency during extraction load")
+    health_load.add_argument("--url", default="http://localhost:8000", help="Running API server")
+    health_load.add_argument("--pdf", nargs="*", help="PDF files to upload (default: sample uploads)")
+    health_load.add_argument("--uploads", type=int, default=4, help="Concurrent uploaders")
+    health_load.add_argument("--seconds", type=float, default=10, help="Duration of each phase")
+    health_load.add_argument("--interval", type=float, default=0.05, help="Pause between /health requests")
+    health_load.set_defaults(func=benchmark_health_load)
+
+    preprocess = subparsers.add_parser("preprocess", help="OCR with and without OpenCV preprocessing")
+    preprocess.add_argument("--pdf", nargs="*", help="PDF files to scan (default: sample uploads)")
+    preprocess.add_argument("--dpi", type=int, default=400, help="Resolution of the simulated scans")
+    preprocess.add_argument("--skew", type=float, default=2.0, help="Rotation of the simulated scans in degrees")
+    preprocess.add_argument("--engines", nargs="*", default=["tesseract", "easyocr"], help="Local OCR engines to compare")
+    preprocess.set_defaults(func=benchmark_preprocess)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
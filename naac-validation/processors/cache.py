@@ -0,0 +1,123 @@
+"""
+Persistent result cache for document extraction
+SQLite-backed key/value store with size-bounded LRU eviction and TTL expiry
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Union, Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+def _json_default(obj):
+    """Serialise numpy scalars (e.g. EasyOCR confidences) and other stragglers"""
+    if hasattr(obj, "item"):
+        return obj.item()
+    return str(obj)
+
+class ResultCache:
+    """Thread-safe on-disk cache of JSON-serialisable result dicts"""
+
+    def __init__(self, db_path: Union[str, Path], table: str = "extraction_results",
+                 max_size_mb: float = 500, ttl_hours: float = 168):
+        self.db_path = Path(db_path)
+        self.table = table
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.ttl_seconds = ttl_hours * 3600
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.table}_last_access ON {self.table} (last_access)"
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached value for key, or None if missing or expired"""
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                value, created_at = row
+                if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                    self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                    return None
+
+                self._conn.execute(
+                    f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (now, key)
+                )
+            return json.loads(value)
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Cache read failed for {self.table}: {str(e)}")
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]):
+        """Store value under key and evict least recently used entries over the size limit"""
+        now = time.time()
+        try:
+            payload = json.dumps(value, default=_json_default)
+            with self._lock:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, size, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, len(payload), now, now)
+                )
+                self._evict(now)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Cache write failed for {self.table}: {str(e)}")
+
+    def _evict(self, now: float):
+        """Drop expired entries, then LRU entries until the table fits the size budget"""
+        if self.ttl_seconds:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+
+        total_size = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+
+        rows = self._conn.execute(
+            f"SELECT key, size FROM {self.table} ORDER BY last_access ASC"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total_size <= self.max_size_bytes:
+                break
+            evicted.append((key,))
+            total_size -= size
+
+        self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", evicted)
+        logger.debug(f"Evicted {len(evicted)} entries from {self.table}")
+
+    def clear(self):
+        """Remove every entry from the cache"""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get entry count and size of the cache"""
+        with self._lock:
+            entries, total_size = self._conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "size_mb": round(total_size / (1024 * 1024), 2),
+            "max_size_mb": round(self.max_size_bytes / (1024 * 1024), 2),
+            "ttl_hours": self.ttl_seconds / 3600
+        }
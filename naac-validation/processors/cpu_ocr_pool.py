@@ -0,0 +1,76 @@
+"""
+Process pool backend for CPU-bound OCR
+Farms page images out to warm worker processes that each hold their own EasyOCR reader
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Tuple, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Reader owned by each worker process, loaded once by the pool initializer
+_worker_reader = None
+
+def _init_worker(gpu: bool):
+    """Load EasyOCR models once when a worker process starts"""
+    global _worker_reader
+    import easyocr
+    _worker_reader = easyocr.Reader(['en'], gpu=gpu, verbose=False)
+
+def _warm_up_worker() -> int:
+    """No-op task used to force worker start-up (and model loading)"""
+    return os.getpid()
+
+def _ocr_page_in_worker(image_array, batch_size: int) -> Tuple[str, Optional[float]]:
+    """OCR one page image inside a worker process"""
+    import numpy as np
+
+    page_text = []
+    page_confidences = []
+    for (bbox, text, confidence) in _worker_reader.readtext(image_array, batch_size=batch_size):
+        if confidence > 0.5:  # Filter low confidence results
+            page_text.append(text)
+            page_confidences.append(confidence)
+
+    return ' '.join(page_text), float(np.mean(page_confidences)) if page_confidences else None
+
+class CPUOCRPool:
+    """Pool of worker processes running EasyOCR in parallel across CPU cores"""
+
+    def __init__(self, max_workers: int, gpu: bool = False, batch_size: int = 8):
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        # Spawned (not forked) workers: forking a threaded server process holding torch state can deadlock
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(gpu,)
+        )
+        logger.info(f"✅ CPU OCR process pool started with {max_workers} workers")
+
+    def warm_up(self):
+        """Start every worker and load its models before the first real page arrives"""
+        futures = [self._executor.submit(_warm_up_worker) for _ in range(self.max_workers)]
+        wait(futures)
+        for future in futures:
+            future.result()  # Surface model loading errors here rather than mid-request
+
+    def ocr_page(self, image: Any) -> Tuple[str, Optional[float]]:
+        """OCR a page image (PIL image, numpy array or file path) in a worker process"""
+        import numpy as np
+
+        if isinstance(image, Path):
+            image_input = str(image)
+        elif isinstance(image, (str, np.ndarray)):
+            image_input = image
+        else:
+            image_input = np.array(image)
+        return self._executor.submit(_ocr_page_in_worker, image_input, self.batch_size).result()
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,128 @@
+"""
+Streaming DOCX reader
+Reads paragraphs and tables from word/document.xml with iterparse, element
+by element, instead of converting the document with LibreOffice or loading
+the whole XML tree
+"""
+import logging
+import re
+import zipfile
+from pathlib import Path
+from typing import Iterator, Tuple, List, Any, Dict
+from xml.etree.ElementTree import iterparse
+
+logger = logging.getLogger(__name__)
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+PARAGRAPH = f"{WORD_NAMESPACE}p"
+TABLE = f"{WORD_NAMESPACE}tbl"
+TABLE_ROW = f"{WORD_NAMESPACE}tr"
+TABLE_CELL = f"{WORD_NAMESPACE}tc"
+TEXT = f"{WORD_NAMESPACE}t"
+TAB = f"{WORD_NAMESPACE}tab"
+BREAK = f"{WORD_NAMESPACE}br"
+CARRIAGE_RETURN = f"{WORD_NAMESPACE}cr"
+# Where Word last paginated the document when it was saved
+RENDERED_PAGE_BREAK = f"{WORD_NAMESPACE}lastRenderedPageBreak"
+BREAK_TYPE = f"{WORD_NAMESPACE}type"
+
+def iter_docx_blocks(docx_path: Path) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield the body of a DOCX in reading order
+
+    Blocks are ("paragraph", text), ("table", rows) with rows as lists of
+    cell strings, and ("page_break", None) at manual page breaks and at the
+    page boundaries Word recorded when the file was last saved. Tables
+    nested in a cell are flattened into that cell's text.
+    """
+    with zipfile.ZipFile(docx_path) as archive:
+        with archive.open("word/document.xml") as xml_stream:
+            # Each open table: its finished rows, the current row's cells, the current cell's paragraphs
+            tables: List[Dict[str, List]] = []
+
+            for event, element in iterparse(xml_stream, events=("start", "end")):
+                tag = element.tag
+                if event == "start":
+                    if tag == TABLE:
+                        tables.append({"rows": [], "cells": [], "paragraphs": []})
+                    elif tag == TABLE_ROW and tables:
+                        tables[-1]["cells"] = []
+                    elif tag == TABLE_CELL and tables:
+                        tables[-1]["paragraphs"] = []
+                    continue
+
+                if tag == PARAGRAPH:
+                    text, break_before, break_after = _paragraph_text(element)
+                    if tables:
+                        tables[-1]["paragraphs"].append(text)
+                    else:
+                        if break_before:
+                            yield "page_break", None
+                        if text.strip():
+                            yield "paragraph", text
+                        if break_after:
+                            yield "page_break", None
+                    element.clear()
+                elif tag == TABLE_CELL and tables:
+                    cell_text = ' '.join(tables[-1]["paragraphs"])
+                    tables[-1]["cells"].append(re.sub(r'\s+', ' ', cell_text).strip())
+                elif tag == TABLE_ROW and tables:
+                    tables[-1]["rows"].append(tables[-1]["cells"])
+                elif tag == TABLE and tables:
+                    rows = [row for row in tables.pop()["rows"] if any(row)]
+                    if tables:
+                        tables[-1]["paragraphs"].extend(' | '.join(row) for row in rows)
+                    elif rows:
+                        yield "table", rows
+                    element.clear()
+
+def _paragraph_text(paragraph) -> Tuple[str, bool, bool]:
+    """Text of a paragraph and whether a page break comes before or after its text"""
+    parts = []
+    break_before = break_after = False
+    for node in paragraph.iter():
+        if node.tag == TEXT:
+            parts.append(node.text or "")
+        elif node.tag == TAB:
+            parts.append("\t")
+        elif node.tag == CARRIAGE_RETURN or (node.tag == BREAK and node.get(BREAK_TYPE) not in ("page", "column")):
+            parts.append("\n")
+        elif node.tag == RENDERED_PAGE_BREAK or (node.tag == BREAK and node.get(BREAK_TYPE) == "page"):
+            if ''.join(parts).strip():
+                break_after = True
+            else:
+                break_before = True
+    return ''.join(parts), break_before, break_after
+
+def extract_docx_text(docx_path: Path) -> Dict[str, Any]:
+    """
+    Extract DOCX text page by page, with tables kept as rows and cells
+
+    Table rows are written to the text as " | "-separated lines. Pages follow
+    the document's page breaks (a document saved without pagination info is
+    a single page). Returns {"pages": [(page number, text)], "tables":
+    [{"page", "rows"}], "paragraphs"} where tables use the same shape as PDF
+    tables so they can be turned into structured rows.
+    """
+    pages: List[Tuple[int, str]] = []
+    tables: List[Dict[str, Any]] = []
+    page_parts: List[str] = []
+    paragraph_count = 0
+
+    for kind, value in iter_docx_blocks(docx_path):
+        if kind == "page_break":
+            # Consecutive markers (manual break + rendered break) make one boundary
+            if page_parts:
+                pages.append((len(pages) + 1, '\n'.join(page_parts)))
+                page_parts = []
+        elif kind == "paragraph":
+            page_parts.append(value)
+            paragraph_count += 1
+        else:
+            tables.append({"page": len(pages) + 1, "rows": value})
+            page_parts.extend(' | '.join(row) for row in value)
+
+    if page_parts:
+        pages.append((len(pages) + 1, '\n'.join(page_parts)))
+
+    return {"pages": pages, "tables": tables, "paragraphs": paragraph_count}
@@ -0,0 +1,308 @@
+"""
+Streaming Excel reader
+Reads workbook rows incrementally (openpyxl read-only mode for .xlsx, xlrd
+on-demand sheets for .xls) instead of loading whole sheets into DataFrames
+"""
+import logging
+import re
+from pathlib import Path
+from typing import Iterator, Tuple, List, Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+    logger.warning("openpyxl not available. Install with: pip install openpyxl")
+
+try:
+    import xlrd
+    XLRD_AVAILABLE = True
+except ImportError:
+    XLRD_AVAILABLE = False
+
+# Rows scanned for the table header in structured mode (templates often start with title rows)
+HEADER_SEARCH_ROWS = 20
+
+# Words ignored when matching a header against a column name ("Name of the Project" ~ name_of_project)
+HEADER_STOPWORDS = {"the", "of", "a", "an", "in", "for", "and", "to"}
+HEADER_SYNONYMS = {"no": "number", "num": "number", "yr": "year", "dept": "department"}
+
+def iter_workbook(excel_path: Path) -> Iterator[Tuple[str, Iterator[Tuple[Any, ...]]]]:
+    """Yield (sheet name, row iterator) for every sheet; empty cells are None"""
+    if excel_path.suffix.lower() == '.xls':
+        yield from _iter_xls_workbook(excel_path)
+    else:
+        yield from _iter_xlsx_workbook(excel_path)
+
+def _iter_xlsx_workbook(excel_path: Path) -> Iterator[Tuple[str, Iterator[Tuple[Any, ...]]]]:
+    if not OPENPYXL_AVAILABLE:
+        raise ImportError("openpyxl is required to read .xlsx files")
+
+    # Read-only mode streams rows from the sheet XML instead of building every cell object
+    workbook = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        for worksheet in workbook.worksheets:
+            yield worksheet.title, worksheet.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+def _iter_xls_workbook(excel_path: Path) -> Iterator[Tuple[str, Iterator[Tuple[Any, ...]]]]:
+    if not XLRD_AVAILABLE:
+        raise ImportError("xlrd is required to read .xls files. Install with: pip install xlrd")
+
+    # on_demand loads one sheet at a time rather than the whole workbook
+    book = xlrd.open_workbook(str(excel_path), on_demand=True)
+    try:
+        for sheet_index in range(book.nsheets):
+            sheet = book.sheet_by_index(sheet_index)
+            yield sheet.name, _iter_xls_rows(book, sheet)
+            book.unload_sheet(sheet_index)
+    finally:
+        book.release_resources()
+
+def _iter_xls_rows(book, sheet) -> Iterator[Tuple[Any, ...]]:
+    for row_index in range(sheet.nrows):
+        yield tuple(_xls_cell_value(book, cell) for cell in sheet.row(row_index))
+
+def _xls_cell_value(book, cell) -> Any:
+    """Convert an xlrd cell to the Python value openpyxl would give"""
+    if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK, xlrd.XL_CELL_ERROR):
+        return None
+    if cell.ctype == xlrd.XL_CELL_NUMBER:
+        return int(cell.value) if cell.value.is_integer() else cell.value
+    if cell.ctype == xlrd.XL_CELL_DATE:
+        return xlrd.xldate.xldate_as_datetime(cell.value, book.datemode)
+    if cell.ctype == xlrd.XL_CELL_BOOLEAN:
+        return bool(cell.value)
+    return cell.value
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and value == "")
+
+def normalize_headers(header_row: Tuple[Any, ...]) -> List[str]:
+    """Column names as pandas would label them: "Unnamed: N" for blanks, ".N" suffixes for duplicates"""
+    headers = []
+    seen: Dict[str, int] = {}
+    for index, value in enumerate(header_row):
+        name = f"Unnamed: {index}" if _is_empty(value) else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        headers.append(name)
+    return headers
+
+def extract_excel_text(excel_path: Path, max_rows: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Extract workbook text sheet by sheet in the "=== Sheet: X ===" / "Column: Y" format
+
+    Rows are streamed and only the cell strings are kept, column by column.
+    Sheets longer than max_rows data rows are truncated.
+    Returns {"text", "sheets", "rows", "truncated_sheets", "sheet_index"} where
+    sheet_index gives each sheet's [start, end) character span in the text.
+    """
+    text_parts = []
+    sheet_index = []
+    offset = 0
+    sheet_count = 0
+    total_rows = 0
+    truncated_sheets = []
+
+    for sheet_name, rows in iter_workbook(excel_path):
+        sheet_count += 1
+        sheet_start = len(text_parts)
+        text_parts.append(f"=== Sheet: {sheet_name} ===")
+
+        headers: List[str] = []
+        columns: List[List[str]] = []
+        for row_index, row in enumerate(rows):
+            if row_index == 0:
+                headers = normalize_headers(row)
+                columns = [[] for _ in headers]
+                continue
+
+            if max_rows and row_index > max_rows:
+                truncated_sheets.append(sheet_name)
+                break
+
+            total_rows += 1
+            # Cells past the header row's width get their own unnamed columns
+            while len(columns) < len(row):
+                headers.append(f"Unnamed: {len(headers)}")
+                columns.append([])
+
+            for column, value in zip(columns, row):
+                if not _is_empty(value):
+                    column.append(str(value))
+
+        # Read-only sheets pad rows to the sheet's used width; like pandas, drop
+        # trailing columns with neither a header nor any values
+        while columns and not columns[-1] and headers[-1] == f"Unnamed: {len(headers) - 1}":
+            headers.pop()
+            columns.pop()
+
+        for header, values in zip(headers, columns):
+            text_parts.append(f"Column: {header}")
+            text_parts.extend(values)
+
+        if sheet_start:
+            offset += 1  # Newline after the previous sheet
+        sheet_length = sum(len(part) for part in text_parts[sheet_start:]) + len(text_parts) - sheet_start - 1
+        sheet_index.append({"sheet": sheet_name, "start": offset, "end": offset + sheet_length})
+        offset += sheet_length
+
+    return {
+        "text": '\n'.join(text_parts),
+        "sheets": sheet_count,
+        "rows": total_rows,
+        "truncated_sheets": truncated_sheets,
+        "sheet_index": sheet_index
+    }
+
+def normalize_header_name(value: Any) -> str:
+    """Snake-case a header cell, e.g. "Name of the Project" -> name_of_the_project"""
+    return re.sub(r'[^a-z0-9]+', '_', str(value).lower()).strip('_')
+
+def _header_tokens(name: str) -> frozenset:
+    tokens = (HEADER_SYNONYMS.get(token, token) for token in name.split('_'))
+    return frozenset(token for token in tokens if token and token not in HEADER_STOPWORDS)
+
+def map_headers(header_row: Tuple[Any, ...], column_aliases: Dict[str, List[str]]) -> Dict[int, str]:
+    """
+    Map header cell positions to column names
+
+    A header maps to a column when it equals the column name or one of its
+    aliases after normalisation, or failing that when every significant word
+    of the column name appears in the header. Each column is used at most once.
+    """
+    normalized = {
+        index: normalize_header_name(value)
+        for index, value in enumerate(header_row) if not _is_empty(value)
+    }
+    exact_names = {
+        normalize_header_name(alias): column
+        for column, aliases in column_aliases.items()
+        for alias in [column] + list(aliases)
+    }
+
+    mapping: Dict[int, str] = {}
+    for index, name in normalized.items():
+        column = exact_names.get(name)
+        if column and column not in mapping.values():
+            mapping[index] = column
+
+    for index, name in normalized.items():
+        if index in mapping:
+            continue
+        header_tokens = _header_tokens(name)
+        for column in column_aliases:
+            column_tokens = _header_tokens(column)
+            if column not in mapping.values() and column_tokens and column_tokens <= header_tokens:
+                mapping[index] = column
+                break
+
+    return mapping
+
+def _find_header_row(rows: List[Tuple[Any, ...]], column_aliases: Dict[str, List[str]]) -> Optional[int]:
+    """Index of the row that best matches the expected columns, else the first multi-cell row"""
+    best_index, best_score = None, 0
+    for index, row in enumerate(rows):
+        score = len(map_headers(row, column_aliases)) if column_aliases else 0
+        if score > best_score:
+            best_index, best_score = index, score
+    if best_index is not None:
+        return best_index
+
+    for index, row in enumerate(rows):
+        if sum(1 for value in row if not _is_empty(value)) >= 2:
+            return index
+    return None
+
+def _json_cell(value: Any) -> Any:
+    """Keep JSON-native cell values, stringify the rest (dates, times)"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+def extract_excel_rows(excel_path: Path, column_aliases: Optional[Dict[str, List[str]]] = None,
+                       max_rows: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Extract workbook rows as dicts keyed by column name
+
+    Headers matching column_aliases (response_* column -> header variants)
+    are keyed by that column; other headers by their snake-cased text. Each
+    row also carries _sheet, _row (1-based sheet row) and, when the table is
+    split into labelled blocks such as "Year - 1", the current _section.
+    Repeated header rows and blank rows are skipped.
+    Returns {"rows", "sheets": [{"name", "header_row", "columns", "unmapped_headers", "rows"}]}.
+    """
+    column_aliases = column_aliases or {}
+    all_rows: List[Dict[str, Any]] = []
+    sheets = []
+
+    for sheet_name, rows in iter_workbook(excel_path):
+        head = []
+        for row in rows:
+            head.append(row)
+            if len(head) >= HEADER_SEARCH_ROWS:
+                break
+
+        header_index = _find_header_row(head, column_aliases)
+        if header_index is None:
+            sheets.append({"name": sheet_name, "header_row": None, "columns": {}, "unmapped_headers": [], "rows": 0})
+            continue
+
+        header_row = head[header_index]
+        mapping = map_headers(header_row, column_aliases)
+        keys = {
+            index: mapping.get(index, normalize_header_name(value))
+            for index, value in enumerate(header_row) if not _is_empty(value)
+        }
+        header_key = tuple(normalize_header_name(value) for value in header_row if not _is_empty(value))
+
+        section = None
+        for title_row in head[:header_index]:
+            values = [value for value in title_row if not _is_empty(value)]
+            if len(values) == 1:
+                section = str(values[0])
+        # Only templates that label their first block are treated as block-structured
+        uses_sections = section is not None
+
+        sheet_rows = 0
+        row_number = header_index + 1
+        for row in _chain(head[header_index + 1:], rows):
+            row_number += 1
+            values = [value for value in row if not _is_empty(value)]
+            if not values:
+                continue
+            if tuple(normalize_header_name(value) for value in values) == header_key:
+                continue
+            if uses_sections and len(values) == 1 and not _is_empty(row[0]):
+                section = str(values[0])  # Block label between repeated tables
+                continue
+
+            if max_rows and sheet_rows >= max_rows:
+                break
+
+            record = {key: _json_cell(row[index]) for index, key in keys.items() if index < len(row)}
+            record.update({"_sheet": sheet_name, "_row": row_number, "_section": section})
+            all_rows.append(record)
+            sheet_rows += 1
+
+        sheets.append({
+            "name": sheet_name,
+            "header_row": header_index + 1,
+            "columns": {keys[index]: str(header_row[index]) for index in mapping},
+            "unmapped_headers": [str(header_row[index]) for index in keys if index not in mapping],
+            "rows": sheet_rows
+        })
+
+    return {"rows": all_rows, "sheets": sheets}
+
+def _chain(first: List[Tuple[Any, ...]], rest: Iterator[Tuple[Any, ...]]) -> Iterator[Tuple[Any, ...]]:
+    yield from first
+    yield from rest
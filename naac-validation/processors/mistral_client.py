@@ -0,0 +1,274 @@
+"""
+HTTP client for the Mistral vision OCR API
+Pooled keep-alive connections, per-host rate limiting, retries with
+exponential backoff (honouring Retry-After) and a circuit breaker
+"""
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = HTTPX_AVAILABLE
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+OCR_PROMPT = "Extract all text from this image. Provide only the extracted text without any additional commentary or formatting."
+
+class MistralOCRError(Exception):
+    """Raised when a page could not be OCR'd by the Mistral API"""
+
+class CircuitOpenError(MistralOCRError):
+    """Raised without calling the API while the circuit breaker is open"""
+
+class HostRateLimiter:
+    """Thread-safe limiter that spaces requests to a single host evenly"""
+
+    def __init__(self, requests_per_second: float):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """Block until the caller may send its next request"""
+        if not self.min_interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+class CircuitBreaker:
+    """
+    Stops calling a degraded API after repeated failures
+
+    After failure_threshold consecutive failed attempts the circuit opens and
+    calls fail fast. Once reset_timeout has passed a single trial call is let
+    through: success closes the circuit, failure opens it again. A trial that
+    ends with neither (e.g. the page was rejected) must call release_trial so
+    the next call can be the trial.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_progress = False
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None and time.monotonic() - self._opened_at < self.reset_timeout
+
+    def allow_request(self) -> bool:
+        """Whether a call may be attempted now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout and not self._trial_in_progress:
+                self._trial_in_progress = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_progress = False
+
+    def release_trial(self):
+        """Give up the half-open trial slot without recording an outcome"""
+        with self._lock:
+            self._trial_in_progress = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_progress or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_in_progress:
+                    logger.warning(f"Mistral circuit breaker opened after {self._failures} failures")
+                self._opened_at = time.monotonic()
+                self._trial_in_progress = False
+
+    def get_state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+class MistralOCRClient:
+    """Thread-safe client sending page images to the Mistral vision model"""
+
+    def __init__(self, api_key: str, api_url: str, timeout: float, max_connections: int,
+                 requests_per_second: float, max_retries: int, backoff_base: float,
+                 backoff_max: float, failure_threshold: int, reset_timeout: float):
+        self.api_key = api_key
+        self.api_url = api_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.circuit_breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+        # One pooled keep-alive connection per concurrent page instead of a TLS handshake per page
+        if HTTPX_AVAILABLE:
+            self._http = httpx.Client(
+                http2=HTTP2_AVAILABLE,
+                timeout=timeout,
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+            )
+            self._transport_errors = (httpx.TransportError,)
+        else:
+            self._http = requests.Session()
+            self._http.mount(
+                f"{urlparse(api_url).scheme}://",
+                HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+            )
+            self._transport_errors = (requests.ConnectionError, requests.Timeout)
+
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+    @property
+    def is_available(self) -> bool:
+        """False while the circuit breaker is open and calls would fail fast"""
+        return not self.circuit_breaker.is_open
+
+    def build_payload(self, base64_image: str, mime_type: str) -> Dict[str, Any]:
+        """Build the chat completion request for one page image"""
+        return {
+            "model": "pixtral-12b-2409",
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": OCR_PROMPT
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": f"data:{mime_type};base64,{base64_image}"
+                            }
+                        }
+                    ]
+                }
+            ],
+            "temperature": 0.1,
+            "max_tokens": 4000
+        }
+
+    def ocr_image(self, base64_image: str, mime_type: str) -> str:
+        """OCR one base64-encoded page image, retrying transient failures"""
+        payload = self.build_payload(base64_image, mime_type)
+        last_error = "no attempts made"
+
+        for attempt in range(self.max_retries + 1):
+            if not self.circuit_breaker.allow_request():
+                raise CircuitOpenError("Mistral API circuit breaker is open")
+
+            retry_after = None
+            outcome_recorded = False
+            try:
+                self.rate_limiter.wait()
+                try:
+                    response = self._http.post(self.api_url, headers=self._headers, json=payload, timeout=self.timeout)
+                except self._transport_errors as e:
+                    last_error = f"{type(e).__name__}: {str(e)}"
+                else:
+                    if response.status_code == 200:
+                        try:
+                            text = response.json()['choices'][0]['message']['content']
+                        except (ValueError, KeyError, IndexError, TypeError) as e:
+                            # A 200 the API cannot fill in is a server fault, like a 5xx
+                            self.circuit_breaker.record_failure()
+                            outcome_recorded = True
+                            raise MistralOCRError(f"Malformed Mistral API response: {type(e).__name__}: {str(e)}")
+                        self.circuit_breaker.record_success()
+                        outcome_recorded = True
+                        return text
+
+                    last_error = f"HTTP {response.status_code} - {response.text[:200]}"
+                    if response.status_code not in RETRYABLE_STATUS_CODES:
+                        # Client errors (bad key, bad payload) will not improve on retry
+                        raise MistralOCRError(f"Mistral API error: {last_error}")
+                    retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+
+                self.circuit_breaker.record_failure()
+                outcome_recorded = True
+            finally:
+                # Client errors and unexpected exceptions say nothing about the API's
+                # health, but must not leave a half-open trial slot taken forever
+                if not outcome_recorded:
+                    self.circuit_breaker.release_trial()
+
+            if attempt < self.max_retries:
+                delay = self._backoff_delay(attempt, retry_after)
+                logger.warning(f"Mistral API attempt {attempt + 1} failed ({last_error}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+        raise MistralOCRError(f"Mistral API failed after {self.max_retries + 1} attempts: {last_error}")
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Exponential backoff with jitter, overridden by the server's Retry-After"""
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        delay = self.backoff_base * (2 ** attempt)
+        return min(delay + random.uniform(0, delay / 2), self.backoff_max)
+
+    def _parse_retry_after(self, value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given in seconds or as an HTTP date"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "api_url": self.api_url,
+            "http_client": "httpx" if HTTPX_AVAILABLE else "requests",
+            "http2": HTTP2_AVAILABLE,
+            "circuit_breaker": self.circuit_breaker.get_state()
+        }
+
+    def close(self):
+        self._http.close()
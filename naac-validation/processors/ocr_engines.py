@@ -0,0 +1,131 @@
+"""
+OCR engine registry and per-page routing
+Each engine declares its expected latency, cost and quality so pages can be
+sent to the cheapest engine first and escalated only when it falls short
+"""
+import logging
+from typing import Callable, Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Expected per-page characteristics of each engine (latency on a typical CPU
+# host, API cost in USD, relative text quality on NAAC documents)
+ENGINE_PROFILES = {
+    "tesseract": {"latency_seconds": 0.8, "cost_per_page": 0.0, "quality": 0.70, "remote": False},
+    "easyocr": {"latency_seconds": 4.0, "cost_per_page": 0.0, "quality": 0.80, "remote": False},
+    "mistral": {"latency_seconds": 2.5, "cost_per_page": 0.001, "quality": 0.95, "remote": True},
+}
+
+ROUTING_POLICIES = ("cost", "latency", "quality")
+
+class OCREngine:
+    """An OCR engine and its declared latency, cost and quality"""
+
+    def __init__(self, name: str, latency_seconds: float, cost_per_page: float, quality: float,
+                 remote: bool = False, availability_check: Optional[Callable[[], bool]] = None):
+        self.name = name
+        self.latency_seconds = latency_seconds
+        self.cost_per_page = cost_per_page
+        self.quality = quality
+        self.remote = remote
+        self._availability_check = availability_check
+
+    @classmethod
+    def from_profile(cls, name: str, availability_check: Optional[Callable[[], bool]] = None) -> "OCREngine":
+        """Create an engine using its entry in ENGINE_PROFILES"""
+        return cls(name, availability_check=availability_check, **ENGINE_PROFILES[name])
+
+    def is_available(self) -> bool:
+        """Whether the engine can take pages right now (e.g. its circuit breaker is closed)"""
+        return self._availability_check() if self._availability_check else True
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "latency_seconds": self.latency_seconds,
+            "cost_per_page": self.cost_per_page,
+            "quality": self.quality,
+            "remote": self.remote,
+            "available": self.is_available()
+        }
+
+class OCREngineRegistry:
+    """Registered OCR engines, in registration order"""
+
+    def __init__(self):
+        self._engines: Dict[str, OCREngine] = {}
+
+    def register(self, engine: OCREngine):
+        self._engines[engine.name] = engine
+
+    def get(self, name: str) -> OCREngine:
+        return self._engines[name]
+
+    def names(self) -> List[str]:
+        return list(self._engines)
+
+    def available(self) -> List[OCREngine]:
+        return [engine for engine in self._engines.values() if engine.is_available()]
+
+    def describe(self) -> List[Dict[str, Any]]:
+        return [engine.describe() for engine in self._engines.values()]
+
+class OCRRouter:
+    """
+    Decides which engine OCRs each page
+
+    Every page starts on the primary engine chosen by the policy ("cost":
+    cheapest, then fastest, of the engines no slower per page than the
+    fastest remote one; "latency": fastest; "quality": best). Pages whose
+    result is empty or below escalation_confidence move on to the remaining
+    engines, best quality first, until one is accepted. Pages no engine
+    accepts get one last attempt on retry_engine() from a finer rendering.
+    """
+
+    def __init__(self, registry: OCREngineRegistry, policy: str = "cost", escalation_confidence: float = 0.75):
+        if policy not in ROUTING_POLICIES:
+            logger.warning(f"Unknown OCR routing policy '{policy}', using 'cost'")
+            policy = "cost"
+        self.registry = registry
+        self.policy = policy
+        self.escalation_confidence = escalation_confidence
+
+    def plan(self) -> List[str]:
+        """Engine names in the order pages visit them"""
+        engines = self.registry.available()
+        if not engines:
+            return []
+
+        if self.policy == "cost":
+            remote_latency = min((engine.latency_seconds for engine in engines if engine.remote), default=None)
+            candidates = [
+                engine for engine in engines
+                if remote_latency is None or engine.latency_seconds <= remote_latency
+            ]
+            primary = min(candidates, key=lambda engine: (engine.cost_per_page, engine.latency_seconds))
+        elif self.policy == "latency":
+            primary = min(engines, key=lambda engine: (engine.latency_seconds, engine.cost_per_page))
+        else:
+            primary = max(engines, key=lambda engine: engine.quality)
+
+        escalation = sorted(
+            (engine for engine in engines if engine is not primary),
+            key=lambda engine: engine.quality,
+            reverse=True
+        )
+        return [primary.name] + [engine.name for engine in escalation]
+
+    def retry_engine(self) -> Optional[str]:
+        """Engine for the finer-resolution retry of pages no engine read well: the best available"""
+        engines = self.registry.available()
+        if not engines:
+            return None
+        return max(engines, key=lambda engine: engine.quality).name
+
+    def escalation_reason(self, text: str, confidence: float) -> Optional[str]:
+        """Why a page result should go to the next engine, or None to accept it"""
+        if not text.strip():
+            return "no text"
+        if confidence < self.escalation_confidence:
+            return f"confidence {confidence:.2f} < {self.escalation_confidence:.2f}"
+        return None
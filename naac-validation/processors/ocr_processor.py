@@ -2,21 +2,50 @@
 Unified OCR Processor using Mistral AI and PyMuPDF
 Handles all text extraction from documents including scanned PDFs
 """
+import asyncio
+import functools
 import logging
 import tempfile
 import os
-import io
 import base64
-import requests
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Union, List, Optional, Dict, Any
+from typing import Union, List, Optional, Dict, Any, Set, Tuple, Iterator, Callable
 import json
 
+from config.settings import settings
+from processors.cache import ResultCache
+from processors.page_renderer import render_page, encode_for_upload, is_blank_page
+from processors.cpu_ocr_pool import CPUOCRPool
+from processors.excel_reader import extract_excel_text, extract_excel_rows
+from processors.table_extractor import find_page_tables, find_pdfplumber_tables, tables_to_rows
+from processors.mistral_client import MistralOCRClient, CircuitOpenError
+from processors.ocr_engines import OCREngine, OCREngineRegistry, OCRRouter
+from processors.image_preprocessing import preprocess_page, OPENCV_AVAILABLE
+from processors.docx_reader import extract_docx_text
+from processors.ocr_quality import estimate_text_quality
+
 logger = logging.getLogger(__name__)
 
+# Bump when the shape or content of extraction results changes so stale cache entries are ignored
+EXTRACTION_CACHE_VERSION = 22
+
+# A page source yields (image, page hash, render info) for the pages at the given
+# positions, in order (every page when None), rendering or decoding only those pages
+PageSource = Callable[[Optional[List[int]]], Iterator[Tuple[Any, str, Dict[str, Any]]]]
+
+# Per-page text layer classification: pages below these thresholds are OCR'd
+PAGE_MIN_TEXT_CHARS = 30
+SCANNED_IMAGE_COVERAGE = 0.6
+SCANNED_MAX_TEXT_CHARS = 200
+
 # Required imports with graceful handling
 try:
-    from PIL import Image
+    from PIL import Image, ImageSequence
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
@@ -50,33 +79,157 @@ except ImportError:
     EASYOCR_AVAILABLE = False
     logger.warning("EasyOCR not available. Install with: pip install easyocr")
 
+try:
+    import pytesseract
+    pytesseract.get_tesseract_version()  # Raises if the tesseract binary is missing
+    TESSERACT_AVAILABLE = True
+except Exception:
+    TESSERACT_AVAILABLE = False
+    logger.warning("Tesseract not available. Install tesseract-ocr and: pip install pytesseract")
+
+# Loading EasyOCR's detection and recognition models takes seconds, so one
+# reader is shared process-wide and inference on it is serialised
+_easyocr_reader = None
+_easyocr_reader_lock = threading.Lock()
+_easyocr_inference_lock = threading.Lock()
+
+def get_easyocr_reader():
+    """Get the process-wide EasyOCR reader, building it on first use"""
+    global _easyocr_reader
+    
+    if not EASYOCR_AVAILABLE:
+        raise Exception("EasyOCR not available")
+    
+    if _easyocr_reader is None:
+        with _easyocr_reader_lock:
+            if _easyocr_reader is None:
+                start = time.perf_counter()
+                _easyocr_reader = easyocr.Reader(['en'], gpu=settings.EASYOCR_GPU)
+                logger.info(f"✅ EasyOCR models loaded in {time.perf_counter() - start:.1f}s")
+    return _easyocr_reader
+
+def _current_rss_mb() -> Optional[float]:
+    """Resident set size of this process right now in MB (read from /proc, so Linux only)"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return round(resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def _peak_rss_mb(render_settings: List[Dict[str, Any]], peak: Optional[float] = None) -> Optional[float]:
+    """Highest of peak and the process RSS sampled as each of the given pages was rendered"""
+    samples = [info["rss_mb"] for info in render_settings if info.get("rss_mb") is not None]
+    if peak is not None:
+        samples.append(peak)
+    return max(samples, default=None)
+
 class UnifiedOCRProcessor:
     """Unified OCR processor using Mistral AI as primary method with PyMuPDF"""
     
     def __init__(self):
         self.mistral_api_key = os.getenv("MISTRAL_API_KEY")
-        self.mistral_api_url = "https://api.mistral.ai/v1/chat/completions"
+        self.mistral_api_url = settings.MISTRAL_API_URL
+        
+        # Page OCR concurrency
+        self.max_workers = max(1, settings.OCR_MAX_WORKERS)
+        
+        # Threads running whole extractions for async callers, off the event loop
+        self._extraction_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.EXTRACTION_MAX_CONCURRENCY),
+            thread_name_prefix="extraction"
+        )
+        
+        # Pooled, rate-limited Mistral client with retries and a circuit breaker
+        self.mistral_client = None
+        if self.mistral_api_key:
+            self.mistral_client = MistralOCRClient(
+                api_key=self.mistral_api_key,
+                api_url=self.mistral_api_url,
+                timeout=settings.OCR_TIMEOUT,
+                max_connections=self.max_workers,
+                requests_per_second=settings.OCR_REQUESTS_PER_SECOND,
+                max_retries=settings.MISTRAL_MAX_RETRIES,
+                backoff_base=settings.MISTRAL_BACKOFF_BASE_SECONDS,
+                backoff_max=settings.MISTRAL_BACKOFF_MAX_SECONDS,
+                failure_threshold=settings.MISTRAL_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=settings.MISTRAL_CIRCUIT_RESET_SECONDS
+            )
+        
+        # Persistent caches of whole-document results (keyed by file content)
+        # and per-page OCR text (keyed by rendered page pixels), sharing one
+        # file and splitting EXTRACTION_CACHE_MAX_MB evenly between them
+        self.cache = None
+        self.page_cache = None
+        if settings.EXTRACTION_CACHE_ENABLED:
+            try:
+                cache_path = settings.EXTRACTION_CACHE_DIR / "extraction_cache.sqlite3"
+                self.cache = ResultCache(
+                    cache_path,
+                    table="extraction_results",
+                    max_size_mb=settings.EXTRACTION_CACHE_MAX_MB / 2,
+                    ttl_hours=settings.EXTRACTION_CACHE_TTL_HOURS
+                )
+                self.page_cache = ResultCache(
+                    cache_path,
+                    table="page_ocr_results",
+                    max_size_mb=settings.EXTRACTION_CACHE_MAX_MB / 2,
+                    ttl_hours=settings.EXTRACTION_CACHE_TTL_HOURS
+                )
+            except Exception as e:
+                logger.warning(f"Extraction cache disabled: {str(e)}")
         
-        # Configure available methods in priority order
-        self.ocr_methods = []
+        # Register available OCR engines; the router picks one per page
+        self.engines = OCREngineRegistry()
         
         if self.mistral_api_key:
-            self.ocr_methods.append("mistral")
-            logger.info("[SUCCESS] Mistral OCR configured as primary method")
+            self.engines.register(OCREngine.from_profile("mistral", lambda: self.mistral_client.is_available))
+            logger.info("[SUCCESS] Mistral OCR configured for high-quality pages")
         
         if EASYOCR_AVAILABLE:
-            self.ocr_methods.append("easyocr")
-            logger.info("✅ EasyOCR available as fallback")
+            self.engines.register(OCREngine.from_profile("easyocr"))
+            logger.info("✅ EasyOCR available")
+        
+        if TESSERACT_AVAILABLE:
+            self.engines.register(OCREngine.from_profile("tesseract"))
+            logger.info("✅ Tesseract available")
+        
+        self.ocr_router = OCRRouter(self.engines, settings.OCR_ROUTING_POLICY, settings.OCR_ESCALATION_CONFIDENCE)
+        self.ocr_methods = self.engines.names()
+        
+        # OpenCV cleanup (deskew, crop, threshold) of page images for the listed engines
+        self.preprocess_engines = set()
+        if settings.OCR_PREPROCESS:
+            if OPENCV_AVAILABLE:
+                self.preprocess_engines = {name.strip() for name in settings.OCR_PREPROCESS_ENGINES if name.strip()}
+            else:
+                logger.warning("OCR preprocessing disabled: OpenCV not available. Install with: pip install opencv-python-headless")
+        
+        # Optional process pool so CPU OCR uses every core instead of one
+        self.cpu_ocr_pool = None
+        if EASYOCR_AVAILABLE and settings.OCR_PROCESS_POOL_WORKERS > 0:
+            try:
+                self.cpu_ocr_pool = CPUOCRPool(
+                    settings.OCR_PROCESS_POOL_WORKERS,
+                    gpu=settings.EASYOCR_GPU,
+                    batch_size=settings.EASYOCR_BATCH_SIZE
+                )
+            except Exception as e:
+                logger.warning(f"CPU OCR process pool disabled: {str(e)}")
             
         logger.info(f"[TOOLS] OCR methods available: {', '.join(self.ocr_methods)}")
 
-    def extract_text(self, file_path: Union[str, Path], use_ocr: bool = True) -> Dict[str, Any]:
+    def extract_text(self, file_path: Union[str, Path], use_ocr: bool = True,
+                     is_complete: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
         """
         Main text extraction method - intelligently chooses between text extraction and OCR
         
         Args:
             file_path: Path to document file
             use_ocr: Whether to use OCR for scanned documents
+            is_complete: Optional early-exit check for PDFs. Pages needing OCR are
+                then read in order and OCR stops once is_complete(text read so
+                far) is True; the pages never read are listed in "pages_skipped"
             
         Returns:
             Dictionary with extracted text and metadata
@@ -92,58 +245,522 @@ class UnifiedOCRProcessor:
             "ocr_used": False,
             "ocr_method": "none",
             "errors": [],
-            "confidence_scores": []
+            "confidence_scores": [],
+            "cache_hit": False,
+            "timings_ms": {}
         }
+        start = time.perf_counter()
         
         try:
-            file_ext = file_path.suffix.lower()
+            cache_key = self._cache_key(file_path, use_ocr) if self.cache else None
+            if cache_key:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    cached["cache_hit"] = True
+                    cached["timings_ms"] = {}
+                    if "peak_rss_mb" in cached:
+                        cached["peak_rss_mb"] = None  # Measured by the extraction that filled the cache
+                    self._record_timing(cached, "cache_lookup", start)
+                    self._record_timing(cached, "total", start)
+                    logger.info(f"[SUCCESS] Extraction cache hit for {file_path.name}")
+                    return cached
             
-            if file_ext == '.pdf':
-                return self._extract_from_pdf(file_path, use_ocr, result)
-            elif file_ext in ['.xlsx', '.xls']:
-                return self._extract_from_excel(file_path, result)
-            elif file_ext in ['.png', '.jpg', '.jpeg', '.tiff', '.bmp']:
-                if use_ocr:
-                    return self._extract_from_image(file_path, result)
-                else:
-                    result["errors"].append("Image file requires OCR processing")
-                    return result
-            else:
-                result["errors"].append(f"Unsupported file format: {file_ext}")
-                return result
+            result = self._extract_by_type(file_path, use_ocr, result, is_complete)
+            self._record_timing(result, "total", start)
+            
+            if cache_key and self._is_cacheable(result):
+                self.cache.put(cache_key, result)
+            return result
                 
         except Exception as e:
             result["errors"].append(f"Text extraction failed: {str(e)}")
             logger.error(f"Text extraction error for {file_path}: {str(e)}")
             return result
 
-    def _extract_from_pdf(self, pdf_path: Path, use_ocr: bool, result: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract text from PDF using text extraction first, OCR if needed"""
+    async def extract_text_async(self, file_path: Union[str, Path], use_ocr: bool = True,
+                                 is_complete: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+        """
+        Async version of extract_text for the API server
         
-        # First try regular text extraction
-        text_content = self._extract_pdf_text(pdf_path)
+        PDF parsing, rendering and OCR run on the extraction thread pool, so the
+        event loop keeps serving other requests. At most EXTRACTION_MAX_CONCURRENCY
+        documents are extracted at once; further calls wait for a free thread.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._extraction_executor, functools.partial(self.extract_text, file_path, use_ocr, is_complete)
+        )
+
+    async def extract_records_async(self, file_path: Union[str, Path],
+                                    column_aliases: Optional[Dict[str, List[str]]] = None,
+                                    extraction_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Async version of extract_records, run on the extraction thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._extraction_executor,
+            functools.partial(self.extract_records, file_path, column_aliases, extraction_result)
+        )
+
+    def extract_records(self, file_path: Union[str, Path],
+                        column_aliases: Optional[Dict[str, List[str]]] = None,
+                        extraction_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Structured extraction: spreadsheet rows or PDF/DOCX table rows as dicts keyed by column name
         
-        if self._is_meaningful_text(text_content):
-            result["text"] = text_content
-            result["pages_processed"] = "all"
+        Args:
+            file_path: Path to an Excel, PDF or DOCX file
+            column_aliases: response_* column name -> header variants (from the criteria definitions)
+            extraction_result: extract_text() result for this PDF/DOCX, to reuse its tables
+            
+        Returns:
+            Dictionary with rows, per-sheet header mapping and metadata
+        """
+        file_path = Path(file_path)
+        
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+        
+        result = {
+            "rows": [],
+            "sheets": [],
+            "errors": [],
+            "cache_hit": False,
+            "timings_ms": {}
+        }
+        start = time.perf_counter()
+        
+        file_ext = file_path.suffix.lower()
+        if file_ext in ['.pdf', '.docx']:
+            return self._extract_table_records(file_path, column_aliases, extraction_result, result, start)
+        if file_ext not in ['.xlsx', '.xls']:
+            result["errors"].append(f"Structured extraction supports Excel, PDF and DOCX files only, got {file_ext}")
+            return result
+        
+        try:
+            cache_key = None
+            if self.cache:
+                aliases = json.dumps(column_aliases or {}, sort_keys=True)
+                cache_key = f"{self._cache_key(file_path, False)}:records:{hashlib.sha256(aliases.encode('utf-8')).hexdigest()[:16]}"
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    cached["cache_hit"] = True
+                    cached["timings_ms"] = {}
+                    self._record_timing(cached, "total", start)
+                    return cached
+            
+            records = extract_excel_rows(file_path, column_aliases, max_rows=settings.EXCEL_MAX_ROWS)
+            result["rows"] = records["rows"]
+            result["sheets"] = records["sheets"]
+            self._record_timing(result, "total", start)
+            logger.info(f"✅ Structured extraction: {len(result['rows'])} rows from {len(result['sheets'])} sheets")
+            
+            if cache_key and result["rows"]:
+                self.cache.put(cache_key, result)
+        
+        except Exception as e:
+            result["errors"].append(f"Structured extraction failed: {str(e)}")
+            logger.error(f"Structured extraction error for {file_path}: {str(e)}")
+        
+        return result
+
+    def _extract_table_records(self, file_path: Path, column_aliases: Optional[Dict[str, List[str]]],
+                               extraction: Optional[Dict[str, Any]], result: Dict[str, Any],
+                               start: float) -> Dict[str, Any]:
+        """Structured rows from the tables in a PDF or DOCX (tables are cached with the text extraction)"""
+        if extraction is None:
+            extraction = self.extract_text(file_path, use_ocr=True)
+        result["errors"].extend(extraction["errors"])
+        result["cache_hit"] = extraction["cache_hit"]
+        
+        records = tables_to_rows(extraction.get("tables", []), column_aliases)
+        result["rows"] = records["rows"]
+        result["tables"] = records["tables"]
+        self._record_timing(result, "total", start)
+        logger.info(f"✅ Structured extraction: {len(result['rows'])} rows from {len(result['tables'])} document tables")
+        return result
+
+    def _extract_by_type(self, file_path: Path, use_ocr: bool, result: Dict[str, Any],
+                         is_complete: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+        """Dispatch extraction to the handler for the file format"""
+        file_ext = file_path.suffix.lower()
+        
+        if file_ext == '.pdf':
+            return self._extract_from_pdf(file_path, use_ocr, result, is_complete)
+        elif file_ext in ['.xlsx', '.xls']:
+            return self._extract_from_excel(file_path, result)
+        elif file_ext == '.docx':
+            return self._extract_from_docx(file_path, result)
+        elif file_ext in ['.tif', '.tiff']:
+            if use_ocr:
+                return self._extract_from_tiff(file_path, result)
+            else:
+                result["errors"].append("Image file requires OCR processing")
+                return result
+        elif file_ext in ['.png', '.jpg', '.jpeg', '.bmp']:
+            if use_ocr:
+                return self._extract_from_image(file_path, result)
+            else:
+                result["errors"].append("Image file requires OCR processing")
+                return result
+        else:
+            result["errors"].append(f"Unsupported file format: {file_ext}")
+            return result
+
+    def _record_timing(self, result: Dict[str, Any], stage: str, start: float):
+        """Record the time spent in an extraction stage since start"""
+        result["timings_ms"][stage] = round((time.perf_counter() - start) * 1000, 1)
+
+    def _is_cacheable(self, result: Dict[str, Any]) -> bool:
+        """Only complete, successful extractions are worth replaying"""
+        if not result["text"] or result["errors"]:
+            return False
+        # Early-exit extractions stop before the end of the document
+        if result.get("pages_skipped"):
+            return False
+        # Pages whose OCR calls all failed should be retried next time
+        return not result.get("ocr_failed_pages")
+
+    def _cache_key(self, file_path: Path, use_ocr: bool) -> str:
+        """Build a content-addressed cache key from file bytes and OCR configuration"""
+        hasher = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                hasher.update(chunk)
+        
+        config = json.dumps({
+            "version": EXTRACTION_CACHE_VERSION,
+            "extension": file_path.suffix.lower(),
+            "use_ocr": use_ocr,
+            "ocr_methods": self.ocr_methods,
+            "routing_policy": self.ocr_router.policy,
+            "escalation_confidence": self.ocr_router.escalation_confidence,
+            "retry_scale_factor": settings.OCR_RETRY_SCALE_FACTOR,
+            "preprocess_engines": sorted(self.preprocess_engines),
+            # Settings that change what is rendered, uploaded or returned
+            "render_mode": settings.OCR_RENDER_MODE,
+            "target_long_side_px": settings.OCR_TARGET_LONG_SIDE_PX,
+            "grayscale": settings.OCR_GRAYSCALE,
+            "image_format": settings.OCR_IMAGE_FORMAT,
+            "upload_max_kb": settings.OCR_UPLOAD_MAX_KB,
+            "binarize": settings.OCR_BINARIZE,
+            "table_extraction": settings.PDF_TABLE_EXTRACTION,
+            "excel_max_rows": settings.EXCEL_MAX_ROWS
+        }, sort_keys=True)
+        return f"{hasher.hexdigest()}:{hashlib.sha256(config.encode('utf-8')).hexdigest()[:16]}"
+
+    def _extract_from_pdf(self, pdf_path: Path, use_ocr: bool, result: Dict[str, Any],
+                          is_complete: Optional[Callable[[str], bool]] = None) -> Dict[str, Any]:
+        """Extract text from PDF, OCRing only the pages that lack a usable text layer"""
+        
+        if not PYMUPDF_AVAILABLE:
+            return self._extract_from_pdf_text_layer(pdf_path, result)
+        
+        start = time.perf_counter()
+        try:
+            pages = self._classify_pdf_pages(pdf_path, extract_tables=settings.PDF_TABLE_EXTRACTION)
+        except Exception as e:
+            logger.warning(f"PyMuPDF page classification failed: {str(e)}")
+            return self._extract_from_pdf_text_layer(pdf_path, result, try_pymupdf=False)
+        self._record_timing(result, "classify", start)
+        
+        if settings.PDF_TABLE_EXTRACTION:
+            result["tables"] = self._collect_pdf_tables(pdf_path, pages)
+            result["timings_ms"]["tables"] = round(sum(page.get("table_ms", 0) for page in pages), 1)
+        
+        # Other parsers read the same text layer, so they can only help on pages
+        # that have fonts but where PyMuPDF decoded too little text (e.g. odd
+        # font encodings). Image-only pages skip straight to OCR.
+        fallback_pages = [
+            page for page in pages
+            if page["needs_ocr"] and page["has_fonts"] and page["image_coverage"] < SCANNED_IMAGE_COVERAGE
+        ]
+        if fallback_pages and PDFPLUMBER_AVAILABLE:
+            start = time.perf_counter()
+            result["text_fallback_pages"] = self._recover_page_text(pdf_path, fallback_pages)
+            self._record_timing(result, "text_fallback", start)
+        
+        ocr_page_numbers = [page["page_number"] for page in pages if page["needs_ocr"]]
+        text_layer, text_layer_index = self._join_pages(
+            [(page["page_number"], page["text"], "text_layer") for page in pages]
+        )
+        result["pages_processed"] = len(pages)
+        result["ocr_pages"] = ocr_page_numbers
+        result["empty_pages"] = [page["page_number"] for page in pages if page["empty"]]
+        result["page_index"] = text_layer_index
+        
+        if not ocr_page_numbers:
+            result["text"] = text_layer
             logger.info("[SUCCESS] PDF text extracted without OCR")
             return result
         
-        # PDF appears to be scanned - use OCR if enabled
-        if use_ocr and self.ocr_methods:
-            logger.info("🔍 PDF appears scanned, using OCR")
-            return self._extract_with_ocr(pdf_path, result)
+        if not use_ocr:
+            result["text"] = text_layer  # Return whatever we got
+            if not self._is_meaningful_text(text_layer):
+                result["errors"].append("PDF appears to be scanned but OCR is disabled")
+            return result
+        
+        if not self.ocr_router.plan():
+            # No engine configured, or every engine is unavailable (e.g. Mistral's circuit is open)
+            result["text"] = text_layer
+            result["ocr_failed_pages"] = ocr_page_numbers
+            result["errors"].append(f"No OCR engine available for pages {ocr_page_numbers}")
+            return result
+        
+        if is_complete:
+            result["early_exit"] = False
+            result["pages_skipped"] = []
+            # Text-layer pages cost nothing to read, so they are checked before any OCR
+            if is_complete(text_layer):
+                result["text"] = text_layer
+                result["early_exit"] = True
+                result["pages_skipped"] = ocr_page_numbers
+                logger.info(f"⏩ Text layer is sufficient, skipping OCR of {len(ocr_page_numbers)} pages")
+                return result
+        
+        logger.info(f"🔍 {len(ocr_page_numbers)}/{len(pages)} PDF pages lack a text layer, using OCR")
+        start = time.perf_counter()
+        if is_complete:
+            ocr_run = self._run_ocr_until_complete(pdf_path, pages, ocr_page_numbers, is_complete)
         else:
-            result["text"] = text_content  # Return whatever we got
-            result["errors"].append("PDF appears to be scanned but OCR is disabled")
+            ocr_run = self._run_ocr_methods(
+                self._pdf_page_source(pdf_path, ocr_page_numbers),
+                self._pdf_retry_source(pdf_path, ocr_page_numbers)
+            )
+        self._record_timing(result, "ocr", start)
+        if ocr_run is None:
+            result["text"] = text_layer
+            result["ocr_failed_pages"] = ocr_page_numbers
+            result["errors"].append("All OCR methods failed")
             return result
+        
+        # Merge text-layer pages and OCR'd pages back into page order
+        ocr_results = dict(zip(ocr_page_numbers, ocr_run["page_results"]))
+        unread = []
+        if is_complete:
+            result["early_exit"] = bool(ocr_run["pages_skipped"])
+            result["pages_skipped"] = ocr_run["pages_skipped"]
+            unread = [number for number in ocr_page_numbers
+                      if number not in ocr_results and number not in ocr_run["pages_skipped"]]
+            if unread:
+                result["errors"].append(f"OCR failed on pages {unread}")
+        
+        page_texts = []
+        confidence_scores = []
+        for page in pages:
+            if page["needs_ocr"]:
+                if page["page_number"] not in ocr_results:
+                    continue
+                text, confidence = ocr_results[page["page_number"]]
+                page_texts.append((page["page_number"], text, "ocr"))
+            else:
+                confidence = 1.0
+                page_texts.append((page["page_number"], page["text"], "text_layer"))
+            confidence_scores.append(confidence)
+        
+        result["text"], result["page_index"] = self._join_pages(page_texts)
+        result["confidence_scores"] = confidence_scores
+        self._apply_ocr_run(result, ocr_run)
+        result["ocr_failed_pages"] = sorted(set(result["ocr_failed_pages"]) | set(unread))
+        return result
+
+    def _run_ocr_until_complete(self, pdf_path: Path, pages: List[Dict[str, Any]], ocr_page_numbers: List[int],
+                                is_complete: Callable[[str], bool]) -> Optional[Dict[str, Any]]:
+        """
+        OCR pages in document order until is_complete accepts the text read so far
+        
+        Pages go through the engine plan a batch at a time, each batch as large
+        as the primary engine's concurrency, so pages are still OCR'd in parallel
+        and at most one batch is read past the page that completes the check.
+        Only OCR pages reaching the escalation confidence count towards the check.
+        Returns a _run_ocr_methods result for the pages read, plus
+        "pages_skipped", or None if the first batch could not be OCR'd.
+        """
+        plan = self.ocr_router.plan()
+        if not plan:
+            return None
+        batch_size = self._get_method_workers(plan[0])
+        
+        ocr_run = None
+        confident_texts: Dict[int, str] = {}
+        pages_skipped: List[int] = []
+        for batch_start in range(0, len(ocr_page_numbers), batch_size):
+            batch = ocr_page_numbers[batch_start:batch_start + batch_size]
+            batch_run = self._run_ocr_methods(
+                self._pdf_page_source(pdf_path, batch),
+                self._pdf_retry_source(pdf_path, batch)
+            )
+            if batch_run is None:
+                break
+            ocr_run = batch_run if ocr_run is None else self._merge_ocr_runs(ocr_run, batch_run)
+            
+            for page_number, (text, confidence) in zip(batch, batch_run["page_results"]):
+                if confidence >= self.ocr_router.escalation_confidence:
+                    confident_texts[page_number] = text
+            text_so_far = '\n'.join(
+                confident_texts.get(page["page_number"], "") if page["needs_ocr"] else page["text"]
+                for page in pages
+            )
+            if is_complete(text_so_far):
+                pages_skipped = ocr_page_numbers[batch_start + len(batch):]
+                if pages_skipped:
+                    logger.info(f"⏩ Early exit after page {batch[-1]}, skipping OCR of {len(pages_skipped)} pages")
+                break
+        
+        if ocr_run is not None:
+            ocr_run["pages_skipped"] = pages_skipped
+        return ocr_run
 
-    def _extract_pdf_text(self, pdf_path: Path) -> str:
+    def _merge_ocr_runs(self, first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine the _run_ocr_methods results of consecutive page batches"""
+        page_methods = first["page_methods"] + second["page_methods"]
+        return {
+            "method": "+".join(dict.fromkeys(page_methods)),
+            "page_results": first["page_results"] + second["page_results"],
+            "page_methods": page_methods,
+            "page_routing": first["page_routing"] + second["page_routing"],
+            "failed_pages": first["failed_pages"] + second["failed_pages"],
+            "estimated_cost": round(first["estimated_cost"] + second["estimated_cost"], 4),
+            "hits": first["hits"] + second["hits"],
+            "ocr_calls": first["ocr_calls"] + second["ocr_calls"],
+            "render_settings": first["render_settings"] + second["render_settings"],
+            "peak_rss_mb": max(filter(None, (first["peak_rss_mb"], second["peak_rss_mb"])), default=None)
+        }
+
+    def _join_pages(self, pages: List[Tuple[int, str, str]], skip_blank: bool = True
+                    ) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Join (page number, text, source) page texts with newlines
+        
+        Returns the document text and a page index giving each page's
+        [start, end) character span in it, so consumers can slice out pages.
+        """
+        parts = []
+        page_index = []
+        offset = 0
+        for page_number, text, source in pages:
+            if skip_blank and not text.strip():
+                continue
+            if parts:
+                offset += 1  # Newline separator
+            page_index.append({"page": page_number, "start": offset, "end": offset + len(text), "source": source})
+            parts.append(text)
+            offset += len(text)
+        return '\n'.join(parts), page_index
+
+    def _classify_pdf_pages(self, pdf_path: Path, extract_tables: bool = False) -> List[Dict[str, Any]]:
+        """
+        Classify every page in one PyMuPDF pass by whether its text layer is usable
+        
+        Only pages without a usable text layer that carry raster images or
+        vector drawings (outlined text) need OCR. Other pages keep whatever
+        their text layer holds; those with no text at all are marked "empty".
+        With extract_tables, tables on usable text-layer pages are found in the
+        same pass and stored under the page's "tables" (with "table_ms" timing).
+        """
+        pages = []
+        
+        with fitz.open(str(pdf_path)) as doc:
+            for page in doc:
+                text = page.get_text()
+                char_count = len(text.strip())
+                has_fonts = bool(page.get_fonts())
+                image_coverage = self._image_coverage(page)
+                
+                # A scan with a stamped header or page number still needs OCR
+                mostly_scanned = image_coverage >= SCANNED_IMAGE_COVERAGE and char_count < SCANNED_MAX_TEXT_CHARS
+                usable_text = has_fonts and char_count >= PAGE_MIN_TEXT_CHARS and not mostly_scanned
+                # A page with only a few characters (or whitespace) in its text layer and
+                # nothing drawn has nothing more for OCR to find (drawings are listed
+                # last, they are the slowest to check)
+                needs_ocr = not usable_text and (image_coverage > 0 or bool(page.get_drawings()))
+                
+                page_info = {
+                    "page_number": page.number + 1,
+                    "text": text,
+                    "char_count": char_count,
+                    "has_fonts": has_fonts,
+                    "image_coverage": image_coverage,
+                    "empty": not needs_ocr and not char_count,
+                    "needs_ocr": needs_ocr
+                }
+                
+                if extract_tables and usable_text:
+                    start = time.perf_counter()
+                    try:
+                        page_info["tables"] = find_page_tables(page)
+                    except Exception as e:
+                        logger.debug(f"Table detection failed on page {page.number + 1}: {str(e)}")
+                        page_info["tables"] = []
+                    page_info["table_ms"] = (time.perf_counter() - start) * 1000
+                
+                pages.append(page_info)
+        
+        return pages
+
+    def _collect_pdf_tables(self, pdf_path: Path, pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Tables found during classification, or via pdfplumber if this PyMuPDF cannot find tables"""
+        if pages and not hasattr(fitz.Page, "find_tables"):
+            text_pages = [page["page_number"] for page in pages if not page["needs_ocr"]]
+            try:
+                return find_pdfplumber_tables(pdf_path, text_pages)
+            except Exception as e:
+                logger.debug(f"pdfplumber table detection failed: {str(e)}")
+                return []
+        
+        tables = [table for page in pages for table in page.get("tables", [])]
+        if tables:
+            logger.info(f"✅ Found {len(tables)} tables on {len({table['page'] for table in tables})} pages")
+        return tables
+
+    def _recover_page_text(self, pdf_path: Path, pages: List[Dict[str, Any]]) -> List[int]:
+        """Re-read only the given pages with pdfplumber, clearing needs_ocr where it finds text"""
+        recovered = []
+        try:
+            with pdfplumber.open(pdf_path) as pdf:
+                for page in pages:
+                    text = pdf.pages[page["page_number"] - 1].extract_text() or ""
+                    if len(text.strip()) >= PAGE_MIN_TEXT_CHARS:
+                        page["text"] = text
+                        page["char_count"] = len(text.strip())
+                        page["needs_ocr"] = False
+                        recovered.append(page["page_number"])
+        except Exception as e:
+            logger.debug(f"pdfplumber page recovery failed: {str(e)}")
+        
+        if recovered:
+            logger.info(f"✅ pdfplumber recovered text on pages {recovered}, skipping OCR for them")
+        return recovered
+
+    def _image_coverage(self, page) -> float:
+        """Fraction of the page area covered by raster images"""
+        page_area = abs(page.rect) or 1
+        covered = 0.0
+        for image_info in page.get_image_info():
+            bbox = fitz.Rect(image_info["bbox"]) & page.rect
+            covered += abs(bbox)
+        return min(1.0, covered / page_area)
+
+    def _extract_from_pdf_text_layer(self, pdf_path: Path, result: Dict[str, Any],
+                                     try_pymupdf: bool = True) -> Dict[str, Any]:
+        """Extract the PDF text layer with whichever library is available (no OCR possible)"""
+        start = time.perf_counter()
+        text_content = self._extract_pdf_text(pdf_path, try_pymupdf)
+        self._record_timing(result, "text_layer", start)
+        result["text"] = text_content
+        result["pages_processed"] = "all"
+        
+        if self._is_meaningful_text(text_content):
+            logger.info("[SUCCESS] PDF text extracted without OCR")
+        else:
+            result["errors"].append("PDF appears to be scanned but PyMuPDF is required for OCR")
+        return result
+
+    def _extract_pdf_text(self, pdf_path: Path, try_pymupdf: bool = True) -> str:
         """Extract text from PDF using available libraries"""
         text_content = []
         
-        # Try PyMuPDF first (fastest and most accurate)
-        if PYMUPDF_AVAILABLE:
+        # Try PyMuPDF first (fastest and most accurate), unless it already failed on this file
+        if PYMUPDF_AVAILABLE and try_pymupdf:
             try:
                 doc = fitz.open(str(pdf_path))
                 for page in doc:
@@ -192,30 +809,23 @@ class UnifiedOCRProcessor:
         return '\n'.join(text_content)
 
     def _extract_from_excel(self, excel_path: Path, result: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract text from Excel files"""
+        """Extract text from Excel files, streaming rows sheet by sheet"""
         try:
-            import pandas as pd
-            import openpyxl
+            start = time.perf_counter()
+            excel = extract_excel_text(excel_path, max_rows=settings.EXCEL_MAX_ROWS)
+            self._record_timing(result, "excel", start)
             
-            # Determine engine
-            engine = 'openpyxl' if excel_path.suffix.lower() == '.xlsx' else 'xlrd'
-            
-            # Read all sheets
-            all_sheets = pd.read_excel(excel_path, sheet_name=None, engine=engine)
-            
-            text_parts = []
-            for sheet_name, df in all_sheets.items():
-                text_parts.append(f"=== Sheet: {sheet_name} ===")
-                
-                # Convert DataFrame to text
-                for col in df.columns:
-                    text_parts.append(f"Column: {col}")
-                    for value in df[col].dropna():
-                        text_parts.append(str(value))
-            
-            result["text"] = '\n'.join(text_parts)
-            result["pages_processed"] = len(all_sheets)
-            logger.info(f"✅ Excel text extracted from {len(all_sheets)} sheets")
+            result["text"] = excel["text"]
+            result["page_index"] = [
+                {"page": number, "start": sheet["start"], "end": sheet["end"], "source": "sheet", "sheet": sheet["sheet"]}
+                for number, sheet in enumerate(excel["sheet_index"], start=1)
+            ]
+            result["pages_processed"] = excel["sheets"]
+            result["rows_processed"] = excel["rows"]
+            if excel["truncated_sheets"]:
+                result["truncated_sheets"] = excel["truncated_sheets"]
+                logger.warning(f"Excel sheets truncated at {settings.EXCEL_MAX_ROWS} rows: {excel['truncated_sheets']}")
+            logger.info(f"✅ Excel text extracted from {excel['sheets']} sheets ({excel['rows']} rows)")
             
         except Exception as e:
             result["errors"].append(f"Excel extraction failed: {str(e)}")
@@ -223,211 +833,545 @@ class UnifiedOCRProcessor:
         
         return result
 
-    def _extract_with_ocr(self, pdf_path: Path, result: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract text using OCR methods"""
-        
-        # Convert PDF to images first
+    def _extract_from_docx(self, docx_path: Path, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract DOCX text and tables by streaming the document XML (no conversion to PDF)"""
         try:
-            images = self._convert_pdf_to_images(pdf_path)
+            start = time.perf_counter()
+            docx = extract_docx_text(docx_path)
+            self._record_timing(result, "docx", start)
+            
+            result["text"], result["page_index"] = self._join_pages(
+                [(number, text, "docx") for number, text in docx["pages"]]
+            )
+            result["tables"] = docx["tables"]
+            result["pages_processed"] = len(docx["pages"])
+            logger.info(f"✅ DOCX text extracted: {docx['paragraphs']} paragraphs, "
+                        f"{len(docx['tables'])} tables on {len(docx['pages'])} pages")
+            
         except Exception as e:
-            result["errors"].append(f"PDF to image conversion failed: {str(e)}")
+            result["errors"].append(f"DOCX extraction failed: {str(e)}")
+            logger.error(f"DOCX extraction error: {str(e)}")
+        
+        return result
+
+    def _ocr_document(self, page_source: PageSource,
+                      result: Dict[str, Any], failure_message: str) -> Dict[str, Any]:
+        """OCR every page from page_source and fill the result with the OCR text"""
+        start = time.perf_counter()
+        ocr_run = self._run_ocr_methods(page_source)
+        self._record_timing(result, "ocr", start)
+        if ocr_run is None:
+            result["errors"].append(failure_message)
             return result
         
-        # Try Mistral OCR first
-        if "mistral" in self.ocr_methods:
-            try:
-                return self._extract_with_mistral_ocr(images, result)
-            except Exception as e:
-                logger.warning(f"Mistral OCR failed: {str(e)}")
+        page_results = ocr_run["page_results"]
+        result["text"], result["page_index"] = self._join_pages(
+            [(number, text, "ocr") for number, (text, _) in enumerate(page_results, start=1)],
+            skip_blank=False
+        )
+        result["pages_processed"] = len(page_results)
+        result["confidence_scores"] = [confidence for _, confidence in page_results]
+        return self._apply_ocr_run(result, ocr_run)
+
+    def _run_ocr_methods(self, page_source: PageSource,
+                         retry_source: Optional[PageSource] = None
+                         ) -> Optional[Dict[str, Any]]:
+        """
+        OCR pages from page_source, routing each page through the engine plan
+        
+        Every page goes to the router's primary engine first. Pages it fails on
+        or scores below the escalation threshold are re-run on the next engine
+        in the plan, so remote OCR is only spent on the pages that need it,
+        and only those pages are rendered again.
+        Pages still below the threshold after the whole plan are read once more
+        from retry_source (the same pages rendered finer), when given. Blank
+        pages are accepted as empty without an OCR call. "failed_pages" lists
+        the pages on which every OCR call failed (as opposed to reading nothing).
+        """
+        plan = self.ocr_router.plan()
+        if not plan:
+            return None
+        logger.info(f"[TOOLS] OCR engine plan ({self.ocr_router.policy}): {' -> '.join(plan)}")
+        
+        page_results: Dict[int, Tuple[str, float]] = {}
+        page_routing: Dict[int, Dict[str, Any]] = {}
+        succeeded: Set[int] = set()  # Pages with at least one OCR call that did not fail
+        pending: Optional[List[int]] = None  # None = every page
+        render_settings = None
+        peak_rss_mb = None
+        hits = 0
+        ocr_calls = 0
+        estimated_cost = 0.0
         
-        # Fallback to EasyOCR
-        if "easyocr" in self.ocr_methods:
+        for step, method in enumerate(plan):
             try:
-                return self._extract_with_easyocr(images, result)
+                pages = page_source(pending)
+                method_results, method_hits, method_render_settings, page_status = self._run_ocr_pipeline(method, pages)
             except Exception as e:
-                logger.warning(f"EasyOCR failed: {str(e)}")
+                logger.warning(f"{method} OCR failed: {str(e)}")
+                continue
+            
+            indices = pending if pending is not None else list(range(len(method_results)))
+            if render_settings is None:
+                render_settings = method_render_settings
+            method_calls = self._count_ocr_calls(page_status)
+            hits += method_hits
+            ocr_calls += method_calls
+            peak_rss_mb = _peak_rss_mb(method_render_settings, peak_rss_mb)
+            estimated_cost += self.engines.get(method).cost_per_page * method_calls
+            
+            is_last = step == len(plan) - 1
+            pending = []
+            for index, (text, confidence), status in zip(indices, method_results, page_status):
+                routing = page_routing.setdefault(index, {
+                    "page": render_settings[index].get("page_number", index + 1),
+                    "attempts": []
+                })
+                if status == "blank":
+                    page_results[index] = (text, confidence)
+                    succeeded.add(index)
+                    routing["engine"] = method
+                    routing["reason"] = "blank page"
+                    logger.info(f"Page {routing['page']}: blank, no OCR needed")
+                    continue
+                
+                routing["attempts"].append({"engine": method, "confidence": round(float(confidence), 3)})
+                if status != "failed":
+                    succeeded.add(index)
+                
+                # Keep an earlier engine's text if the escalation target produced nothing
+                if text.strip() or index not in page_results:
+                    page_results[index] = (text, confidence)
+                    routing["engine"] = method
+                
+                reason = self.ocr_router.escalation_reason(text, confidence)
+                if reason:
+                    pending.append(index)
+                if reason and not is_last:
+                    logger.info(f"Page {routing['page']}: {method} {reason}, escalating")
+                else:
+                    routing["reason"] = reason or "accepted"
+                    logger.info(f"Page {routing['page']}: {routing['engine']} ({routing['reason']})")
+            
+            logger.info(f"✅ {method} OCR completed for {len(method_results)} pages "
+                        f"({method_hits} from page cache, {len(pending)} below threshold)")
+            if not pending:
+                break
         
-        result["errors"].append("All OCR methods failed")
-        return result
+        if not page_results:
+            return None
+        
+        for index in pending or []:
+            page_routing[index].setdefault("reason", "no engine accepted")
+        
+        if pending and retry_source:
+            retry_hits, retry_calls, retry_cost, retry_settings = self._retry_finer(
+                retry_source, pending, page_results, page_routing, render_settings, succeeded)
+            hits += retry_hits
+            ocr_calls += retry_calls
+            estimated_cost += retry_cost
+            peak_rss_mb = _peak_rss_mb(retry_settings, peak_rss_mb)
+        
+        page_count = len(page_results)
+        ordered_methods = [page_routing[i]["engine"] for i in range(page_count)]
+        return {
+            "method": "+".join(dict.fromkeys(ordered_methods)),
+            "page_results": [page_results[i] for i in range(page_count)],
+            "page_methods": ordered_methods,
+            "page_routing": [page_routing[i] for i in range(page_count)],
+            "failed_pages": [page_routing[i]["page"] for i in range(page_count) if i not in succeeded],
+            "estimated_cost": round(estimated_cost, 4),
+            "hits": hits,
+            "ocr_calls": ocr_calls,
+            "render_settings": render_settings,
+            "peak_rss_mb": peak_rss_mb
+        }
 
-    def _convert_pdf_to_images(self, pdf_path: Path):
-        """Convert PDF to images using PyMuPDF"""
-        if not PYMUPDF_AVAILABLE:
-            raise Exception("PyMuPDF not available for PDF to image conversion")
+    def _retry_finer(self, retry_source: PageSource, pending: List[int],
+                     page_results: Dict[int, Tuple[str, float]], page_routing: Dict[int, Dict[str, Any]],
+                     render_settings: List[Dict[str, Any]], succeeded: Set[int]
+                     ) -> Tuple[int, int, float, List[Dict[str, Any]]]:
+        """
+        Re-OCR low-confidence pages from a finer rendering with the best available engine
         
-        images = []
-        doc = fitz.open(str(pdf_path))
+        A retry result replaces the page's earlier one only if it scores higher.
+        Pages that cannot be rendered any finer are left as they are. Pages read
+        without failing are added to succeeded. Returns the page cache hits,
+        OCR calls, estimated cost and render settings of the retry.
+        """
+        method = self.ocr_router.retry_engine()
+        if not method:
+            return 0, 0, 0.0, []
         
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            mat = fitz.Matrix(2.0, 2.0)  # High resolution
-            pix = page.get_pixmap(matrix=mat)
-            
-            # Convert to PIL Image
-            if PIL_AVAILABLE:
-                img_data = pix.tobytes("ppm")
-                pil_image = Image.open(io.BytesIO(img_data))
-                images.append(pil_image)
-            else:
-                # Save as temporary file
-                temp_path = Path(tempfile.mktemp(suffix='.png'))
-                pix.save(str(temp_path))
-                images.append(temp_path)
+        retried: List[int] = []
+        
+        def finer_pages():
+            for index, page in zip(pending, retry_source(pending)):
+                if page[2].get("dpi", 0) > render_settings[index].get("dpi", 0):
+                    retried.append(index)
+                    yield page
+                elif page[2].get("temp_file"):
+                    page[0].unlink(missing_ok=True)
+        
+        try:
+            method_results, method_hits, retry_settings, page_status = self._run_ocr_pipeline(method, finer_pages())
+        except Exception as e:
+            logger.warning(f"{method} OCR retry failed: {str(e)}")
+            return 0, 0, 0.0, []
         
-        doc.close()
-        logger.info(f"✅ Converted {len(images)} pages to images")
-        return images
+        improved = 0
+        for index, (text, confidence), render_info, status in zip(retried, method_results, retry_settings, page_status):
+            routing = page_routing[index]
+            if status != "failed":
+                succeeded.add(index)
+            routing["attempts"].append({
+                "engine": method,
+                "dpi": render_info.get("dpi"),
+                "confidence": round(float(confidence), 3)
+            })
+            if text.strip() and confidence > page_results[index][1]:
+                page_results[index] = (text, confidence)
+                routing["engine"] = method
+                routing["reason"] = (self.ocr_router.escalation_reason(text, confidence)
+                                     or f"accepted at {render_info.get('dpi')} DPI")
+                improved += 1
+        
+        logger.info(f"🔁 {method} re-read {len(retried)} low-confidence pages at higher resolution, "
+                    f"{improved} improved")
+        ocr_calls = self._count_ocr_calls(page_status)
+        return method_hits, ocr_calls, self.engines.get(method).cost_per_page * ocr_calls, retry_settings
+
+    def _pdf_retry_source(self, pdf_path: Path, page_numbers: List[int]
+                          ) -> Optional[PageSource]:
+        """Finer rendering of the given PDF pages for _retry_finer, or None if retries are disabled"""
+        if settings.OCR_RETRY_SCALE_FACTOR <= 1:
+            return None
+        return self._pdf_page_source(pdf_path, page_numbers, settings.OCR_RETRY_SCALE_FACTOR)
 
-    def _extract_with_mistral_ocr(self, images, result: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract text using Mistral Vision API"""
+    def _apply_ocr_run(self, result: Dict[str, Any], ocr_run: Dict[str, Any]) -> Dict[str, Any]:
+        """Record OCR method and page-level OCR statistics on the result"""
+        result["ocr_used"] = True
+        result["ocr_method"] = ocr_run["method"]
+        result["page_ocr_methods"] = ocr_run["page_methods"]
+        result["page_ocr_routing"] = ocr_run["page_routing"]
+        result["ocr_failed_pages"] = ocr_run["failed_pages"]
+        result["ocr_estimated_cost"] = ocr_run["estimated_cost"]
+        result["page_cache_hits"] = ocr_run["hits"]
+        # Blank pages are neither: they are never looked up or OCR'd
+        result["page_cache_misses"] = ocr_run["ocr_calls"]
+        result["page_render_settings"] = ocr_run["render_settings"]
+        result["peak_rss_mb"] = ocr_run["peak_rss_mb"]
+        return result
+
+    def _run_ocr_pipeline(self, method: str, pages: Iterator[Tuple[Any, str, Dict[str, Any]]]
+                          ) -> Tuple[List[Tuple[str, float]], int, List[Dict[str, Any]], List[str]]:
+        """
+        Stream pages through an OCR method
         
-        extracted_texts = []
-        confidence_scores = []
+        Returns ordered page results, the page cache hit count, the per-page
+        render/encode settings and each page's status: "read", "cached",
+        "failed" (the engine call failed) or "blank" (no ink, not OCR'd).
         
-        for i, image in enumerate(images):
-            try:
-                # Convert image to base64
-                if isinstance(image, Path):
-                    with open(image, 'rb') as f:
-                        image_data = f.read()
-                else:
-                    # PIL Image
-                    buffer = io.BytesIO()
-                    image.save(buffer, format='PNG')
-                    image_data = buffer.getvalue()
-                
-                base64_image = base64.b64encode(image_data).decode('utf-8')
+        Pages are pulled from the iterator (rendering them) while earlier pages are
+        still being OCR'd. At most OCR_PAGE_WINDOW pages are in flight, so only that
+        many page images are held in memory at once. Each page's render info
+        records the process RSS ("rss_mb") sampled right after it was rendered;
+        the highest sample is reported as the extraction's "peak_rss_mb".
+        """
+        ocr_page = self._get_page_ocr_function(method)
+        cache_prefix = method
+        if method in self.preprocess_engines:
+            ocr_page = self._with_preprocessing(ocr_page)
+            cache_prefix = f"{method}+preprocess"
+        workers = self._get_method_workers(method)
+        window = max(workers, settings.OCR_PAGE_WINDOW)
+        
+        page_results: Dict[int, Tuple[str, float]] = {}
+        render_settings: List[Dict[str, Any]] = []
+        page_status: List[str] = []
+        in_flight: Dict[Future, Tuple[int, str, Optional[Path]]] = {}
+        hits = 0
+        
+        def collect(done):
+            for future in done:
+                index, page_hash, temp_file = in_flight.pop(future)
+                text, engine_confidence = future.result()
+                if temp_file:
+                    temp_file.unlink(missing_ok=True)
+                page_results[index] = (text, self._score_page(text, engine_confidence))
+                page_status[index] = "failed" if engine_confidence == 0 else "read"
+                # Failed pages (zero confidence) are left uncached so they are retried
+                if self.page_cache and engine_confidence != 0:
+                    self.page_cache.put(f"{cache_prefix}:{page_hash}", {"text": text, "confidence": engine_confidence})
+        
+        with ExitStack() as temp_files, ThreadPoolExecutor(workers, thread_name_prefix=f"{method}-ocr") as executor:
+            for index, (image, page_hash, render_info) in enumerate(pages):
+                temp_file = image if render_info.pop("temp_file", False) else None
+                if temp_file:
+                    # Cached pages, and pages left unread if this run fails, are removed when it ends
+                    temp_files.callback(temp_file.unlink, missing_ok=True)
+                # Sampled with up to a window of page images held, where this pipeline peaks
+                render_info["rss_mb"] = _current_rss_mb()
+                render_settings.append(render_info)
+                page_status.append("read")
+                if not isinstance(image, Path) and is_blank_page(image):
+                    page_results[index] = ("", 1.0)
+                    page_status[index] = "blank"
+                    continue
                 
-                # Prepare Mistral API request
-                headers = {
-                    "Authorization": f"Bearer {self.mistral_api_key}",
-                    "Content-Type": "application/json"
-                }
+                cached = self.page_cache.get(f"{cache_prefix}:{page_hash}") if self.page_cache else None
+                if cached is not None:
+                    page_results[index] = (cached["text"], self._score_page(cached["text"], cached["confidence"]))
+                    page_status[index] = "cached"
+                    hits += 1
+                    continue
                 
-                payload = {
-                    "model": "pixtral-12b-2409",
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": "Extract all text from this image. Provide only the extracted text without any additional commentary or formatting."
-                                },
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/png;base64,{base64_image}"
-                                    }
-                                }
-                            ]
-                        }
-                    ],
-                    "temperature": 0.1,
-                    "max_tokens": 4000
-                }
+                if len(in_flight) >= window:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
                 
-                response = requests.post(
-                    self.mistral_api_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=30
+                in_flight[executor.submit(ocr_page, index, image, render_info)] = (index, page_hash, temp_file)
+            
+            collect(wait(in_flight).done)
+        
+        return [page_results[i] for i in range(len(page_results))], hits, render_settings, page_status
+
+    def _count_ocr_calls(self, page_status: List[str]) -> int:
+        """Pages of a _run_ocr_pipeline run that were sent to the engine"""
+        return sum(1 for status in page_status if status in ("read", "failed"))
+
+    def _score_page(self, text: str, engine_confidence: Optional[float]) -> float:
+        """
+        Page confidence: the estimated quality of the OCR text, capped by the
+        engine's own confidence when it reports one
+        """
+        quality = estimate_text_quality(text)["score"]
+        return quality if engine_confidence is None else min(float(engine_confidence), quality)
+
+    def _get_page_ocr_function(self, method: str) -> Callable[[int, Any, Dict[str, Any]], Tuple[str, Optional[float]]]:
+        """Get a callable that OCRs one page image with the given method (confidence None = not reported)"""
+        if method == "mistral":
+            return self._mistral_ocr_page
+        
+        if method == "easyocr":
+            if self.cpu_ocr_pool:
+                return lambda i, image, render_info: self._pooled_easyocr_page(i, image)
+            reader = get_easyocr_reader()
+            return lambda i, image, render_info: self._easyocr_page(reader, i, image)
+        
+        if method == "tesseract":
+            return lambda i, image, render_info: self._tesseract_page(i, image)
+        
+        raise ValueError(f"Unknown OCR method: {method}")
+
+    def _with_preprocessing(self, ocr_page: Callable[[int, Any, Dict[str, Any]], Tuple[str, float]]
+                            ) -> Callable[[int, Any, Dict[str, Any]], Tuple[str, float]]:
+        """Wrap a page OCR function so each page is preprocessed first, in the OCR worker thread"""
+        def preprocessed_ocr_page(i: int, image, render_info: Dict[str, Any]) -> Tuple[str, float]:
+            try:
+                image, render_info["preprocess"] = preprocess_page(image, dpi=render_info.get("dpi"))
+            except Exception as e:
+                logger.warning(f"Preprocessing failed on page {i+1}, using the original image: {str(e)}")
+            return ocr_page(i, image, render_info)
+        return preprocessed_ocr_page
+
+    def _get_method_workers(self, method: str) -> int:
+        """Number of pages an OCR method can usefully process at once"""
+        if method == "mistral":
+            return self.max_workers
+        if method == "easyocr" and self.cpu_ocr_pool:
+            return self.cpu_ocr_pool.max_workers
+        if method == "tesseract":
+            return os.cpu_count() or 1  # Each page runs in its own tesseract process
+        return 1
+
+    def _pdf_page_source(self, pdf_path: Path, page_numbers: List[int], scale_factor: float = 1.0) -> PageSource:
+        """Page source rendering the given 1-based PDF pages (positions index into page_numbers)"""
+        return lambda indices=None: self._iter_pdf_pages(
+            pdf_path, page_numbers if indices is None else [page_numbers[i] for i in indices], scale_factor
+        )
+
+    def _iter_pdf_pages(self, pdf_path: Path, page_numbers: Optional[List[int]] = None, scale_factor: float = 1.0
+                        ) -> Iterator[Tuple[Any, str, Dict[str, Any]]]:
+        """
+        Render PDF pages (all, or the given 1-based page numbers) one at a time with PyMuPDF,
+        scale_factor times finer than the configured render settings
+        """
+        doc = fitz.open(str(pdf_path))
+        
+        try:
+            if page_numbers is None:
+                page_numbers = range(1, len(doc) + 1)
+            
+            for page_number in page_numbers:
+                page = doc[page_number - 1]
+                pix, render_info = render_page(
+                    page, settings.OCR_RENDER_MODE, settings.OCR_TARGET_LONG_SIDE_PX, settings.OCR_GRAYSCALE,
+                    scale_factor
                 )
+                page_hash = hashlib.sha256(pix.samples).hexdigest()
                 
-                if response.status_code == 200:
-                    response_data = response.json()
-                    text = response_data['choices'][0]['message']['content']
-                    extracted_texts.append(text)
-                    confidence_scores.append(0.95)  # High confidence for Mistral
-                    logger.debug(f"✅ Mistral OCR processed page {i+1}")
+                # Convert to PIL Image
+                if PIL_AVAILABLE:
+                    image_mode = "L" if pix.n == 1 else "RGB"
+                    image = Image.frombytes(image_mode, (pix.width, pix.height), pix.samples)
                 else:
-                    logger.error(f"Mistral API error: {response.status_code} - {response.text}")
-                    extracted_texts.append("")
-                    confidence_scores.append(0.0)
-                    
-            except Exception as e:
-                logger.error(f"Mistral OCR error on page {i+1}: {str(e)}")
-                extracted_texts.append("")
-                confidence_scores.append(0.0)
+                    # Save as temporary file, removed by _run_ocr_pipeline once the page is read
+                    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
+                        image = Path(temp_file.name)
+                    pix.save(str(image))
+                    render_info["temp_file"] = True
+                
+                del pix
+                render_info["page_number"] = page_number
+                yield image, page_hash, render_info
+        finally:
+            doc.close()
+
+    def _iter_tiff_pages(self, tiff_path: Path, indices: Optional[List[int]] = None
+                         ) -> Iterator[Tuple[Any, str, Dict[str, Any]]]:
+        """
+        Decode the frames of a (multi-page) TIFF one at a time, like rendered PDF pages,
+        only those at the given 0-based positions when indices is given
+        """
+        wanted = None if indices is None else set(indices)
+        with Image.open(tiff_path) as tiff:
+            for page_number, frame in enumerate(ImageSequence.Iterator(tiff), start=1):
+                if wanted is not None and page_number - 1 not in wanted:
+                    continue
+                image = frame.convert("L" if frame.mode in ("1", "L", "I;16") else "RGB")
+                dpi = frame.info.get("dpi")
+                render_info = {"mode": "original", "page_number": page_number, "width": image.width, "height": image.height}
+                if dpi:
+                    render_info["dpi"] = int(dpi[0])
+                yield image, self._hash_page_image(image), render_info
+
+    def _hash_page_image(self, image) -> str:
+        """Hash the rendered pixels (or file bytes) of a page image"""
+        hasher = hashlib.sha256()
+        if isinstance(image, Path):
+            with open(image, 'rb') as f:
+                hasher.update(f.read())
+        else:
+            hasher.update(image.tobytes())
+        return hasher.hexdigest()
+
+    def _mistral_ocr_page(self, i: int, image, render_info: Dict[str, Any]) -> Tuple[str, Optional[float]]:
+        """
+        OCR a single page with Mistral Vision API, returning text and confidence
         
-        result["text"] = '\n'.join(extracted_texts)
-        result["pages_processed"] = len(images)
-        result["ocr_used"] = True
-        result["ocr_method"] = "mistral"
-        result["confidence_scores"] = confidence_scores
+        The API reports no confidence, so a successful page returns None and
+        is scored from its text by _score_page; failures return 0.0.
+        """
+        try:
+            # Convert image to base64
+            if isinstance(image, Path):
+                with open(image, 'rb') as f:
+                    image_data = f.read()
+                mime_type = "image/png"
+            else:
+                # PIL Image, compressed under the upload budget in adaptive mode
+                image_data, mime_type, encode_info = encode_for_upload(
+                    image,
+                    settings.OCR_RENDER_MODE,
+                    settings.OCR_IMAGE_FORMAT,
+                    settings.OCR_UPLOAD_MAX_KB * 1024,
+                    settings.OCR_BINARIZE
+                )
+                render_info.update(encode_info)
+            
+            base64_image = base64.b64encode(image_data).decode('utf-8')
+            text = self.mistral_client.ocr_image(base64_image, mime_type)
+            logger.debug(f"✅ Mistral OCR processed page {i+1}")
+            return text, None
         
-        logger.info(f"✅ Mistral OCR completed for {len(images)} pages")
-        return result
+        except CircuitOpenError:
+            logger.debug(f"Mistral circuit open, skipping page {i+1}")
+            return "", 0.0
+        except Exception as e:
+            logger.error(f"Mistral OCR error on page {i+1}: {str(e)}")
+            return "", 0.0
 
-    def _extract_with_easyocr(self, images, result: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract text using EasyOCR as fallback"""
-        
-        if not EASYOCR_AVAILABLE:
-            result["errors"].append("EasyOCR not available")
-            return result
+    def _easyocr_page(self, reader, i: int, image) -> Tuple[str, Optional[float]]:
+        """OCR a single page with EasyOCR, returning text and mean confidence (0.0 if the call failed)"""
+        import numpy as np
         
         try:
-            reader = easyocr.Reader(['en'], gpu=False)
-            extracted_texts = []
-            confidence_scores = []
+            # Convert PIL Image to numpy array
+            image_input = str(image) if isinstance(image, Path) else np.array(image)
             
-            for i, image in enumerate(images):
-                try:
-                    if isinstance(image, Path):
-                        ocr_result = reader.readtext(str(image))
-                    else:
-                        # Convert PIL Image to numpy array
-                        import numpy as np
-                        image_array = np.array(image)
-                        ocr_result = reader.readtext(image_array)
-                    
-                    # Extract text and confidence scores
-                    page_text = []
-                    page_confidences = []
-                    
-                    for (bbox, text, confidence) in ocr_result:
-                        if confidence > 0.5:  # Filter low confidence results
-                            page_text.append(text)
-                            page_confidences.append(confidence)
-                    
-                    extracted_texts.append(' '.join(page_text))
-                    confidence_scores.append(np.mean(page_confidences) if page_confidences else 0.0)
-                    
-                except Exception as e:
-                    logger.error(f"EasyOCR error on page {i+1}: {str(e)}")
-                    extracted_texts.append("")
-                    confidence_scores.append(0.0)
+            # Detected text regions are recognised in batches
+            with _easyocr_inference_lock:
+                ocr_result = reader.readtext(image_input, batch_size=settings.EASYOCR_BATCH_SIZE)
             
-            result["text"] = '\n'.join(extracted_texts)
-            result["pages_processed"] = len(images)
-            result["ocr_used"] = True
-            result["ocr_method"] = "easyocr"
-            result["confidence_scores"] = confidence_scores
+            # Extract text and confidence scores
+            page_text = []
+            page_confidences = []
             
-            logger.info(f"✅ EasyOCR completed for {len(images)} pages")
+            for (bbox, text, confidence) in ocr_result:
+                if confidence > 0.5:  # Filter low confidence results
+                    page_text.append(text)
+                    page_confidences.append(confidence)
+            
+            # Nothing read is not a failure: no confidence is reported and the text scores it
+            return ' '.join(page_text), float(np.mean(page_confidences)) if page_confidences else None
             
         except Exception as e:
-            result["errors"].append(f"EasyOCR processing failed: {str(e)}")
-        
-        return result
+            logger.error(f"EasyOCR error on page {i+1}: {str(e)}")
+            return "", 0.0
+
+    def _pooled_easyocr_page(self, i: int, image) -> Tuple[str, Optional[float]]:
+        """OCR a single page with EasyOCR in the CPU process pool"""
+        try:
+            return self.cpu_ocr_pool.ocr_page(image)
+        except Exception as e:
+            logger.error(f"EasyOCR error on page {i+1}: {str(e)}")
+            return "", 0.0
+
+    def _tesseract_page(self, i: int, image) -> Tuple[str, Optional[float]]:
+        """OCR a single page with Tesseract, returning text and mean word confidence (0.0 if the call failed)"""
+        try:
+            image_input = str(image) if isinstance(image, Path) else image
+            data = pytesseract.image_to_data(
+                image_input, lang=settings.OCR_LANGUAGE, output_type=pytesseract.Output.DICT
+            )
+            
+            # Rebuild lines from the word boxes, skipping non-word entries (conf -1)
+            lines: Dict[Tuple[int, int, int], List[str]] = {}
+            confidences = []
+            for word, confidence, block, paragraph, line in zip(
+                data["text"], data["conf"], data["block_num"], data["par_num"], data["line_num"]
+            ):
+                confidence = float(confidence)
+                if word.strip() and confidence >= 0:
+                    lines.setdefault((block, paragraph, line), []).append(word)
+                    confidences.append(confidence / 100)
+            
+            text = '\n'.join(' '.join(words) for words in lines.values())
+            return text, sum(confidences) / len(confidences) if confidences else None
+            
+        except Exception as e:
+            logger.error(f"Tesseract error on page {i+1}: {str(e)}")
+            return "", 0.0
 
     def _extract_from_image(self, image_path: Path, result: Dict[str, Any]) -> Dict[str, Any]:
         """Extract text from image file"""
-        
-        if "mistral" in self.ocr_methods:
-            try:
-                return self._extract_with_mistral_ocr([image_path], result)
-            except Exception as e:
-                logger.warning(f"Mistral OCR failed for image: {str(e)}")
-        
-        if "easyocr" in self.ocr_methods:
-            try:
-                return self._extract_with_easyocr([image_path], result)
-            except Exception as e:
-                logger.warning(f"EasyOCR failed for image: {str(e)}")
-        
-        result["errors"].append("No OCR method available for image processing")
-        return result
+        return self._ocr_document(
+            lambda indices=None: iter([(image_path, self._hash_page_image(image_path), {"mode": "original"})]),
+            result,
+            "No OCR method available for image processing"
+        )
+
+    def _extract_from_tiff(self, tiff_path: Path, result: Dict[str, Any]) -> Dict[str, Any]:
+        """OCR every frame of a multi-page TIFF through the per-page pipeline"""
+        if not PIL_AVAILABLE:
+            result["errors"].append("Pillow is required to read TIFF files")
+            return result
+        return self._ocr_document(
+            lambda indices=None: self._iter_tiff_pages(tiff_path, indices),
+            result,
+            "No OCR method available for TIFF processing"
+        )
 
     def _is_meaningful_text(self, text: str, min_words: int = 20) -> bool:
         """Check if extracted text is meaningful"""
@@ -444,13 +1388,43 @@ class UnifiedOCRProcessor:
         
         return word_ratio > 0.5
 
+    def preload_models(self):
+        """Load OCR models up front so the first request does not pay for it"""
+        if "easyocr" not in self.ocr_methods:
+            return
+        
+        if self.cpu_ocr_pool:
+            self.cpu_ocr_pool.warm_up()
+        else:
+            get_easyocr_reader()
+
+    def close(self):
+        """Release extraction threads, OCR worker processes and pooled HTTP connections"""
+        self._extraction_executor.shutdown(wait=False, cancel_futures=True)
+        if self.mistral_client:
+            self.mistral_client.close()
+        if self.cpu_ocr_pool:
+            self.cpu_ocr_pool.shutdown()
+            self.cpu_ocr_pool = None
+
     def get_status(self) -> Dict[str, Any]:
         """Get OCR processor status"""
         return {
             "ocr_methods": self.ocr_methods,
-            "primary_method": self.ocr_methods[0] if self.ocr_methods else "none",
+            "primary_method": (self.ocr_router.plan() or ["none"])[0],
+            "routing_policy": self.ocr_router.policy,
+            "retry_scale_factor": settings.OCR_RETRY_SCALE_FACTOR,
+            "ocr_engines": self.engines.describe(),
             "mistral_configured": bool(self.mistral_api_key),
+            "mistral_client": self.mistral_client.get_status() if self.mistral_client else "disabled",
+            "max_ocr_workers": self.max_workers,
+            "extraction_cache": self.cache.get_stats() if self.cache else "disabled",
+            "page_ocr_cache": self.page_cache.get_stats() if self.page_cache else "disabled",
             "pymupdf_available": PYMUPDF_AVAILABLE,
             "easyocr_available": EASYOCR_AVAILABLE,
+            "tesseract_available": TESSERACT_AVAILABLE,
+            "ocr_preprocess_engines": sorted(self.preprocess_engines),
+            "easyocr_loaded": _easyocr_reader is not None,
+            "cpu_ocr_workers": self.cpu_ocr_pool.max_workers if self.cpu_ocr_pool else 0,
             "pil_available": PIL_AVAILABLE
         }
\ No newline at end of file
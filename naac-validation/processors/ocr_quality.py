@@ -0,0 +1,159 @@
+"""
+OCR output quality estimation
+Scores recognised page text without a reference transcript, so pages whose
+OCR came out poorly can be given a second pass while good pages are kept
+"""
+import math
+import re
+import string
+from typing import Dict, Any
+
+# Frequent English words and words common on NAAC evidence (sanction letters,
+# certificates, data templates). Real text hits these often, garbled OCR rarely.
+COMMON_WORDS = frozenset("""
+a about above after all also an and any are as at be been before being below between both but by
+can could did do does during each for from had has have he her his however if in into is it its
+may more most must no not of on only or other our out over per same shall she should so such than
+that the their them then there these they this those through to under until up upon was we were
+what when where which while who will with within would you your
+academic account agency amount annexure approved assistant associate award awarded bank budget
+certificate certified chair co college completion council crore crores date dated department
+development director dr duration engineering faculty financial fund funded funding government
+grant grants head institute institution investigator lakh lakhs letter ltd management ministry
+name national no non number office officer principal private professor project research rs
+sanction sanctioned science scheme secretary sir statement student students technology total
+university year years
+""".split())
+
+# Kinds of field value NAAC evidence pages carry; finding some of them on a
+# page is a sign the OCR recovered the substance and not just the prose
+FIELD_PATTERNS = {
+    "year": re.compile(r"\b(?:19|20)\d{2}\b"),
+    "date": re.compile(r"\b\d{1,2}[./-]\d{1,2}[./-]\d{2,4}\b"),
+    "amount": re.compile(r"₹|\brs\.?\s*\d|\binr\b|\blakhs?\b|\bcrores?\b|\b\d{1,3}(?:,\d{2,3})+\b", re.IGNORECASE),
+    "reference": re.compile(r"\b(?:no|ref|file)\b\.?\s*[:.]?\s*[A-Z0-9/().-]*\d", re.IGNORECASE),
+}
+FIELD_KINDS_FOR_FULL_SCORE = 2
+
+# Character-class entropy (bits) of ordinary document text falls in this band;
+# text dominated by one class (runs of "|||" or "....") or spread evenly over
+# symbols and digits (noise read as characters) falls outside it
+ENTROPY_BAND = (0.8, 2.2)
+ENTROPY_MAX = math.log2(6)
+
+# A page with fewer tokens than this is too short to judge word statistics on
+MIN_SCORED_TOKENS = 8
+# Share of common words at which ordinary prose scores fully (tables of names score lower)
+DICTIONARY_RATIO_FOR_FULL_SCORE = 0.25
+
+WEIGHTS = {"word_ratio": 0.6, "dictionary_ratio": 0.15, "entropy": 0.15, "fields": 0.1}
+
+_VOWELS = set("aeiouyAEIOUY")
+_REPEATED_CHAR = re.compile(r"(.)\1\1")
+
+# Markdown layout that vision OCR (Mistral) wraps around the recognised text:
+# table separator rows, the pipes of table rows (lines starting and ending with
+# one; stray "|||" elsewhere is still read as noise), heading and list markers
+# and bold markers
+_TABLE_SEPARATOR_ROW = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(?:\|\s*:?-{3,}:?\s*)*\|?\s*$", re.M)
+_TABLE_ROW = re.compile(r"^\s*\|.*\|\s*$", re.M)
+_LINE_MARKER = re.compile(r"^\s*(?:#{1,6}|[-*+]|>)\s+", re.M)
+_BOLD = re.compile(r"\*\*|__")
+
+def estimate_text_quality(text: str) -> Dict[str, Any]:
+    """
+    Estimate how well a page was recognised, from its OCR text alone
+
+    Combines the share of word-like tokens, the share of common dictionary
+    words, how ordinary the character-class entropy is and whether typical
+    NAAC field values (years, dates, amounts, reference numbers) are present.
+    Markdown layout is removed first (see strip_markdown), so a cleanly
+    read table is not marked down for its pipes and separator rows.
+    Returns {"score" (0-1), "word_ratio", "dictionary_ratio", "entropy",
+    "fields_found"}; empty text scores 0.
+    """
+    text = strip_markdown(text)
+    tokens = text.split()
+    if not tokens:
+        return {"score": 0.0, "word_ratio": 0.0, "dictionary_ratio": 0.0, "entropy": 0.0, "fields_found": []}
+
+    word_like = 0
+    words = 0
+    dictionary_words = 0
+    for token in tokens:
+        core = token.strip(string.punctuation)
+        if _is_word_like(core):
+            word_like += 1
+        if core.isalpha():
+            words += 1
+            if core.lower() in COMMON_WORDS:
+                dictionary_words += 1
+
+    word_ratio = word_like / len(tokens)
+    dictionary_ratio = dictionary_words / words if words else 0.0
+    entropy = character_class_entropy(text)
+    fields_found = [name for name, pattern in FIELD_PATTERNS.items() if pattern.search(text)]
+
+    components = {
+        "word_ratio": word_ratio,
+        "dictionary_ratio": min(1.0, dictionary_ratio / DICTIONARY_RATIO_FOR_FULL_SCORE),
+        "entropy": _entropy_score(entropy),
+        "fields": min(1.0, len(fields_found) / FIELD_KINDS_FOR_FULL_SCORE)
+    }
+    if len(tokens) < MIN_SCORED_TOKENS:
+        # Too little text to expect common words or field values
+        components["dictionary_ratio"] = components["fields"] = 1.0
+
+    score = sum(WEIGHTS[name] * value for name, value in components.items())
+    return {
+        "score": round(score, 3),
+        "word_ratio": round(word_ratio, 3),
+        "dictionary_ratio": round(dictionary_ratio, 3),
+        "entropy": round(entropy, 3),
+        "fields_found": fields_found
+    }
+
+def strip_markdown(text: str) -> str:
+    """Text without markdown table rules, table row pipes, heading/list markers and bold markers"""
+    text = _TABLE_SEPARATOR_ROW.sub("", text)
+    text = _TABLE_ROW.sub(lambda row: row.group(0).replace("|", " "), text)
+    text = _LINE_MARKER.sub("", text)
+    return _BOLD.sub("", text)
+
+def character_class_entropy(text: str) -> float:
+    """Shannon entropy (bits) of the text over lower, upper, other letters, digits, whitespace and symbols"""
+    counts = [0] * 6
+    for char in text:
+        if char.islower():
+            counts[0] += 1
+        elif char.isupper():
+            counts[1] += 1
+        elif char.isalpha():
+            counts[2] += 1
+        elif char.isdigit():
+            counts[3] += 1
+        elif char.isspace():
+            counts[4] += 1
+        else:
+            counts[5] += 1
+    total = sum(counts)
+    return -sum(count / total * math.log2(count / total) for count in counts if count)
+
+def _entropy_score(entropy: float) -> float:
+    low, high = ENTROPY_BAND
+    if entropy < low:
+        return entropy / low
+    if entropy > high:
+        return max(0.0, (ENTROPY_MAX - entropy) / (ENTROPY_MAX - high))
+    return 1.0
+
+def _is_word_like(core: str) -> bool:
+    """A word, number or acronym rather than a fragment of misread glyphs"""
+    if not core or len(core) > 25:
+        return False
+    if any(char.isdigit() for char in core):
+        # Numbers, dates and codes ("2021-22", "12,50,000", "DST/TMD/2021") are fine
+        return sum(1 for char in core if char.isalnum() or char in "/.,-:") == len(core)
+    if not core.isalpha() or _REPEATED_CHAR.search(core.lower()):
+        return False
+    return core.isupper() or len(core) <= 2 or any(char in _VOWELS for char in core)
@@ -0,0 +1,151 @@
+"""
+Page rendering and upload encoding for OCR
+Chooses render resolution per page and compresses page images under a byte budget
+"""
+import io
+import logging
+from typing import Tuple, Optional, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+# PyMuPDF renders at 72 DPI for a scale of 1.0
+BASE_DPI = 72
+FIXED_SCALE = 2.0
+MIN_SCALE = 1.0
+MAX_SCALE = 3.0
+
+# Characters per square inch above which a page counts as dense small print
+DENSE_TEXT_CHARS_PER_SQ_INCH = 40
+DENSE_TEXT_BOOST = 1.25
+
+# Pixels darker than this level count as ink; a page image with no more than
+# BLANK_MAX_INK_RATIO of its pixels inked (scanner specks) is blank
+INK_LEVEL = 128
+BLANK_MAX_INK_RATIO = 0.0001
+
+# Lossy quality ladder tried until the encoded page fits the byte budget
+QUALITY_STEPS = [85, 75, 65, 55, 45]
+MIN_UPLOAD_LONG_SIDE_PX = 1000
+
+def choose_render_scale(page, target_long_side_px: int) -> float:
+    """
+    Pick a render scale for a page from its dimensions and content
+
+    The page is scaled so its long side lands near target_long_side_px. Dense
+    small print gets a modest boost, and scanned pages are never rendered finer
+    than the resolution of the embedded scan itself.
+    """
+    long_side_pt = max(page.rect.width, page.rect.height) or 1
+    scale = target_long_side_px / long_side_pt
+
+    area_sq_inch = (page.rect.width / BASE_DPI) * (page.rect.height / BASE_DPI)
+    if area_sq_inch:
+        char_density = len(page.get_text("text")) / area_sq_inch
+        if char_density > DENSE_TEXT_CHARS_PER_SQ_INCH:
+            scale *= DENSE_TEXT_BOOST
+
+    native_scale = _embedded_image_scale(page)
+    if native_scale:
+        scale = min(scale, native_scale)
+
+    return round(max(MIN_SCALE, min(MAX_SCALE, scale)), 2)
+
+def _embedded_image_scale(page) -> Optional[float]:
+    """Scale at which the largest embedded image on the page is shown at its native resolution"""
+    try:
+        best_scale = None
+        best_area = 0
+        for image_info in page.get_images(full=True):
+            xref, width = image_info[0], image_info[2]
+            for rect in page.get_image_rects(xref):
+                if rect.width and rect.width * rect.height > best_area:
+                    best_area = rect.width * rect.height
+                    best_scale = width / rect.width
+        return best_scale
+    except Exception as e:
+        logger.debug(f"Could not inspect embedded images: {str(e)}")
+        return None
+
+def render_page(page, mode: str, target_long_side_px: int, grayscale: bool,
+                scale_factor: float = 1.0) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Render a PDF page to a pixmap, returning the pixmap and the render settings used
+
+    scale_factor renders finer than the mode would (for a second OCR attempt),
+    still capped at MAX_SCALE.
+    """
+    if mode == "adaptive":
+        scale = choose_render_scale(page, target_long_side_px)
+        colorspace = fitz.csGRAY if grayscale else fitz.csRGB
+    else:
+        scale = FIXED_SCALE
+        colorspace = fitz.csRGB
+    if scale_factor != 1.0:
+        scale = round(max(MIN_SCALE, min(MAX_SCALE, scale * scale_factor)), 2)
+
+    pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), colorspace=colorspace, alpha=False)
+    return pix, {
+        "mode": mode,
+        "scale": scale,
+        "dpi": int(scale * BASE_DPI),
+        "grayscale": pix.n == 1,
+        "width": pix.width,
+        "height": pix.height
+    }
+
+def is_blank_page(image) -> bool:
+    """Whether a PIL page image carries no ink worth OCRing (e.g. the blank back of a scanned sheet)"""
+    histogram = (image if image.mode == "L" else image.convert("L")).histogram()
+    total = sum(histogram) or 1
+    return sum(histogram[:INK_LEVEL]) / total <= BLANK_MAX_INK_RATIO
+
+def encode_for_upload(image, mode: str, image_format: str, max_bytes: int,
+                      binarize: bool) -> Tuple[bytes, str, Dict[str, Any]]:
+    """
+    Encode a PIL page image for upload to a remote OCR API
+
+    Fixed mode keeps the original lossless PNG. Adaptive mode walks down a
+    lossy quality ladder, then downscales, until the page fits max_bytes.
+    Returns (data, mime type, encode settings).
+    """
+    if mode != "adaptive":
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+        data = buffer.getvalue()
+        return data, "image/png", {"format": "PNG", "bytes": len(data)}
+
+    image_format = image_format.upper()
+    if image_format not in ("JPEG", "WEBP"):
+        image_format = "JPEG"
+
+    if binarize:
+        image = image.convert("L").point(lambda value: 255 if value > 160 else 0)
+    if image.mode not in ("L", "RGB"):
+        image = image.convert("RGB")
+
+    while True:
+        for quality in QUALITY_STEPS:
+            buffer = io.BytesIO()
+            image.save(buffer, format=image_format, quality=quality)
+            data = buffer.getvalue()
+            if len(data) <= max_bytes:
+                break
+
+        if len(data) <= max_bytes or max(image.size) <= MIN_UPLOAD_LONG_SIDE_PX:
+            break
+        image = image.resize((int(image.width * 0.8), int(image.height * 0.8)))
+
+    return data, f"image/{image_format.lower()}", {
+        "format": image_format,
+        "quality": quality,
+        "binarized": binarize,
+        "upload_width": image.width,
+        "upload_height": image.height,
+        "bytes": len(data)
+    }
@@ -0,0 +1,124 @@
+"""
+Layout-aware table extraction for PDFs
+Finds ruled/aligned tables on text-layer pages and keeps their row and cell
+structure, which plain get_text() linearises away
+"""
+import logging
+import re
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from processors.excel_reader import map_headers, normalize_header_name
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+def _clean_cell(value: Any) -> str:
+    """Cell text on one line; wrapped cell text comes back with embedded newlines"""
+    return re.sub(r'\s+', ' ', str(value)).strip() if value is not None else ""
+
+def _clean_rows(rows: List[List[Any]]) -> List[List[str]]:
+    cleaned = [[_clean_cell(cell) for cell in row] for row in rows]
+    return [row for row in cleaned if any(row)]
+
+def _looks_like_header(row: List[str]) -> bool:
+    """Every cell filled in and none holding a number, as column titles usually are"""
+    return all(row) and not any(re.search(r'\d', cell) for cell in row)
+
+def find_page_tables(page) -> List[Dict[str, Any]]:
+    """
+    Find tables on a PyMuPDF page
+
+    Returns [{"page", "bbox", "rows"}] where rows[0] is the table's header
+    row as PyMuPDF detected it (on a continuation page this is a data row).
+    """
+    if not hasattr(page, "find_tables"):  # PyMuPDF < 1.23
+        return []
+
+    tables = []
+    for table in page.find_tables().tables:
+        rows = table.extract()
+        if table.header.external:
+            rows = [table.header.names] + rows
+        rows = _clean_rows(rows)
+        if len(rows) >= 2:
+            tables.append({
+                "page": page.number + 1,
+                "bbox": [round(value, 1) for value in table.bbox],
+                "rows": rows
+            })
+    return tables
+
+def find_pdfplumber_tables(pdf_path: Path, page_numbers: List[int]) -> List[Dict[str, Any]]:
+    """Find tables with pdfplumber on the given 1-based pages (for PyMuPDF without find_tables)"""
+    if not PDFPLUMBER_AVAILABLE:
+        return []
+
+    tables = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_number in page_numbers:
+            page = pdf.pages[page_number - 1]
+            for table in page.find_tables():
+                rows = _clean_rows(table.extract())
+                if len(rows) >= 2:
+                    tables.append({
+                        "page": page_number,
+                        "bbox": [round(value, 1) for value in table.bbox],
+                        "rows": rows
+                    })
+    return tables
+
+def tables_to_rows(tables: List[Dict[str, Any]],
+                   column_aliases: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+    """
+    Turn extracted tables into row dicts keyed like structured Excel rows
+
+    The first row of each table is its header. A table on the page after the
+    previous table, with the same width and a first row that is not a header,
+    is treated as that table continuing onto the next page. The first row is
+    a header if it maps to any of the expected columns or, without column
+    aliases, if it looks like one (all cells filled in, no numbers).
+    Each row carries _page and _row (1-based row within its table).
+    Returns {"rows", "tables": [{"page", "columns", "rows"}]}.
+    """
+    column_aliases = column_aliases or {}
+    all_rows: List[Dict[str, Any]] = []
+    summaries = []
+    previous_keys: Optional[Dict[int, str]] = None
+    previous_width = 0
+    previous_page = 0
+
+    for table in tables:
+        rows = table["rows"]
+        width = len(rows[0])
+        mapping = map_headers(tuple(rows[0]), column_aliases) if column_aliases else {}
+        is_header = bool(mapping) if column_aliases else _looks_like_header(rows[0])
+
+        if (not is_header and previous_keys is not None and width == previous_width
+                and table["page"] == previous_page + 1):
+            keys, data_rows, first_row = previous_keys, rows, 1
+        else:
+            keys = {
+                index: mapping.get(index, normalize_header_name(value) or f"column_{index + 1}")
+                for index, value in enumerate(rows[0])
+            }
+            data_rows, first_row = rows[1:], 2
+
+        for offset, row in enumerate(data_rows):
+            record = {key: (row[index] or None) for index, key in keys.items() if index < len(row)}
+            record.update({"_page": table["page"], "_row": first_row + offset})
+            all_rows.append(record)
+
+        summaries.append({
+            "page": table["page"],
+            "columns": {keys[index]: rows[0][index] for index in mapping},
+            "rows": len(data_rows)
+        })
+        previous_keys, previous_width, previous_page = keys, width, table["page"]
+
+    return {"rows": all_rows, "tables": summaries}
@@ -158,6 +158,7 @@ def simplify_single_validation_response(original_response: Dict[str, Any]) -> Di
                 "confidence_factors": validation_result["ai_analysis"].get("confidence_factors", {})
             },
             "database_comparison": validation_result.get("database_comparison", {}),
+            "extraction_info": original_response["data"].get("extraction_info", {}),
             "validation_timestamp": validation_result.get("validation_timestamp", datetime.now().isoformat()),
             "criteria_info": {
                 "code": validation_result.get("criteria_code"),
@@ -143,6 +143,673 @@ def test_system_integration():
         print("❌ System has issues - check configuration")
         return False
 
+class _StubResponse:
+    """Minimal HTTP response for driving MistralOCRClient without the network"""
+    
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self._body = body
+        self.text = json.dumps(body) if body is not None else "error"
+        self.headers = {}
+    
+    def json(self):
+        if self._body is None:
+            raise ValueError("No JSON body")
+        return self._body
+
+class _StubHTTP:
+    """Replays queued responses to MistralOCRClient.post calls"""
+    
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+    
+    def post(self, url, headers, json, timeout):
+        self.calls += 1
+        return self.responses.pop(0)
+    
+    def close(self):
+        pass
+
+def _stub_mistral_client(responses, failure_threshold=5, reset_timeout=0.05):
+    from processors.mistral_client import MistralOCRClient
+    
+    client = MistralOCRClient(
+        api_key="test", api_url="http://mistral.test/v1", timeout=1, max_connections=1,
+        requests_per_second=0, max_retries=0, backoff_base=0, backoff_max=0,
+        failure_threshold=failure_threshold, reset_timeout=reset_timeout
+    )
+    client._http = _StubHTTP(responses)
+    return client
+
+def test_circuit_breaker():
+    """Test the breaker's closed -> open -> half-open -> closed/open transitions"""
+    print("🔌 Testing Circuit Breaker...")
+    import time
+    from processors.mistral_client import CircuitBreaker
+    
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.05)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.get_state() == "closed" and breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.get_state() == "open" and not breaker.allow_request()
+    
+    time.sleep(0.06)
+    assert breaker.get_state() == "half_open"
+    assert breaker.allow_request(), "one trial call is let through once reset_timeout has passed"
+    assert not breaker.allow_request(), "only one trial call at a time"
+    breaker.record_failure()
+    assert breaker.get_state() == "open", "a failed trial reopens the circuit"
+    
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.release_trial()
+    assert breaker.allow_request(), "a released trial slot can be taken again"
+    breaker.record_success()
+    assert breaker.get_state() == "closed" and breaker.allow_request()
+    
+    print("   ✅ Breaker state machine transitions are correct")
+    return True
+
+def test_circuit_breaker_trial_outcomes():
+    """Test that every way a half-open trial call ends frees the trial slot"""
+    print("🔌 Testing Circuit Breaker Trial Outcomes...")
+    import time
+    from processors.mistral_client import MistralOCRError, CircuitOpenError
+    
+    ok = _StubResponse(200, {"choices": [{"message": {"content": "page text"}}]})
+    outages = [_StubResponse(503) for _ in range(5)]
+    
+    for trial, expected_state in [
+        (_StubResponse(400), "half_open"),            # Rejected page: no outcome, slot released
+        (_StubResponse(200, {"unexpected": []}), "open"),  # Malformed 200: counts as a failure
+        (_StubResponse(200), "open"),                 # 200 without a JSON body: counts as a failure
+    ]:
+        client = _stub_mistral_client(outages + [trial, ok])
+        for _ in range(5):
+            try:
+                client.ocr_image("aW1n", "image/png")
+            except MistralOCRError:
+                pass
+        assert client.circuit_breaker.get_state() == "open"
+        
+        time.sleep(0.06)
+        try:
+            client.ocr_image("aW1n", "image/png")
+            raise AssertionError("trial call should have failed")
+        except CircuitOpenError:
+            raise AssertionError("trial call should have reached the API")
+        except MistralOCRError:
+            pass
+        assert client.circuit_breaker.get_state() == expected_state, client.circuit_breaker.get_state()
+        
+        time.sleep(0.06)
+        assert client.ocr_image("aW1n", "image/png") == "page text", "next trial call is let through"
+        assert client.circuit_breaker.get_state() == "closed" and client.is_available
+        assert client._http.calls == 7
+    
+    print("   ✅ Rejected and malformed trial calls do not wedge the breaker")
+    return True
+
+def test_text_quality():
+    """Test OCR text quality scoring on clean, garbled and empty page text"""
+    print("🔍 Testing OCR Text Quality Estimation...")
+    from processors.ocr_quality import estimate_text_quality
+    
+    clean = estimate_text_quality(
+        "This is to certify that Dr. John Doe of the Department of Computer Science has been awarded "
+        "a research grant of Rs. 2,50,000 by the funding agency UGC for the project Advanced AI Research "
+        "in the year 2024. Sanction letter No. UGC/2024/117 dated 12/03/2024."
+    )
+    garbled = estimate_text_quality(
+        "Tbis ls tc certlfv tbat Dr. Jcbn Dce cf tbe Dcpartmcnt cf Ccmputcr Sclcncc bas bccn ||| .... "
+        "~~ rcscarcb grsnt cf Rs. Z,5O,OOO bv tbe fundlng sgcncv UGC fcr tbe prcjcct"
+    )
+    empty = estimate_text_quality("   ")
+    
+    assert clean["score"] >= 0.75, clean
+    assert garbled["score"] < clean["score"] - 0.2, (garbled, clean)
+    assert {"year", "amount"} <= set(clean["fields_found"]), clean["fields_found"]
+    assert empty["score"] == 0.0
+    
+    print(f"   ✅ Clean page {clean['score']:.2f}, garbled page {garbled['score']:.2f}, empty page 0")
+    return True
+
+def test_markdown_table_quality():
+    """Test that a cleanly read markdown table (as Mistral returns tables) is not escalated"""
+    print("🔍 Testing OCR Text Quality of Markdown Tables...")
+    from config.settings import settings
+    from processors.ocr_quality import estimate_text_quality, strip_markdown
+    
+    table_page = (
+        "## Research Grants Sanctioned\n\n"
+        "| Sl. No | Name of the Project | Principal Investigator | Year of Award | Amount (Rs. Lakhs) |\n"
+        "|---|:---|---|:---:|---:|\n"
+        "| 1 | Solar Desalination Membranes | Dr. Anita Rao | 2021-22 | 12.50 |\n"
+        "| 2 | Graphene Battery Anodes | Dr. Vikram Sen | 2021-22 | 18.50 |\n"
+        "| 3 | Rural Water Quality Sensors | Dr. Meera Iyer | 2022-23 | 7.00 |\n\n"
+        "**Total:** Rs. 38.00 Lakhs"
+    )
+    quality = estimate_text_quality(table_page)
+    
+    assert quality["score"] >= settings.OCR_ESCALATION_CONFIDENCE, quality
+    assert quality["word_ratio"] == 1.0, quality
+    assert "|" not in strip_markdown(table_page) and "---" not in strip_markdown(table_page)
+    # Pipes outside table rows are still read as noise
+    assert strip_markdown("Sanction ||| letter dated 2021") == "Sanction ||| letter dated 2021"
+    
+    print(f"   ✅ Markdown table page scores {quality['score']:.2f}, above the escalation threshold")
+    return True
+
+def test_table_rows():
+    """Test turning extracted PDF/DOCX tables into structured rows"""
+    print("📋 Testing Table Row Extraction...")
+    from processors.table_extractor import tables_to_rows
+    
+    column_aliases = {"name_of_project": ["Project title"], "year_of_award": ["Year of Award"]}
+    tables = [
+        {"page": 1, "rows": [["Project title", "Year of Award", "Remarks"],
+                             ["Solar Membranes", "2021", ""],
+                             ["Graphene Anodes", "2022", "Extended"]]},
+        # Continues onto page 2 without repeating the header
+        {"page": 2, "rows": [["Water Sensors", "2023", ""]]},
+        # A new, unrelated table
+        {"page": 3, "rows": [["Item", "Cost"], ["Microscope", "120000"]]}
+    ]
+    result = tables_to_rows(tables, column_aliases)
+    rows = result["rows"]
+    
+    assert [row.get("name_of_project") for row in rows[:3]] == ["Solar Membranes", "Graphene Anodes", "Water Sensors"]
+    assert rows[0] == {"name_of_project": "Solar Membranes", "year_of_award": "2021", "remarks": None,
+                       "_page": 1, "_row": 2}
+    assert (rows[2]["_page"], rows[2]["_row"]) == (2, 1)
+    assert rows[3] == {"item": "Microscope", "cost": "120000", "_page": 3, "_row": 2}
+    assert [table["rows"] for table in result["tables"]] == [2, 1, 1]
+    assert result["tables"][0]["columns"] == {"name_of_project": "Project title", "year_of_award": "Year of Award"}
+    
+    # Without aliases, a same-width table only continues the previous one from
+    # the next page and when its first row is not a header
+    tables = [
+        {"page": 1, "rows": [["Project", "Year"], ["Solar Membranes", "2021"]]},
+        {"page": 2, "rows": [["Graphene Anodes", "2022"]]},
+        {"page": 3, "rows": [["Item", "Cost"], ["Microscope", "120000"]]},
+        {"page": 5, "rows": [["Centrifuge", "45000"], ["Fume Hood", "80000"]]}
+    ]
+    result = tables_to_rows(tables)
+    rows = result["rows"]
+    
+    assert [row.get("project") for row in rows[:2]] == ["Solar Membranes", "Graphene Anodes"]
+    assert rows[2] == {"item": "Microscope", "cost": "120000", "_page": 3, "_row": 2}
+    assert "item" not in rows[3] and rows[3]["_page"] == 5, "a table two pages on is not a continuation"
+    assert [table["rows"] for table in result["tables"]] == [1, 1, 1, 1]
+    
+    print("   ✅ Headers, continuation tables and row positions are correct")
+    return True
+
+def test_excel_header_mapping():
+    """Test mapping of spreadsheet headers onto criteria column names"""
+    print("📑 Testing Excel Header Mapping...")
+    from processors.excel_reader import map_headers
+    
+    column_aliases = {
+        "name_of_project": ["Name of the Project/ Endowments, Chairs", "Project title"],
+        "name_of_principal_investigator": ["Principal Investigator", "PI name"],
+        "year_of_award": ["Year of Award"],
+        "amount_sanctioned": ["Amount Sanctioned", "Amount"],
+        "department_of_principal_investigator": ["Department"]
+    }
+    header_row = ("Sl. No", "Name of the Project/ Endowments, Chairs", "PI Name", "Yr of Award",
+                  "Amount", "Amount", None, "Department of the Principal Investigator")
+    mapping = map_headers(header_row, column_aliases)
+    
+    assert mapping == {
+        1: "name_of_project",                        # Alias, after normalisation
+        2: "name_of_principal_investigator",         # Alias, case-insensitive
+        3: "year_of_award",                          # Every word of the column name ("yr" = year)
+        4: "amount_sanctioned",                      # First of two matching headers; each column used once
+        7: "department_of_principal_investigator"
+    }, mapping
+    
+    print("   ✅ Aliases, synonyms and repeated headers map correctly")
+    return True
+
+def test_record_join():
+    """Test the keyed hash join of database records to spreadsheet rows"""
+    print("🔗 Testing Record/Row Join...")
+    from validation.criteria.criteria_validator import CriteriaValidator
+    
+    rows = [
+        {"programme_code": "BT-CSE", "programme_name": "B.Tech Computer Science", "year": 2021.0, "_row": 2},
+        {"programme_code": "BT-ECE", "programme_name": "B.Tech Electronics", "year": 2021.0, "_row": 3},
+        # Same programme and year again (a second block of the sheet)
+        {"programme_code": "bt cse", "programme_name": "B.TECH  Computer Science", "year": 2021, "_row": 9},
+        {"programme_code": "BT-ME", "programme_name": None, "year": 2021, "_row": 10}
+    ]
+    records = [
+        {"id": 1, "programme_code": "BT-CSE", "programme_name": "B.Tech Computer Science", "year": "2021"},
+        {"id": 2, "programme_code": "BT-CSE", "programme_name": "B.Tech Computer Science", "year": "2021"},
+        {"id": 3, "programme_code": "BT-CSE", "programme_name": "B.Tech Computer Science", "year": "2021"},
+        {"id": 4, "programme_code": "BT-ECE", "programme_name": "B.Tech Electronics", "year": "2021"},
+        {"id": 5, "programme_code": "BT-ME", "programme_name": "B.Tech Mechanical", "year": "2021"}
+    ]
+    join = CriteriaValidator(load_content_validator=False).join_records_with_rows("2.1.1", records, rows)
+    matched_rows = {match["record_id"]: match["row"] and match["row"]["_row"] for match in join["matches"]}
+    
+    assert join["join_fields"] == ["programme_code", "programme_name", "year"]
+    # Duplicate keys are handed out once each, in sheet order; the third record finds none left
+    assert matched_rows == {1: 2, 2: 9, 3: None, 4: 3, 5: None}, matched_rows
+    assert (join["matched_records"], join["unmatched_records"], join["rows_indexed"]) == (3, 2, 4)
+    
+    print("   ✅ Normalised keys match and duplicate rows are each used once")
+    return True
+
+def _write_docx(path, body_xml):
+    """Write a minimal DOCX whose document body is body_xml"""
+    import zipfile
+    
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{body_xml}</w:body></w:document>'
+    )
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", document)
+
+def test_docx_text():
+    """Test DOCX text extraction with page breaks and tables"""
+    print("📝 Testing DOCX Text Extraction...")
+    import tempfile
+    from processors.docx_reader import extract_docx_text
+    
+    def paragraph(*runs):
+        return "<w:p>" + "".join(f"<w:r>{run}</w:r>" for run in runs) + "</w:p>"
+    
+    def table(rows):
+        return "<w:tbl>" + "".join(
+            "<w:tr>" + "".join(f"<w:tc>{paragraph(f'<w:t>{cell}</w:t>')}</w:tc>" for cell in row) + "</w:tr>"
+            for row in rows
+        ) + "</w:tbl>"
+    
+    body = (
+        paragraph("<w:t>Sanction Letter</w:t>")
+        + paragraph("<w:t>Amount:</w:t>", "<w:tab/>", "<w:t>Rs. 2,50,000</w:t>")
+        + paragraph('<w:br w:type="page"/>')
+        + paragraph("<w:t>Annexure</w:t>")
+        + table([["Project title", "Year of Award"], ["Solar Membranes", "2021"], ["", ""]])
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        docx_path = Path(directory) / "letter.docx"
+        _write_docx(docx_path, body)
+        docx = extract_docx_text(docx_path)
+    
+    assert docx["pages"] == [
+        (1, "Sanction Letter\nAmount:\tRs. 2,50,000"),
+        (2, "Annexure\nProject title | Year of Award\nSolar Membranes | 2021")
+    ], docx["pages"]
+    assert docx["tables"] == [{"page": 2, "rows": [["Project title", "Year of Award"], ["Solar Membranes", "2021"]]}]
+    assert docx["paragraphs"] == 3
+    
+    print("   ✅ Pages, tabs and table rows are extracted in reading order")
+    return True
+
+class _FakeOCREngine:
+    """
+    Stand-in for a real OCR engine (same name and profile) answering from a
+    page number -> (text, confidence) table and recording the pages it is sent
+    """
+    
+    def __init__(self, name, pages=None):
+        from processors.ocr_engines import OCREngine
+        
+        self.engine = OCREngine.from_profile(name)
+        self.pages = pages or {}
+        self.calls = []
+    
+    def ocr_page(self, i, image, render_info):
+        self.calls.append(render_info.get("page_number", i + 1))
+        return self.pages.get(render_info.get("page_number", i + 1), ("", None))
+
+def _ocr_processor(cache_dir, fake_engines=(), policy="cost"):
+    """UnifiedOCRProcessor with its caches in cache_dir and only the given fake engines registered"""
+    from config.settings import settings
+    from processors.ocr_engines import OCREngineRegistry, OCRRouter
+    from processors.ocr_processor import UnifiedOCRProcessor
+    
+    default_cache_dir = settings.EXTRACTION_CACHE_DIR
+    settings.EXTRACTION_CACHE_DIR = Path(cache_dir)
+    try:
+        processor = UnifiedOCRProcessor()
+    finally:
+        settings.EXTRACTION_CACHE_DIR = default_cache_dir
+    
+    engines = {fake.engine.name: fake for fake in fake_engines}
+    processor.engines = OCREngineRegistry()
+    for fake in fake_engines:
+        processor.engines.register(fake.engine)
+    processor.ocr_router = OCRRouter(processor.engines, policy, settings.OCR_ESCALATION_CONFIDENCE)
+    processor.ocr_methods = processor.engines.names()
+    processor.preprocess_engines = set()
+    processor._get_page_ocr_function = lambda method: engines[method].ocr_page
+    return processor
+
+def _scan_image(lines):
+    """PNG bytes of a white page with the given lines of black text, standing in for a scan"""
+    import io
+    from PIL import Image, ImageDraw
+    
+    image = Image.new("L", (850, 1100), 255)
+    draw = ImageDraw.Draw(image)
+    for number, line in enumerate(lines):
+        draw.text((60, 60 + number * 40), line, fill=0, font_size=24)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def _write_pdf(path, pages):
+    """Write a PDF from ("text", lines), ("scan", lines), ("drawing", None) or ("blank", None) pages"""
+    import fitz
+    
+    doc = fitz.open()
+    for kind, content in pages:
+        page = doc.new_page()
+        if kind == "text":
+            page.insert_text((72, 72), "\n".join(content), fontsize=11)
+        elif kind == "scan":
+            page.insert_image(page.rect, stream=_scan_image(content))
+        elif kind == "drawing":
+            page.draw_rect(fitz.Rect(72, 72, 300, 200), color=(0, 0, 0))
+    doc.save(str(path))
+    doc.close()
+
+CERTIFICATE_LINES = [
+    "Certificate of Research Grant",
+    "This is to certify that Dr. Anita Rao, Department of Chemistry, has been awarded",
+    "a grant of Rs. 12,50,000 for the project Solar Desalination Membranes in 2021-22."
+]
+
+def test_pdf_page_classification():
+    """Test which PDF pages are read from the text layer, OCR'd or marked empty"""
+    print("🗂️  Testing PDF Page Classification...")
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_path = Path(directory) / "bundle.pdf"
+        _write_pdf(pdf_path, [
+            ("text", CERTIFICATE_LINES),
+            ("text", [" "]),                # A font but only whitespace, like a trailing page from Word
+            ("blank", None),
+            ("scan", CERTIFICATE_LINES),
+            ("text", ["Annexure II"]),      # Too short to be usable, but nothing else on the page
+            ("drawing", None)               # Vector graphics only (e.g. outlined text)
+        ])
+        processor = _ocr_processor(directory)
+        try:
+            pages = processor._classify_pdf_pages(pdf_path)
+            
+            assert [page["needs_ocr"] for page in pages] == [False, False, False, True, False, True], pages
+            assert [page["empty"] for page in pages] == [False, True, True, False, False, False], pages
+            
+            # With no OCR engine the scanned pages are reported as failed, and the result is not cached
+            result = processor.extract_text(pdf_path)
+            assert result["ocr_pages"] == [4, 6]
+            assert result["ocr_failed_pages"] == [4, 6]
+            assert any("No OCR engine available" in error for error in result["errors"]), result["errors"]
+            assert "Annexure II" in result["text"]
+            assert processor.cache.get_stats()["entries"] == 0
+        finally:
+            processor.close()
+    
+    print("   ✅ Whitespace-only pages are not OCR'd; scans without an engine are reported, not cached")
+    return True
+
+GARBLED_LINE = "Tbis ls tc certlfv tbat Dr. Anlta Rso, Dcpartmcnt cf Cbcmlstrv, bas bccn ||| .... ~~ sw4rdcd"
+
+def test_ocr_routing():
+    """Test the engine plan per policy and that only weak pages are escalated (and re-rendered)"""
+    print("🧭 Testing OCR Engine Routing...")
+    import tempfile
+    from processors.ocr_engines import OCREngine, OCREngineRegistry, OCRRouter
+    
+    def plan(names, policy="cost"):
+        registry = OCREngineRegistry()
+        for name in names:
+            registry.register(OCREngine.from_profile(name))
+        return OCRRouter(registry, policy).plan()
+    
+    assert plan(["tesseract", "mistral"]) == ["tesseract", "mistral"], "fast free engine first"
+    assert plan(["easyocr", "mistral"]) == ["mistral", "easyocr"], "slow free engine only for escalation"
+    assert plan(["easyocr"]) == ["easyocr"]
+    assert plan(["easyocr", "tesseract", "mistral"]) == ["tesseract", "mistral", "easyocr"]
+    assert plan(["easyocr", "tesseract", "mistral"], "quality") == ["mistral", "easyocr", "tesseract"]
+    
+    certificate = " ".join(CERTIFICATE_LINES)
+    tesseract = _FakeOCREngine("tesseract", {1: (certificate, 0.92), 2: (GARBLED_LINE, 0.41), 3: ("", None)})
+    mistral = _FakeOCREngine("mistral", {page: (certificate, None) for page in (1, 2, 3)})
+    
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_path = Path(directory) / "scans.pdf"
+        _write_pdf(pdf_path, [("scan", CERTIFICATE_LINES)] * 3)
+        processor = _ocr_processor(directory, [tesseract, mistral])
+        try:
+            result = processor.extract_text(pdf_path)
+        finally:
+            processor.close()
+    
+    assert sorted(tesseract.calls) == [1, 2, 3]
+    assert sorted(mistral.calls) == [2, 3], "only the weak and empty pages go to the remote engine"
+    assert result["page_ocr_methods"] == ["tesseract", "mistral", "mistral"]
+    routing = result["page_ocr_routing"]
+    assert [attempt["engine"] for attempt in routing[1]["attempts"]] == ["tesseract", "mistral"]
+    assert [page["reason"] for page in routing] == ["accepted"] * 3
+    assert result["ocr_estimated_cost"] == 2 * mistral.engine.cost_per_page
+    assert result["ocr_failed_pages"] == [] and not result["errors"]
+    
+    print("   ✅ Tesseract reads every page first; Mistral only gets the two it read poorly")
+    return True
+
+def test_extraction_cache():
+    """Test that document results are cached by content and configuration, and expire"""
+    print("🗄️  Testing Extraction Cache Keys and Invalidation...")
+    
+    import shutil
+    import tempfile
+    import time
+    from config.settings import settings
+    from processors.cache import ResultCache
+    
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_path = Path(directory) / "certificate.pdf"
+        _write_pdf(pdf_path, [("text", CERTIFICATE_LINES)])
+        processor = _ocr_processor(directory)
+        try:
+            assert not processor.extract_text(pdf_path)["cache_hit"]
+            assert processor.extract_text(pdf_path)["cache_hit"]
+            
+            # Keyed by content, not by name
+            renamed_path = Path(directory) / "renamed.pdf"
+            shutil.copy(pdf_path, renamed_path)
+            assert processor.extract_text(renamed_path)["cache_hit"]
+            
+            # A setting that changes what is extracted invalidates the entry
+            default_table_extraction = settings.PDF_TABLE_EXTRACTION
+            settings.PDF_TABLE_EXTRACTION = not default_table_extraction
+            try:
+                assert not processor.extract_text(pdf_path)["cache_hit"]
+            finally:
+                settings.PDF_TABLE_EXTRACTION = default_table_extraction
+            
+            # So does a change to the file itself
+            _write_pdf(pdf_path, [("text", CERTIFICATE_LINES[:2])])
+            assert not processor.extract_text(pdf_path)["cache_hit"]
+            
+            # Both tables share one file, so each gets half of the size limit
+            stats = processor.get_status()
+            assert (stats["extraction_cache"]["max_size_mb"] + stats["page_ocr_cache"]["max_size_mb"]
+                    == settings.EXTRACTION_CACHE_MAX_MB)
+        finally:
+            processor.close()
+        
+        expiring = ResultCache(Path(directory) / "ttl.sqlite3", ttl_hours=0.1 / 3600)
+        expiring.put("key", {"text": "cached"})
+        assert expiring.get("key") == {"text": "cached"}
+        time.sleep(0.2)
+        assert expiring.get("key") is None, "entries older than the TTL are not returned"
+    
+    print("   ✅ Same content hits, changed content or settings miss, old entries expire")
+    return True
+
+def test_page_ocr_cache():
+    """Test that a re-uploaded document only sends its changed pages to the OCR engine"""
+    print("📑 Testing Per-Page OCR Cache...")
+    
+    import tempfile
+    
+    other_lines = ["Certificate of Research Grant", "Awarded to Dr. Vikram Sen for Graphene Battery Anodes, 2021-22."]
+    pages = {page: (" ".join(CERTIFICATE_LINES), 0.92) for page in (1, 2, 4)}
+    tesseract = _FakeOCREngine("tesseract", pages)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        first_pdf = Path(directory) / "first.pdf"
+        second_pdf = Path(directory) / "second.pdf"
+        # Page 3 is a blank scan: rendered, but never looked up in the cache or OCR'd
+        _write_pdf(first_pdf, [("scan", CERTIFICATE_LINES), ("scan", other_lines), ("scan", []),
+                               ("scan", CERTIFICATE_LINES)])
+        _write_pdf(second_pdf, [("scan", CERTIFICATE_LINES), ("scan", other_lines), ("scan", []),
+                                ("scan", CERTIFICATE_LINES[:2])])
+        processor = _ocr_processor(directory, [tesseract])
+        try:
+            first = processor.extract_text(first_pdf)
+            tesseract.calls.clear()
+            second = processor.extract_text(second_pdf)
+        finally:
+            processor.close()
+    
+    assert (first["page_cache_hits"], first["page_cache_misses"]) == (0, 3), first
+    assert tesseract.calls == [4], "only the page that changed is OCR'd again"
+    assert not second["cache_hit"]
+    assert (second["page_cache_hits"], second["page_cache_misses"]) == (2, 1), second
+    
+    print("   ✅ Unchanged pages come from the page cache; the blank page counts as neither hit nor miss")
+    return True
+
+def test_early_exit():
+    """Test that OCR stops once the pages read satisfy is_complete, and the partial result is not cached"""
+    print("⏩ Testing Early Exit...")
+    
+    import tempfile
+    
+    projects = ["Solar Desalination Membranes", "Graphene Battery Anodes", "Rural Water Quality Sensors",
+                "Bamboo Composite Panels"]
+    certificates = [f"Certificate of Research Grant awarded for the project {project} in 2021-22."
+                    for project in projects]
+    mistral = _FakeOCREngine("mistral", {page: (text, None) for page, text in enumerate(certificates, start=1)})
+    
+    def found_graphene(text):
+        return "Graphene" in text
+    
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_path = Path(directory) / "certificates.pdf"
+        _write_pdf(pdf_path, [("scan", [text]) for text in certificates])
+        processor = _ocr_processor(directory, [mistral])
+        processor.max_workers = 1  # One page per batch
+        try:
+            first = processor.extract_text(pdf_path, is_complete=found_graphene)
+            first_calls = list(mistral.calls)
+            second = processor.extract_text(pdf_path, is_complete=found_graphene)
+            text_layer_pdf = Path(directory) / "annexure.pdf"
+            _write_pdf(text_layer_pdf, [("text", ["Annexure: Graphene Battery Anodes"]), ("scan", CERTIFICATE_LINES)])
+            mistral.calls.clear()
+            text_layer = processor.extract_text(text_layer_pdf, is_complete=found_graphene)
+        finally:
+            processor.close()
+    
+    assert first_calls == [1, 2], "OCR stops after the page that completes the check"
+    assert first["early_exit"] and first["pages_skipped"] == [3, 4]
+    assert "Graphene" in first["text"] and "Bamboo" not in first["text"]
+    assert not second["cache_hit"], "a partial extraction is not cached"
+    assert second["pages_skipped"] == [3, 4]
+    assert mistral.calls == [] and text_layer["early_exit"] and text_layer["pages_skipped"] == [2], \
+        "a text layer that completes the check skips OCR altogether"
+    
+    print("   ✅ Pages after the one that completes the check are skipped, and the result is not cached")
+    return True
+
+def test_page_index():
+    """Test that page_index spans slice each page's text out of a mixed text/scan PDF"""
+    print("🗂️  Testing Page Index...")
+    
+    import tempfile
+    import processors.ocr_processor as ocr_processor
+    
+    scan_text = " ".join(CERTIFICATE_LINES)
+    tesseract = _FakeOCREngine("tesseract", {2: (scan_text, 0.92)})
+    page_images = []
+    
+    def ocr_page(i, image, render_info):
+        page_images.append(image)
+        return tesseract.ocr_page(i, image, render_info)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_path = Path(directory) / "mixed.pdf"
+        _write_pdf(pdf_path, [("text", ["Annexure 3.1.1 grants list"]), ("scan", CERTIFICATE_LINES),
+                              ("text", ["Signed by the Registrar"])])
+        processor = _ocr_processor(directory, [tesseract])
+        processor._get_page_ocr_function = lambda method: ocr_page
+        # Without PIL, rendered pages are handed to the engine as temporary PNG files
+        pil_available = ocr_processor.PIL_AVAILABLE
+        ocr_processor.PIL_AVAILABLE = False
+        try:
+            result = processor.extract_text(pdf_path)
+        finally:
+            ocr_processor.PIL_AVAILABLE = pil_available
+            processor.close()
+    
+    text = result["text"]
+    spans = [(entry["page"], entry["source"], text[entry["start"]:entry["end"]]) for entry in result["page_index"]]
+    assert [(page, source) for page, source, _ in spans] == [(1, "text_layer"), (2, "ocr"), (3, "text_layer")]
+    assert "Annexure 3.1.1" in spans[0][2] and "Registrar" not in spans[0][2]
+    assert spans[1][2] == scan_text
+    assert spans[2][2].strip() == "Signed by the Registrar"
+    
+    assert len(page_images) == 1 and isinstance(page_images[0], Path)
+    assert not page_images[0].exists(), "the temporary page image is removed once it has been OCR'd"
+    
+    print("   ✅ Each span holds exactly its page's text; temporary page images are cleaned up")
+    return True
+
+def run_unit_tests():
+    """Run the offline unit tests (no database, API server or OCR engine needed)"""
+    unit_tests = [
+        test_circuit_breaker,
+        test_circuit_breaker_trial_outcomes,
+        test_docx_text,
+        test_excel_header_mapping,
+        test_record_join,
+        test_table_rows,
+        test_text_quality,
+        test_markdown_table_quality,
+        test_pdf_page_classification,
+        test_ocr_routing,
+        test_extraction_cache,
+        test_page_ocr_cache,
+        test_page_index,
+        test_early_exit,
+    ]
+    
+    tests_passed = 0
+    for test in unit_tests:
+        try:
+            if test():
+                tests_passed += 1
+        except AssertionError as e:
+            print(f"   ❌ {test.__name__} failed: {str(e) or 'assertion failed'}")
+        except Exception as e:
+            print(f"   ❌ {test.__name__} errored: {type(e).__name__}: {str(e)}")
+    
+    print(f"\n📊 Unit Test Results: {tests_passed}/{len(unit_tests)} tests passed")
+    return tests_passed == len(unit_tests)
+
 def main():
     """Main test runner"""
     print("🧪 NAAC Validation System - Test Suite")
@@ -151,6 +818,10 @@ def main():
     # Run comprehensive test
     success = test_system_integration()
     
+    # Offline unit tests
+    print()
+    success = run_unit_tests() and success
+    
     if success:
         print("\n🎉 System is ready for use!")
     else:
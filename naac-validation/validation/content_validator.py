@@ -4,7 +4,7 @@ Validates extracted document content against expected criteria data
 """
 import logging
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from decimal import Decimal
 
@@ -366,6 +366,55 @@ class NAACContentValidator:
             "total_fields_checked": len(content_fields)
         }
 
+    def select_candidate_pages(self, database_record: Dict[str, Any], extracted_text: str,
+                               page_index: List[Dict[str, Any]], max_pages: int) -> Tuple[str, List[int]]:
+        """
+        Narrow a document to the pages most likely to hold a database record
+        
+        Each page span from the extraction page index is scored by how many
+        record fields it matches. Pages scoring at least half the best score are
+        kept (best first, up to max_pages) and returned in document order. When
+        no page matches anything the full text is returned so nothing is lost.
+        
+        Returns:
+            Tuple of (candidate text, candidate page numbers)
+        """
+        if not page_index or len(page_index) <= 1:
+            return extracted_text, [entry["page"] for entry in page_index or []]
+        
+        scored = []
+        for entry in page_index:
+            page_text = extracted_text[entry["start"]:entry["end"]]
+            found = len(self._compare_with_database(database_record, page_text)["found_fields"])
+            if found:
+                scored.append((found, entry))
+        
+        if not scored:
+            return extracted_text, [entry["page"] for entry in page_index]
+        
+        best = max(found for found, _ in scored)
+        top = sorted((item for item in scored if item[0] * 2 >= best), key=lambda item: -item[0])[:max_pages]
+        selected = sorted((entry for _, entry in top), key=lambda entry: entry["start"])
+        
+        candidate_text = '\n'.join(extracted_text[entry["start"]:entry["end"]] for entry in selected)
+        return candidate_text, [entry["page"] for entry in selected]
+
+    def missing_fields(self, fields: Dict[str, Any], extracted_text: str,
+                       weak_match_types: Tuple[str, ...] = ("partial",)) -> List[str]:
+        """
+        Fields whose values are not (yet) found in the text
+        
+        Matches of a type in weak_match_types do not count as found; by default
+        a loose partial word overlap is not enough to confirm a field.
+        """
+        text_lower = extracted_text.lower()
+        missing = []
+        for field, value in fields.items():
+            match_found, match_type = self._find_field_match(field, value, text_lower)
+            if not match_found or match_type in weak_match_types:
+                missing.append(field)
+        return missing
+
     def _find_field_match(self, field: str, value: Any, text_lower: str) -> tuple:
         """Generalized field matching logic"""
         import re
@@ -2,14 +2,18 @@
 NAAC Criteria-specific validation rules and logic with database model integration
 """
 import logging
-from typing import Dict, Any, List, Optional
+import re
+from typing import Dict, Any, List, Optional, Callable
 from validation.content_validator import NAACContentValidator
+from config.settings import settings
 
 class CriteriaValidator:
     """Validates documents against specific NAAC criteria requirements and database models"""
     
-    def __init__(self):
-        self.content_validator = NAACContentValidator()
+    def __init__(self, load_content_validator: bool = True):
+        # The LLM content validator needs LangChain and a Groq API key. Record joins
+        # and column aliases do not, so it can be left to be created on first use
+        self._content_validator = NAACContentValidator() if load_content_validator else None
         
         # Simplified, generic criteria requirements - easy to extend
         self.criteria_requirements = {
@@ -17,7 +21,15 @@ class CriteriaValidator:
                 "name": "Number of teaching staff joined the institution during the last five years",
                 "database_model": "response_2_1_1",
                 "required_fields": ["programme_name", "year", "no_of_students"],
-                "validation_rules": {"year": "within_assessment_period", "no_of_students": "positive_number"}
+                "validation_rules": {"year": "within_assessment_period", "no_of_students": "positive_number"},
+                "column_aliases": {
+                    "programme_name": ["Programme name", "Name of the Programme", "Program name"],
+                    "programme_code": ["Programme Code", "Program code"],
+                    "no_of_seats": ["Number of seats sanctioned", "Seats sanctioned"],
+                    "no_of_students": ["Number of Students admitted", "Students admitted"],
+                    "year": ["Year", "Academic year"]
+                },
+                "join_fields": ["programme_code", "programme_name", "year"]
             },
             "3.1.1": {
                 "name": "Grants received from Government and non-governmental agencies for research projects",
@@ -26,13 +38,33 @@ class CriteriaValidator:
                 "validation_rules": {
                     "amount_sanctioned": "positive_number_crores",
                     "year_of_award": "within_assessment_period"
-                }
+                },
+                "column_aliases": {
+                    "name_of_project": ["Name of the Project/ Endowments, Chairs", "Project title", "Title of the project"],
+                    "name_of_principal_investigator": ["Name of the Principal Investigator/ Co Investigator", "Principal Investigator", "PI name"],
+                    "department_of_principal_investigator": ["Department of Principal Investigator", "Department"],
+                    "year_of_award": ["Year of Award"],
+                    "amount_sanctioned": ["Amount Sanctioned", "Funds provided (INR in lakhs)", "Amount"],
+                    "duration_of_project": ["Duration of the project", "Duration"],
+                    "name_of_funding_agency": ["Name of the Funding agency", "Funding agency"],
+                    "type": ["Type (Government/Non-Government)", "Type"]
+                },
+                "join_fields": ["name_of_project", "year_of_award"]
             },
             "3.2.1": {
                 "name": "Institution has created an ecosystem for innovations and has initiatives for creation and transfer of knowledge",
                 "database_model": "response_3_2_1",
                 "required_fields": ["paper_title", "author_names", "journal_name", "year_of_publication"],
-                "validation_rules": {"year_of_publication": "within_assessment_period"}
+                "validation_rules": {"year_of_publication": "within_assessment_period"},
+                "column_aliases": {
+                    "paper_title": ["Title of paper", "Paper title"],
+                    "author_names": ["Name of the author/s", "Authors"],
+                    "department": ["Department of the teacher", "Department"],
+                    "journal_name": ["Name of journal", "Journal"],
+                    "year_of_publication": ["Year of publication"],
+                    "issn_number": ["ISSN number", "ISSN"]
+                },
+                "join_fields": ["paper_title", "year_of_publication"]
             }
         }
         
@@ -41,7 +73,9 @@ class CriteriaValidator:
             "name": "NAAC Criteria Validation",
             "database_model": "response_generic",
             "required_fields": [],
-            "validation_rules": {}
+            "validation_rules": {},
+            "column_aliases": {},
+            "join_fields": []
         }
         
         # Criteria-specific AI validation instructions
@@ -79,7 +113,8 @@ class CriteriaValidator:
         }
 
     def validate_criteria_document(self, criteria_code: str, database_record: Dict[str, Any], 
-                                  extracted_text: str) -> Dict[str, Any]:
+                                  extracted_text: str,
+                                  page_index: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Validate document for specific NAAC criteria against database record
         
@@ -87,6 +122,8 @@ class CriteriaValidator:
             criteria_code: NAAC criteria code (e.g., "3.1.1")
             database_record: Database record data to validate against
             extracted_text: Text extracted from document
+            page_index: Optional page spans of extracted_text; matching and the
+                LLM prompt are then restricted to the record's candidate pages
         """
         
         if criteria_code not in self.criteria_requirements:
@@ -100,6 +137,12 @@ class CriteriaValidator:
         
         criteria_info = self.criteria_requirements[criteria_code]
         
+        candidate_pages = []
+        if page_index:
+            extracted_text, candidate_pages = self.content_validator.select_candidate_pages(
+                database_record, extracted_text, page_index, settings.VALIDATION_MAX_CANDIDATE_PAGES
+            )
+        
         # Use generalized AI instructions for all criteria
         ai_instructions = self.ai_instructions["default"].format(
             criteria_code=criteria_code,
@@ -119,6 +162,7 @@ class CriteriaValidator:
             "criteria_code": criteria_code,
             "criteria_name": criteria_info["name"],
             "database_model": criteria_info.get("database_model", ""),
+            "candidate_pages": candidate_pages,
             "criteria_validation": criteria_validation,
             "required_fields_check": self._check_required_fields(
                 database_record, criteria_info["required_fields"]
@@ -355,8 +399,100 @@ class CriteriaValidator:
             for code, info in self.criteria_requirements.items()
         ]
 
+    def required_fields_matcher(self, criteria_code: str,
+                                database_record: Dict[str, Any]) -> Optional[Callable[[str], bool]]:
+        """
+        Build a check for whether extracted text already confirms a record's required fields
+        
+        Used to stop OCR early once every required field with a value in the
+        record is found. Returns None when the criteria is unknown or the record
+        has none of its required fields, since then no text could confirm it.
+        """
+        criteria_info = self.criteria_requirements.get(criteria_code)
+        if not criteria_info:
+            return None
+        
+        fields = {
+            field: database_record[field] for field in criteria_info["required_fields"]
+            if database_record.get(field) is not None and str(database_record[field]).strip()
+        }
+        if not fields:
+            return None
+        
+        return lambda text: not self.content_validator.missing_fields(fields, text)
+
+    @property
+    def content_validator(self) -> NAACContentValidator:
+        """LLM content validator, created now if the constructor skipped it"""
+        if self._content_validator is None:
+            self._content_validator = NAACContentValidator()
+        return self._content_validator
+
+    def get_column_aliases(self, criteria_code: str) -> Dict[str, List[str]]:
+        """Spreadsheet header variants for each response_* column of a criteria"""
+        return self.criteria_requirements.get(criteria_code, {}).get("column_aliases", {})
+
+    def join_records_with_rows(self, criteria_code: str, database_records: List[Dict[str, Any]],
+                               rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Match database records to structured spreadsheet rows with a keyed hash join
+        
+        The join key is built from the criteria's join_fields that appear in the
+        rows, with values normalised (case, spacing, punctuation, 2021.0 -> 2021).
+        Rows are indexed once, so each record is a single dictionary lookup.
+        Rows sharing a key (e.g. the same programme in several year blocks) are
+        handed out in sheet order, one record each.
+        
+        Returns:
+            Dict with join_fields, per-record matches (row or None) and counts
+        """
+        criteria_info = self.criteria_requirements.get(criteria_code, self.default_criteria_template)
+        row_columns = set().union(*(row.keys() for row in rows)) if rows else set()
+        join_fields = [field for field in criteria_info.get("join_fields", []) if field in row_columns]
+        
+        result = {
+            "join_fields": join_fields,
+            "matches": [],
+            "matched_records": 0,
+            "unmatched_records": 0,
+            "rows_indexed": len(rows)
+        }
+        
+        index: Dict[tuple, List[Dict[str, Any]]] = {}
+        if join_fields:
+            for row in reversed(rows):
+                key = self._join_key(row, join_fields)
+                if key is not None:
+                    index.setdefault(key, []).append(row)
+        
+        for record in database_records:
+            key = self._join_key(record, join_fields) if join_fields else None
+            candidates = index.get(key) if key is not None else None
+            row = candidates.pop() if candidates else None
+            result["matches"].append({"record_id": record.get("id"), "row": row})
+            if row is not None:
+                result["matched_records"] += 1
+            else:
+                result["unmatched_records"] += 1
+        
+        return result
+
+    def _join_key(self, data: Dict[str, Any], fields: List[str]) -> Optional[tuple]:
+        """Normalised join key for a record or row, or None if any key field is blank"""
+        key = []
+        for field in fields:
+            value = data.get(field)
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
+            normalized = re.sub(r'[^a-z0-9]+', ' ', str(value).lower()).strip() if value is not None else ""
+            if not normalized:
+                return None
+            key.append(normalized)
+        return tuple(key)
+
     def add_criteria(self, criteria_code: str, name: str, database_model: str, 
-                    required_fields: List[str], validation_rules: Dict[str, str] = None) -> bool:
+                    required_fields: List[str], validation_rules: Dict[str, str] = None,
+                    column_aliases: Dict[str, List[str]] = None, join_fields: List[str] = None) -> bool:
         """
         Dynamically add new criteria configuration
         
@@ -366,6 +502,8 @@ class CriteriaValidator:
             database_model: Database model name (e.g., "response_4_1_1")
             required_fields: List of required field names
             validation_rules: Optional validation rules dict
+            column_aliases: Optional spreadsheet header variants per column
+            join_fields: Optional columns identifying a record in spreadsheet uploads
             
         Returns:
             bool: Success status
@@ -375,7 +513,9 @@ class CriteriaValidator:
                 "name": name,
                 "database_model": database_model,
                 "required_fields": required_fields or [],
-                "validation_rules": validation_rules or {}
+                "validation_rules": validation_rules or {},
+                "column_aliases": column_aliases or {},
+                "join_fields": join_fields or []
             }
             return True
         except Exception as e:
@@ -4,13 +4,12 @@ from fastapi.middleware.cors import CORSMiddleware  # ADD THIS IMPORT
 import os
 import shutil
 from uuid import uuid4
+from starlette.concurrency import run_in_threadpool
 
-from core.ocr_processor import OCRProcessor
-from core.field_extractor import FieldExtractor
-from core.validator import DocumentValidator
+from core.components import ComponentRegistry
+from core.page_processor import PageProcessor
+from core.record_matcher import RecordMatcher
 from database.queries import DatabaseQueries
-from utils.json_output import JSONOutput
-from utils.file_handler import FileHandler
 
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -21,6 +20,10 @@ os.makedirs(UPLOADS_DIR, exist_ok=True)
 
 app = FastAPI(title="NAAC Validator API")
 
+# Extractors/validators per criteria code and the page worker processes, shared by all requests
+components = ComponentRegistry()
+page_processor = PageProcessor(components=components)
+
 # ADD CORS MIDDLEWARE - This is the fix!
 app.add_middleware(
     CORSMiddleware,
@@ -105,12 +108,9 @@ async def validate_file(criteria_code: str = Form(...), file: UploadFile = File(
     # Initialize components
     try:
         print(f"\nInitializing validator components...")
-        ocr = OCRProcessor()
-        file_handler = FileHandler()
-        extractor = FieldExtractor(criteria_code)
-        validator = DocumentValidator(criteria_code)
+        validator = components.validator(criteria_code)
         db = DatabaseQueries()
-        output = JSONOutput()
+        output = components.output
         print(f"✓ Components initialized")
     except Exception as exc:
         print(f"✗ Failed to initialize components: {exc}")
@@ -135,9 +135,10 @@ async def validate_file(criteria_code: str = Form(...), file: UploadFile = File(
             pass
         raise HTTPException(status_code=500, detail=f"Database error: {exc}")
 
-    # Get number of pages
+    # Read pages and extract fields in parallel, off the event loop
     try:
-        page_count = file_handler.get_pdf_page_count(staging_path)
+        page_results = await run_in_threadpool(page_processor.process_pages, staging_path, criteria_code)
+        page_count = len(page_results)
         print(f"✓ PDF has {page_count} pages")
     except Exception as exc:
         print(f"✗ Failed to read PDF: {exc}")
@@ -148,42 +149,50 @@ async def validate_file(criteria_code: str = Form(...), file: UploadFile = File(
             pass
         raise HTTPException(status_code=400, detail=f"Failed to read PDF pages: {exc}")
 
+    # Pair pages with the DB records their fields match best (the SELECT has no order)
+    record_mapping = RecordMatcher(validator).match(
+        [(page["page_num"] + 1, page["fields"]) for page in page_results if page["has_text"] and not page["error"]],
+        db_records
+    )
+    page_records = {pair["page_number"]: pair["record_index"] for pair in record_mapping["pairs"]}
+    # Extra pages (e.g. a cover page) are not failures once every record has found its page
+    extra_pages_allowed = bool(db_records) and not record_mapping["unmatched_records"]
+    print(f"✓ Matched {len(page_records)} pages to records "
+          f"({len(record_mapping['unmatched_pages'])} pages, {len(record_mapping['unmatched_records'])} records unmatched)")
+
     validation_results = []
-    processed_page_count = 0
 
     print(f"\n{'='*60}")
     print(f"Processing Pages")
     print(f"{'='*60}")
 
-    for page_num in range(page_count):
+    for page in page_results:
+        page_num = page["page_num"]
         print(f"\n[Page {page_num + 1}/{page_count}]")
         
         try:
-            # Extract text from page
-            print(f"  └─ Extracting text with OCR...")
-            text = ocr.extract_text_from_pdf_page(staging_path, page_num)
-            
             # Skip pages with no extractable text
-            if not text or len(text.strip()) < 10:
+            if not page["has_text"]:
                 print(f"  └─ ⚠ Skipping page (insufficient text)")
                 continue
             
-            print(f"  └─ ✓ Extracted {len(text)} characters")
+            print(f"  └─ ✓ Extracted {page['text_length']} characters{' by OCR' if page['ocr'] else ''}")
             
-            # Extract fields from text
-            print(f"  └─ Extracting fields...")
-            extracted_fields = extractor.extract_fields_from_text(text)
+            if page["error"]:
+                raise RuntimeError(page["error"])
+            extracted_fields = page["fields"]
             print(f"  └─ ✓ Extracted {len(extracted_fields)} fields")
 
-            if processed_page_count < len(db_records):
-                db_record = db_records[processed_page_count]
-                print(f"  └─ Validating against DB record {processed_page_count + 1}...")
+            if page_num + 1 in page_records:
+                record_index = page_records[page_num + 1]
+                print(f"  └─ Validating against DB record {record_index + 1}...")
                 validation_result = validator.validate_page_fields(
-                    extracted_fields, db_record, page_num + 1
+                    extracted_fields, db_records[record_index], page_num + 1
                 )
                 print(f"  └─ {'✓ VALID' if validation_result.get('is_valid') else '✗ INVALID'}")
                 validation_results.append(validation_result)
-                processed_page_count += 1
+            elif extra_pages_allowed:
+                print(f"  └─ ⚠ Page matches no database record, left unassigned")
             else:
                 # No DB record to compare against
                 print(f"  └─ ⚠ No database record available")
@@ -215,7 +224,9 @@ async def validate_file(criteria_code: str = Form(...), file: UploadFile = File(
             failed_page = result.get("page_number")
             break
 
-    final_report = output.generate_validation_report(criteria_code, validation_results, failed_page)
+    final_report = output.generate_validation_report(
+        criteria_code, validation_results, failed_page, record_mapping=record_mapping
+    )
     
     overall_status = final_report.get("validation_summary", {}).get("overall_status")
     passed = final_report.get("validation_summary", {}).get("passed", 0)
@@ -258,6 +269,18 @@ async def validate_file(criteria_code: str = Form(...), file: UploadFile = File(
     return JSONResponse(status_code=200, content=response)
 
 
+@app.on_event("startup")
+async def startup():
+    """Build the validation components for every supported criteria up front"""
+    components.warm_up()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop the page and OCR worker processes"""
+    page_processor.close()
+
+
 @app.get("/database-records")
 async def get_database_records(criteria_code: str):
     """Get database records for a criteria code via query parameter.
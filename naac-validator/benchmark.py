@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+NAAC Validator - Benchmarks
+
+Usage:
+    python benchmark.py pdf-pages                      # /validate page reading time vs page count
+    python benchmark.py pdf-pages --pages 10 100 400   # Custom page counts
+    python benchmark.py pdf-pages --pdf uploads/a.pdf  # Custom documents
+    python benchmark.py page-workers                   # Page reading + field extraction time vs worker count
+    python benchmark.py page-workers --workers 1 4 8 --pages 50 400
+    python benchmark.py fields                         # FieldExtractor fields/sec on the sample PDFs
+    python benchmark.py fields --criteria 3.1.1 --seconds 5
+    python benchmark.py cpu-ocr                        # Tesseract pages/sec per OCR worker count
+    python benchmark.py cpu-ocr --workers 1 2 4 --copies 4
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+CERTIFICATE_TEXT = (
+    "CERTIFICATE OF RESEARCH GRANT\n"
+    "Name of the Project: Solar Desalination Membranes Phase {page}\n"
+    "Principal Investigator: Dr. Anita Rao, Department of Chemistry\n"
+    "Funding Agency: Department of Science and Technology\n"
+    "Year of Award: 2021-22    Amount Sanctioned: Rs. {amount},000\n"
+    "Duration: 3 years\n"
+)
+
+def make_pdf(page_count, directory):
+    """Write a text PDF of research grant certificates, one per page"""
+    import fitz
+
+    path = Path(directory) / f"certificates_{page_count}.pdf"
+    doc = fitz.open()
+    for page in range(1, page_count + 1):
+        doc.new_page().insert_text((72, 72), CERTIFICATE_TEXT.format(page=page, amount=100 + page), fontsize=11)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+def read_pages_per_page_open(pdf_path):
+    """Page reading as /validate did it: count pages, then reopen and reparse the file for every page"""
+    from core.ocr_processor import OCRProcessor
+    from utils.file_handler import FileHandler
+
+    ocr = OCRProcessor()
+    page_count = FileHandler().get_pdf_page_count(pdf_path)
+    return [ocr.extract_text_from_pdf_page(pdf_path, page_num) for page_num in range(page_count)]
+
+def read_pages_session(pdf_path, backend):
+    """Page reading through one PDFDocument session"""
+    from core.pdf_document import PDFDocument
+
+    with PDFDocument(pdf_path, backend=backend) as document:
+        return [text for _, text in document.iter_pages()]
+
+def time_call(function, repeats):
+    """Best wall time of several runs (seconds)"""
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def benchmark_pdf_pages(args):
+    """Per-request page reading time for each page count, before and after the open-once session"""
+    from core.pdf_document import PYMUPDF_AVAILABLE
+
+    variants = [
+        ("per-page open (PyPDF2)", read_pages_per_page_open),
+        ("session (PyPDF2)", lambda path: read_pages_session(path, "pypdf2")),
+    ]
+    if PYMUPDF_AVAILABLE:
+        variants.append(("session (PyMuPDF)", lambda path: read_pages_session(path, "pymupdf")))
+
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_paths = [Path(p) for p in args.pdf] if args.pdf else [make_pdf(count, directory) for count in args.pages]
+
+        header = f"{'pages':>6}" + "".join(f"{name:>26}" for name, _ in variants)
+        print(header)
+        print("-" * len(header))
+        for pdf_path in pdf_paths:
+            page_count = len(read_pages_session(str(pdf_path), "pypdf2"))
+            # The quadratic variant is only repeated on small documents
+            timings = [
+                time_call(lambda: function(str(pdf_path)), args.repeats if page_count <= 100 else 1)
+                for _, function in variants
+            ]
+            baseline = timings[0]
+            cells = "".join(f"{timing * 1000:>16.1f} ms ({baseline / timing:>4.1f}x)" for timing in timings)
+            print(f"{page_count:>6}{cells}")
+
+def benchmark_page_workers(args):
+    """Time for PageProcessor to read and extract fields from every page, per worker count"""
+    import os
+    from core.page_processor import PageProcessor
+
+    worker_counts = args.workers or sorted({1, 2, os.cpu_count() or 1})
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_paths = [make_pdf(count, directory) for count in args.pages]
+
+        header = f"{'pages':>6}" + "".join(f"{f'{workers} workers':>24}" for workers in worker_counts)
+        print(header)
+        print("-" * len(header))
+        for pdf_path, page_count in zip(pdf_paths, args.pages):
+            timings = []
+            for workers in worker_counts:
+                processor = PageProcessor(max_workers=workers)
+                processor.process_pages(str(pdf_path), args.criteria)  # Start the worker processes
+                timings.append(time_call(lambda: processor.process_pages(str(pdf_path), args.criteria), args.repeats))
+                processor.close()
+            baseline = timings[0]
+            cells = "".join(f"{timing * 1000:>14.1f} ms ({baseline / timing:>4.1f}x)" for timing in timings)
+            print(f"{page_count:>6}{cells}")
+
+def benchmark_fields(args):
+    """Fields/sec of FieldExtractor over the sample PDF pages, one extractor per request as /validate uses it"""
+    import io
+    import contextlib
+    from core.pdf_document import PDFDocument
+    from core.field_extractor import FieldExtractor
+    from validation.criteria_validator import CriteriaValidator
+
+    pdf_paths = [Path(p) for p in args.pdf] if args.pdf else sorted((Path(__file__).parent / "uploads").glob("*.pdf"))
+    texts = []
+    for pdf_path in pdf_paths:
+        with PDFDocument(str(pdf_path)) as document:
+            texts.extend(text for _, text in document.iter_pages())
+    if not texts:
+        print("No sample pages found")
+        return
+
+    criteria_codes = args.criteria or list(CriteriaValidator().criteria_requirements)
+    print(f"{len(texts)} pages from {len(pdf_paths)} PDFs")
+    print(f"{'criteria':>10}{'fields/page':>13}{'fields/sec':>14}")
+    print("-" * 37)
+    for criteria_code in criteria_codes:
+        fields = 0
+        pages = 0
+        start = time.perf_counter()
+        # The extractor prints some values it finds; keep the table readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            while time.perf_counter() - start < args.seconds:
+                extractor = FieldExtractor(criteria_code)
+                for text in texts:
+                    fields += len(extractor.extract_fields_from_text(text))
+                pages += len(texts)
+        elapsed = time.perf_counter() - start
+        print(f"{criteria_code:>10}{fields / pages:>13.0f}{fields / elapsed:>14,.0f}")
+
+def benchmark_cpu_ocr(args):
+    """Pages/sec of OCRProcessor.extract_text_from_images per worker count, on the sample pages rendered as scans"""
+    import os
+    from core.ocr_processor import OCRProcessor
+    from core.page_processor import OCR_RENDER_DPI
+    from core.pdf_document import PDFDocument
+
+    if not OCRProcessor().available:
+        print("Tesseract is not installed; install it to benchmark OCR")
+        return
+
+    pdf_paths = [Path(p) for p in args.pdf] if args.pdf else sorted((Path(__file__).parent / "uploads").glob("*.pdf"))
+    worker_counts = args.workers or sorted({1, 2, os.cpu_count() or 1})
+    with tempfile.TemporaryDirectory() as directory:
+        image_paths = []
+        for pdf_path in pdf_paths:
+            with PDFDocument(str(pdf_path), backend="pymupdf") as document:
+                for page_num, text in document.iter_pages():
+                    if text.strip():
+                        image_path = os.path.join(directory, f"{pdf_path.stem}_{page_num + 1}.png")
+                        document.render_page(page_num, image_path, dpi=OCR_RENDER_DPI)
+                        image_paths.append(image_path)
+        image_paths *= args.copies
+
+        print(f"{len(image_paths)} pages from {len(pdf_paths)} PDFs at {OCR_RENDER_DPI} DPI, "
+              f"{os.cpu_count()} CPUs, preprocessing {'on' if args.preprocess else 'off'}")
+        print(f"{'workers':>8}{'seconds':>10}{'pages/sec':>11}{'per worker':>12}")
+        print("-" * 41)
+        for workers in worker_counts:
+            ocr = OCRProcessor(max_workers=workers, preprocess=args.preprocess)
+            try:
+                ocr.warm_up()  # Worker start-up is excluded from the timing
+                start = time.perf_counter()
+                ocr.extract_text_from_images(image_paths)
+                elapsed = time.perf_counter() - start
+            finally:
+                ocr.close()
+            pages_per_sec = len(image_paths) / elapsed
+            print(f"{workers:>8}{elapsed:>10.2f}{pages_per_sec:>11.2f}{pages_per_sec / workers:>12.2f}")
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="NAAC Validator Benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pdf_pages = subparsers.add_parser("pdf-pages", help="Page reading time vs page count, per-page open vs session")
+    pdf_pages.add_argument("--pages", type=int, nargs="+", default=[10, 50, 100, 200])
+    pdf_pages.add_argument("--pdf", nargs="+", help="PDF files to read instead of synthetic certificates")
+    pdf_pages.add_argument("--repeats", type=int, default=3)
+
+    page_workers = subparsers.add_parser("page-workers", help="Parallel page processing time vs worker count")
+    page_workers.add_argument("--workers", type=int, nargs="+")
+    page_workers.add_argument("--pages", type=int, nargs="+", default=[10, 100, 400])
+    page_workers.add_argument("--criteria", default="3.1.1")
+    page_workers.add_argument("--repeats", type=int, default=3)
+
+    fields = subparsers.add_parser("fields", help="FieldExtractor fields/sec on the sample PDFs")
+    fields.add_argument("--criteria", nargs="+", help="Criteria codes (default: all supported)")
+    fields.add_argument("--pdf", nargs="+", help="PDF files to read instead of uploads/*.pdf")
+    fields.add_argument("--seconds", type=float, default=1.0, help="Time spent per criteria")
+
+    cpu_ocr = subparsers.add_parser("cpu-ocr", help="Tesseract pages/sec per OCR worker count")
+    cpu_ocr.add_argument("--workers", type=int, nargs="+")
+    cpu_ocr.add_argument("--pdf", nargs="+", help="PDF files to render instead of uploads/*.pdf")
+    cpu_ocr.add_argument("--copies", type=int, default=2, help="Times each page is OCR'd")
+    cpu_ocr.add_argument("--preprocess", action="store_true", help="OpenCV preprocessing before Tesseract")
+
+    args = parser.parse_args()
+    if args.command == "pdf-pages":
+        benchmark_pdf_pages(args)
+    elif args.command == "page-workers":
+        benchmark_page_workers(args)
+    elif args.command == "fields":
+        benchmark_fields(args)
+    elif args.command == "cpu-ocr":
+        benchmark_cpu_ocr(args)
+
+if __name__ == "__main__":
+    main()
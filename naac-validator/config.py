@@ -13,4 +13,18 @@ class Config:
     MYSQL_DATABASE = os.getenv("MYSQL_DATABASE")
 
     # File paths
-    UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER") or "uploads/"
\ No newline at end of file
+    UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER") or "uploads/"
+
+    # OCR worker processes for image-only PDF pages (Tesseract is CPU-bound)
+    OCR_WORKERS = int(os.getenv("OCR_WORKERS") or os.cpu_count() or 1)
+
+    # OpenCV preprocessing (downscale to 300 DPI, border crop, deskew,
+    # adaptive threshold) of images before Tesseract; faster overall on the
+    # sample pages (python benchmark.py cpu-ocr with and without --preprocess)
+    OCR_PREPROCESS = (os.getenv("OCR_PREPROCESS") or "true").lower() == "true"
+
+    # Worker processes that read PDF pages and extract fields in /validate
+    PAGE_WORKERS = int(os.getenv("PAGE_WORKERS") or os.cpu_count() or 1)
+
+    # PDF text backend: "pymupdf", "pypdf2" or "auto" (PyMuPDF when installed)
+    PDF_BACKEND = (os.getenv("PDF_BACKEND") or "auto").lower()
\ No newline at end of file
@@ -2,7 +2,11 @@
 Core processing modules for NAAC document validation
 """
 from .ocr_processor import OCRProcessor
+from .pdf_document import PDFDocument
+from .page_processor import PageProcessor
+from .record_matcher import RecordMatcher
+from .components import ComponentRegistry
 from .field_extractor import FieldExtractor
 from .validator import DocumentValidator
 
-__all__ = ['OCRProcessor', 'FieldExtractor', 'DocumentValidator']
\ No newline at end of file
+__all__ = ['OCRProcessor', 'PDFDocument', 'PageProcessor', 'RecordMatcher', 'ComponentRegistry', 'FieldExtractor', 'DocumentValidator']
\ No newline at end of file
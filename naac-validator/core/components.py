@@ -0,0 +1,54 @@
+import threading
+
+from validation.criteria_validator import CriteriaValidator
+from core.field_extractor import FieldExtractor
+from core.validator import DocumentValidator
+from utils.json_output import JSONOutput
+
+
+class ComponentRegistry:
+    """
+    Shared validation components, created once and reused across requests
+
+    Extractors and validators are kept per supported criteria code and built
+    on first use (or up front by warm_up). They hold no per-request state, so
+    one instance serves concurrent requests. Codes that are not configured
+    get a fresh, uncached instance, so arbitrary codes sent by clients cannot
+    grow the registry. DatabaseQueries is not kept here:
+    it stores its open connection on the instance, so each request needs
+    its own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.criteria = CriteriaValidator()
+        self.output = JSONOutput()
+        self._extractors = {}
+        self._validators = {}
+
+    def extractor(self, criteria_code):
+        """Shared FieldExtractor for a criteria code"""
+        return self._get(self._extractors, criteria_code,
+                         lambda: FieldExtractor(criteria_code, criteria_validator=self.criteria))
+
+    def validator(self, criteria_code):
+        """Shared DocumentValidator for a criteria code"""
+        return self._get(self._validators, criteria_code, lambda: DocumentValidator(criteria_code))
+
+    def warm_up(self):
+        """Build the components for every supported criteria code"""
+        for criteria_code in self.criteria.criteria_requirements:
+            self.extractor(criteria_code)
+            self.validator(criteria_code)
+
+    def _get(self, instances, criteria_code, create):
+        if criteria_code not in self.criteria.criteria_requirements:
+            return create()
+        instance = instances.get(criteria_code)
+        if instance is None:
+            with self._lock:
+                instance = instances.get(criteria_code)
+                if instance is None:
+                    instance = create()
+                    instances[criteria_code] = instance
+        return instance
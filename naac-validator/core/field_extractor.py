@@ -1,134 +1,60 @@
 import re
+import threading
 from validation.criteria_validator import CriteriaValidator
 
-class FieldExtractor:
-    def __init__(self, criteria_code):
-        self.criteria_code = criteria_code
-        self.validator = CriteriaValidator()
-        self.required_fields = self.validator.get_required_fields(criteria_code)
-    
-    def extract_fields_from_text(self, text):
-        """Extract required fields from OCR text based on criteria"""
-        extracted_data = {}
-        
-        for field in self.required_fields:
-            if field == "name_of_project":
-                extracted_data[field] = self._extract_project_name(text)
-            elif field == "name_of_principal_investigator":
-                extracted_data[field] = self._extract_pi_name(text)
-            elif field == "amount_sanctioned":
-                extracted_data[field] = self._extract_amount(text)
-            elif field == "year_of_award":
-                extracted_data[field] = self._extract_year(text)
-            elif field == "name_of_funding_agency":
-                extracted_data[field] = self._extract_funding_agency(text)
-            # New field types for additional criteria
-            elif field in ["workshop_name", "activity_name", "title_of_activity"]:
-                extracted_data[field] = self._extract_activity_name(text)
-            elif field in ["participants", "student_count", "no_of_teacher", "no_of_student"]:
-                extracted_data[field] = self._extract_count(text)
-            elif field in ["date_from", "date_to"]:
-                extracted_data[field] = self._extract_date(text)
-            elif field in ["teacher_name", "participant_name"]:
-                extracted_data[field] = self._extract_person_name(text)
-            elif field in ["book_chapter_title", "paper_title", "conference_title"]:
-                extracted_data[field] = self._extract_title(text)
-            elif field in ["award_name", "awarding_body"]:
-                extracted_data[field] = self._extract_award_info(text)
-            elif field in ["collaborating_agency", "scheme_name", "publisher_name", "institution_name"]:
-                extracted_data[field] = self._extract_organization(text)
-            elif field in ["duration", "activities_list"]:
-                extracted_data[field] = self._extract_description(text)
-            elif field in ["year_of_collaboration", "year_of_mou", "activity_year"]:
-                extracted_data[field] = self._extract_year(text)
-        
-        return extracted_data
-    
-    def _extract_project_name(self, text):
-        """Extract project name from text - try multiple patterns"""
-        patterns = [
+# Field families: the patterns each kind of field is read with, in priority
+# order (the first pattern that matches anywhere in the text wins), the
+# regex flags and which patterns give amounts in crores
+FIELD_FAMILIES = {
+    "project_name": {
+        "flags": re.IGNORECASE | re.DOTALL,
+        "patterns": [
             r'Project Title:\s*([^\n]+)',  # "Project Title: ..."
             r'project titled\s*\n?\s*["\']([^"\']+)["\']',  # 'project titled "..."'
             r'project titled\s+([^\n.,]+)',  # without quotes
         ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                result = match.group(1).strip()
-                # Normalize smart quotes
-                result = result.replace('“', '"').replace('”', '"').replace('‘', "'").replace('’', "'")
-                # Remove leading/trailing quotes and whitespace
-                result = re.sub(r'^[\'"\s]+|[\'"\s]+$', '', result)
-                # Remove stray internal quotes
-                result = result.replace('"', '').replace("'", '')
-                print(f"Extracted project name: {result}")
-                return result.strip()
-        return ""
-
-    def _extract_pi_name(self, text):
-        """Extract PI name from text - try multiple patterns"""
-        patterns = [
+    },
+    "pi_name": {
+        "flags": re.IGNORECASE | re.DOTALL,
+        "patterns": [
             r'Researcher Name:\s*([^\n]+)',  # Format 1: "Researcher Name: ..."
             r'that\s+(Dr\.\s*[^\n,]+?)\s+from',  # Format 2: "that Dr. ... from"
             r'that\s+(Dr\.\s*[A-Za-z\s.]+?),',  # Format 3: "that Dr. John Doe," - capture until comma
             r'Principal Investigator:\s*([^\n]+)',  # Common variant
         ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                return match.group(1).strip()
-        return ""
-    
-    def _extract_amount(self, text):
-        """Extract amount from text - handle Lakhs and Crores"""
-        patterns = [
-            (r'Amount\s*\(in Lakhs\):\s*[₹n]?\s*(\d+\.?\d*)', False),  # Format 1: "Amount (in Lakhs): n2.50"
-            (r'amount of\s+[₹n]?\s*(\d+\.?\d*)\s*Crore', True),  # Format 2: "amount of n 4.00 Crore(s)"
-            (r'amount of\s+[₹n]?\s*(\d+\.?\d*)\s*Lakh', False),  # Format 2: Lakhs variant
-            (r'[₹₹n]\s*(\d+\.?\d*)\s*Crore', True),  # Flexible: "₹4.00 Crore(s)"
-            (r'[₹₹n]\s*(\d+\.?\d*)\s*Lakh', False),  # Format 3: "₹6.00 Lakhs"
-        ]
-        for pattern, is_crores in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                amount = float(match.group(1))
-                # Convert Crores to Lakhs (1 Crore = 100 Lakhs)
-                if is_crores:
-                    amount = amount * 100
-                return str(amount)
-        return ""
-    
-    def _extract_year(self, text):
-        """Extract year from text - try multiple patterns"""
-        patterns = [
+    },
+    "amount": {
+        "flags": re.IGNORECASE,
+        "patterns": [
+            r'Amount\s*\(in Lakhs\):\s*[₹n]?\s*(\d+\.?\d*)',  # Format 1: "Amount (in Lakhs): n2.50"
+            r'amount of\s+[₹n]?\s*(\d+\.?\d*)\s*Crore',  # Format 2: "amount of n 4.00 Crore(s)"
+            r'amount of\s+[₹n]?\s*(\d+\.?\d*)\s*Lakh',  # Format 2: Lakhs variant
+            r'[₹₹n]\s*(\d+\.?\d*)\s*Crore',  # Flexible: "₹4.00 Crore(s)"
+            r'[₹₹n]\s*(\d+\.?\d*)\s*Lakh',  # Format 3: "₹6.00 Lakhs"
+        ],
+        "crores": {1, 3}
+    },
+    "year": {
+        "flags": re.IGNORECASE,
+        "patterns": [
             r'Approval Year:\s*(\d{4})',  # Format 1: "Approval Year: 2024"
             r'in the year\s+(\d{4})',  # Format 2: "in the year 2024"
             r'Award Year:\s*(\d{4})',  # Common variant
             r'year\s+(\d{4})',  # Generic year mention
         ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        return ""
-    
-    def _extract_funding_agency(self, text):
-        """Extract funding agency from text - try multiple patterns"""
-        patterns = [
+    },
+    "funding_agency": {
+        "flags": re.IGNORECASE,
+        "patterns": [
             r'Sponsoring Agency:\s*([^\n]+)',  # Format 1: "Sponsoring Agency: ..."
             r'funding agency\s+([A-Z]{2,})',  # Format 2: "funding agency UGC"
             r'funded by\s+([A-Z]{2,})',  # Format 3: "funded by UGC"
             r'Funding Agency:\s*([^\n]+)',  # Common variant
         ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        return ""
-    
-    def _extract_activity_name(self, text):
-        """Extract activity/workshop/title name from text"""
-        patterns = [
+    },
+    "activity_name": {
+        "flags": re.IGNORECASE,
+        "patterns": [
             r'Workshop Name:\s*([^\n]+)',
             r'Activity Name:\s*([^\n]+)',
             r'Title:\s*([^\n]+)',
@@ -136,17 +62,12 @@ class FieldExtractor:
             r'activity\s*[:\-]\s*([^\n]+)',
             r'title\s*[:\-]\s*([^\n]+)'
         ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        return ""
-    
-    def _extract_count(self, text):
-        """Extract participant/student/teacher counts"""
-        patterns = [
+    },
+    "count": {
+        "flags": re.IGNORECASE,
+        "patterns": [
             r'Participants:\s*(\d+)',
-            r'Students?:\s*(\d+)', 
+            r'Students?:\s*(\d+)',
             r'Teachers?:\s*(\d+)',
             r'Count:\s*(\d+)',
             r'Number:\s*(\d+)',
@@ -154,44 +75,29 @@ class FieldExtractor:
             r'(\d+)\s*students?',
             r'(\d+)\s*teachers?'
         ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        return ""
-    
-    def _extract_date(self, text):
-        """Extract dates from text"""
-        patterns = [
+    },
+    "date": {
+        "flags": re.IGNORECASE,
+        "patterns": [
             r'Date:\s*([0-9\-\/]+)',
             r'From:\s*([0-9\-\/]+)',
             r'To:\s*([0-9\-\/]+)',
             r'([0-9]{1,2}[\/\-][0-9]{1,2}[\/\-][0-9]{4})',
             r'([0-9]{4}[\/\-][0-9]{1,2}[\/\-][0-9]{1,2})'
         ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        return ""
-    
-    def _extract_person_name(self, text):
-        """Extract person names (teacher, participant, etc.)"""
-        patterns = [
+    },
+    "person_name": {
+        "flags": re.IGNORECASE,
+        "patterns": [
             r'Teacher:\s*([^\n]+)',
             r'Participant:\s*([^\n]+)',
             r'Name:\s*([^\n]+)',
             r'([A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)'
         ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        return ""
-    
-    def _extract_title(self, text):
-        """Extract titles (book, paper, conference, etc.)"""
-        patterns = [
+    },
+    "title": {
+        "flags": re.IGNORECASE,
+        "patterns": [
             r'Title:\s*([^\n]+)',
             r'Paper Title:\s*([^\n]+)',
             r'Book Title:\s*([^\n]+)',
@@ -199,15 +105,10 @@ class FieldExtractor:
             r'Chapter:\s*([^\n]+)',
             r'"([^"]+)"'
         ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip().strip('"')
-        return ""
-    
-    def _extract_award_info(self, text):
-        """Extract award names and awarding bodies"""
-        patterns = [
+    },
+    "award_info": {
+        "flags": re.IGNORECASE,
+        "patterns": [
             r'Award:\s*([^\n]+)',
             r'Recognition:\s*([^\n]+)',
             r'Awarded by:\s*([^\n]+)',
@@ -215,15 +116,10 @@ class FieldExtractor:
             r'awarded\s+([^\n]+)',
             r'recognition\s+([^\n]+)'
         ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        return ""
-    
-    def _extract_organization(self, text):
-        """Extract organization/agency/institution names"""
-        patterns = [
+    },
+    "organization": {
+        "flags": re.IGNORECASE,
+        "patterns": [
             r'Agency:\s*([^\n]+)',
             r'Institution:\s*([^\n]+)',
             r'Organization:\s*([^\n]+)',
@@ -232,23 +128,129 @@ class FieldExtractor:
             r'([A-Z][A-Z][A-Z]+)',  # Acronyms like NSS, NCC, etc.
             r'([A-Z][a-z]+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)'
         ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        return ""
-    
-    def _extract_description(self, text):
-        """Extract longer descriptions (duration, activities list, etc.)"""
-        patterns = [
+    },
+    "description": {
+        "flags": re.IGNORECASE,
+        "patterns": [
             r'Duration:\s*([^\n]+)',
             r'Activities:\s*([^\n\.]+)',
             r'Description:\s*([^\n\.]+)',
             r'(\d+\s*(?:days?|months?|years?))',
             r'([^\n]{20,100})'  # Generic longer text
         ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+    },
+}
+
+# Which family each required field is read with
+FIELD_FAMILY_BY_NAME = {
+    "name_of_project": "project_name",
+    "name_of_principal_investigator": "pi_name",
+    "amount_sanctioned": "amount",
+    "year_of_award": "year",
+    "name_of_funding_agency": "funding_agency",
+    "workshop_name": "activity_name", "activity_name": "activity_name", "title_of_activity": "activity_name",
+    "participants": "count", "student_count": "count", "no_of_teacher": "count", "no_of_student": "count",
+    "date_from": "date", "date_to": "date",
+    "teacher_name": "person_name", "participant_name": "person_name",
+    "book_chapter_title": "title", "paper_title": "title", "conference_title": "title",
+    "award_name": "award_info", "awarding_body": "award_info",
+    "collaborating_agency": "organization", "scheme_name": "organization",
+    "publisher_name": "organization", "institution_name": "organization",
+    "duration": "description", "activities_list": "description",
+    "year_of_collaboration": "year", "year_of_mou": "year", "activity_year": "year",
+}
+
+
+class CompiledFamily:
+    """
+    A field family's patterns, compiled once, tried in priority order
+
+    Each pattern is kept as its own regex rather than joined into one
+    alternation: the regex engine scans for a lone pattern's literal prefix
+    far faster than it can try every alternative at each position.
+    """
+
+    def __init__(self, name, patterns, flags):
+        self.name = name
+        self._searches = [re.compile(pattern, flags).search for pattern in patterns]
+
+    def search(self, text):
+        """(pattern index, captured value) of the first pattern matching the text, or None"""
+        for index, search in enumerate(self._searches):
+            match = search(text)
             if match:
-                return match.group(1).strip()
-        return ""
\ No newline at end of file
+                return index, match.group(1)
+        return None
+
+
+COMPILED_FAMILIES = {
+    name: CompiledFamily(name, family["patterns"], family["flags"])
+    for name, family in FIELD_FAMILIES.items()
+}
+
+# Extraction plans by required field list, shared by every FieldExtractor in the
+# process. Keyed by the fields rather than the criteria code, so codes sent by
+# clients that are not configured (no fields) all share one entry.
+_plans = {}
+_plans_lock = threading.Lock()
+
+
+def get_extraction_plan(required_fields):
+    """[(field, family name)] for the fields that can be extracted, built once per field list"""
+    key = tuple(required_fields)
+    with _plans_lock:
+        plan = _plans.get(key)
+        if plan is None:
+            plan = [(field, FIELD_FAMILY_BY_NAME[field]) for field in required_fields if field in FIELD_FAMILY_BY_NAME]
+            _plans[key] = plan
+        return plan
+
+
+class FieldExtractor:
+    def __init__(self, criteria_code, criteria_validator=None):
+        self.criteria_code = criteria_code
+        self.validator = criteria_validator or CriteriaValidator()
+        self.required_fields = self.validator.get_required_fields(criteria_code)
+        self.plan = get_extraction_plan(self.required_fields)
+    
+    def extract_fields_from_text(self, text):
+        """Extract required fields from OCR text based on criteria (each field family is searched once)"""
+        extracted_data = {}
+        family_values = {}
+        
+        for field, family in self.plan:
+            if family not in family_values:
+                family_values[family] = self._extract_family(family, text)
+            extracted_data[field] = family_values[family]
+        
+        return extracted_data
+    
+    def _extract_family(self, family, text):
+        """Value of the highest-priority pattern of a family, cleaned up for that kind of field"""
+        found = COMPILED_FAMILIES[family].search(text)
+        if found is None:
+            return ""
+        index, value = found
+        
+        if family == "project_name":
+            return self._clean_project_name(value)
+        if family == "amount":
+            amount = float(value)
+            # Convert Crores to Lakhs (1 Crore = 100 Lakhs)
+            if index in FIELD_FAMILIES["amount"]["crores"]:
+                amount = amount * 100
+            return str(amount)
+        if family == "title":
+            return value.strip().strip('"')
+        return value.strip()
+    
+    def _clean_project_name(self, value):
+        result = value.strip()
+        # Normalize smart quotes
+        result = result.replace('“', '"').replace('”', '"').replace('‘', "'").replace('’', "'")
+        # Remove leading/trailing quotes and whitespace
+        result = re.sub(r'^[\'"\s]+|[\'"\s]+$', '', result)
+        # Remove stray internal quotes
+        result = result.replace('"', '').replace("'", '')
+        print(f"Extracted project name: {result}")
+        return result.strip()
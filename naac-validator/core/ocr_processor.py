@@ -1,15 +1,53 @@
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, wait
+from itertools import repeat
+
 import pytesseract
 from PIL import Image
 import PyPDF2
-import cv2
-import numpy as np
+
+from config import Config
+from core.image_preprocessing import preprocess_page
+
+
+def _ocr_image(image_path, preprocess):
+    """Tesseract text of one image, after OpenCV deskew/crop/threshold if preprocess is set"""
+    image = Image.open(image_path)
+    if preprocess:
+        dpi = image.info.get("dpi")
+        image, _ = preprocess_page(image, dpi=dpi[0] if dpi else None)
+    return pytesseract.image_to_string(image)
+
+
+def _tesseract_worker(image_path, preprocess):
+    """Run Tesseract on one image inside a worker process"""
+    try:
+        return _ocr_image(image_path, preprocess)
+    except Exception as e:
+        print(f"Error extracting text from image {image_path}: {e}")
+        return ""
+
+
+def _warm_up_worker():
+    """No-op task used to start a worker (importing PIL, OpenCV and pytesseract)"""
+    return os.getpid()
+
 
 class OCRProcessor:
-    def __init__(self):
-        pass
-    
+    def __init__(self, max_workers=None, preprocess=None):
+        self.max_workers = max_workers or Config.OCR_WORKERS
+        self.preprocess = Config.OCR_PREPROCESS if preprocess is None else preprocess
+        self._pool = None
+
+    @property
+    def available(self):
+        """Whether the tesseract binary pytesseract calls can be found"""
+        return shutil.which(pytesseract.pytesseract.tesseract_cmd) is not None
+
     def extract_text_from_pdf_page(self, pdf_path, page_num):
-        """Extract text from specific PDF page"""
+        """Extract text from specific PDF page (parses the whole file each call; use PDFDocument for many pages)"""
         try:
             with open(pdf_path, 'rb') as file:
                 reader = PyPDF2.PdfReader(file)
@@ -19,13 +57,40 @@ class OCRProcessor:
         except Exception as e:
             print(f"Error extracting text from page {page_num}: {e}")
             return ""
-    
+
     def extract_text_from_image(self, image_path):
         """Extract text from image using OCR"""
         try:
-            image = Image.open(image_path)
-            text = pytesseract.image_to_string(image)
-            return text
+            return _ocr_image(image_path, self.preprocess)
         except Exception as e:
             print(f"Error extracting text from image: {e}")
-            return ""
\ No newline at end of file
+            return ""
+
+    def extract_text_from_images(self, image_paths):
+        """OCR several images in parallel worker processes, keeping input order"""
+        if self.max_workers <= 1 or len(image_paths) <= 1:
+            return [self.extract_text_from_image(path) for path in image_paths]
+
+        return list(self._get_pool().map(_tesseract_worker, image_paths, repeat(self.preprocess)))
+
+    def warm_up(self):
+        """Start every worker process before the first images arrive"""
+        if self.max_workers > 1:
+            pool = self._get_pool()
+            wait([pool.submit(_warm_up_worker) for _ in range(self.max_workers)])
+
+    def close(self):
+        """Shut down the OCR worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            # Spawned, not forked, like the page workers: the pool is created from a
+            # request thread, and forking copies whatever locks other threads hold
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
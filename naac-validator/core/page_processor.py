@@ -0,0 +1,144 @@
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from config import Config
+from core.pdf_document import PDFDocument
+from core.components import ComponentRegistry
+from core.ocr_processor import OCRProcessor
+
+# Pages with less text than this are treated as empty or image-only and skipped
+MIN_PAGE_TEXT_CHARS = 10
+# Shorter documents are processed in-process; handing them to workers costs more than it saves
+MIN_PAGES_FOR_WORKERS = 20
+# Resolution image-only pages are rendered at for Tesseract
+OCR_RENDER_DPI = 300
+
+
+# Components of the worker process, built on its first page run
+_worker_components = None
+
+
+def _process_page_range(pdf_path, page_nums, criteria_code, backend):
+    """Read and extract fields for a run of pages inside a worker process (one PDF parse per run)"""
+    global _worker_components
+    if _worker_components is None:
+        _worker_components = ComponentRegistry()
+    extractor = _worker_components.extractor(criteria_code)
+    results = []
+    with PDFDocument(pdf_path, backend=backend) as document:
+        for page_num in page_nums:
+            results.append(_process_page(document, page_num, extractor))
+    return results
+
+
+def _process_page(document, page_num, extractor):
+    text = document.page_text(page_num)
+    has_text = bool(text) and len(text.strip()) >= MIN_PAGE_TEXT_CHARS
+    result = {
+        "page_num": page_num,
+        "text_length": len(text),
+        "has_text": has_text,
+        "needs_ocr": not has_text and document.page_has_images(page_num),
+        "ocr": False,
+        "fields": None,
+        "error": None
+    }
+    _extract_fields(result, text, extractor)
+    return result
+
+
+def _extract_fields(result, text, extractor):
+    if result["has_text"]:
+        try:
+            result["fields"] = extractor.extract_fields_from_text(text)
+        except Exception as e:
+            result["error"] = str(e)
+
+
+class PageProcessor:
+    """
+    Reads PDF pages and extracts their fields in parallel worker processes
+
+    Pages are split into contiguous runs, one per worker, and results come
+    back in page order. Image-only pages (scans without a text layer) are
+    then OCR'd with Tesseract in the OCRProcessor's worker processes.
+    Matching pages to database records stays with the caller
+    (RecordMatcher), since it needs every page's fields at once.
+    """
+
+    def __init__(self, max_workers=None, components=None, ocr=None):
+        self.max_workers = max_workers or Config.PAGE_WORKERS
+        self.components = components or ComponentRegistry()
+        self.ocr = ocr or OCRProcessor()
+        self._pool = None
+
+    def process_pages(self, pdf_path, criteria_code):
+        """
+        Per-page results for every page of the PDF, in page order
+
+        Each result has page_num (0-based), text_length, has_text, fields
+        (None for skipped pages), error (field extraction failure), needs_ocr
+        (image-only page) and ocr (text read by OCR). Raises if the PDF cannot
+        be opened.
+        """
+        results = self._read_pages(pdf_path, criteria_code)
+        self._ocr_pages(pdf_path, criteria_code, [result for result in results if result["needs_ocr"]])
+        return results
+
+    def _read_pages(self, pdf_path, criteria_code):
+        """Text layer and fields of every page, in page order"""
+        with PDFDocument(pdf_path) as document:
+            page_count = document.page_count
+            backend = document.backend
+            if self.max_workers <= 1 or page_count < MIN_PAGES_FOR_WORKERS:
+                extractor = self.components.extractor(criteria_code)
+                return [_process_page(document, page_num, extractor) for page_num in range(page_count)]
+
+        workers = min(self.max_workers, page_count)
+        run_length = -(-page_count // workers)
+        runs = [range(start, min(start + run_length, page_count)) for start in range(0, page_count, run_length)]
+
+        if self._pool is None:
+            # Spawned, not forked: the pool is created from a request thread of a
+            # threaded server, and forking copies whatever locks other threads hold
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        futures = [
+            self._pool.submit(_process_page_range, pdf_path, list(run), criteria_code, backend)
+            for run in runs
+        ]
+        return [result for future in futures for result in future.result()]
+
+    def _ocr_pages(self, pdf_path, criteria_code, results):
+        """OCR the given image-only pages and extract their fields, updating their results"""
+        if not results or not self.ocr.available:
+            return
+
+        with PDFDocument(pdf_path) as document, tempfile.TemporaryDirectory() as directory:
+            if document.backend != "pymupdf":
+                print(f"Skipping OCR of {len(results)} image-only pages: rendering needs PyMuPDF")
+                return
+            image_paths = []
+            for result in results:
+                image_path = os.path.join(directory, f"page_{result['page_num'] + 1}.png")
+                document.render_page(result["page_num"], image_path, dpi=OCR_RENDER_DPI)
+                image_paths.append(image_path)
+            texts = self.ocr.extract_text_from_images(image_paths)
+
+        extractor = self.components.extractor(criteria_code)
+        for result, text in zip(results, texts):
+            result["text_length"] = len(text)
+            result["has_text"] = len(text.strip()) >= MIN_PAGE_TEXT_CHARS
+            result["ocr"] = True
+            _extract_fields(result, text, extractor)
+
+    def close(self):
+        """Shut down the page and OCR worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        self.ocr.close()
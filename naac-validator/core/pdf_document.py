@@ -0,0 +1,80 @@
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+from PyPDF2 import PdfReader
+
+from config import Config
+
+
+class PDFDocument:
+    """
+    A PDF opened and parsed once for a whole validation run
+
+    Pages are read from the same parsed document instead of reopening the
+    file for every page. Uses PyMuPDF when it is installed (faster and
+    lazier), otherwise PyPDF2. Use as a context manager, or call close().
+    """
+
+    def __init__(self, pdf_path, backend=None):
+        self.pdf_path = pdf_path
+        self.backend = backend or Config.PDF_BACKEND
+        if self.backend == "auto":
+            self.backend = "pymupdf" if PYMUPDF_AVAILABLE else "pypdf2"
+
+        if self.backend not in ("pymupdf", "pypdf2"):
+            raise ValueError(f"Unknown PDF backend {self.backend!r}, expected auto, pymupdf or pypdf2")
+        if self.backend == "pymupdf" and not PYMUPDF_AVAILABLE:
+            raise ImportError("PDF backend pymupdf requires PyMuPDF (pip install pymupdf)")
+
+        if self.backend == "pymupdf":
+            self._doc = fitz.open(pdf_path)
+            self.page_count = len(self._doc)
+        else:
+            self._doc = PdfReader(pdf_path)
+            self.page_count = len(self._doc.pages)
+
+    def page_text(self, page_num):
+        """Text of one page (0-based), or "" if it cannot be extracted"""
+        try:
+            if self.backend == "pymupdf":
+                return self._doc[page_num].get_text("text")
+            return self._doc.pages[page_num].extract_text() or ""
+        except Exception as e:
+            print(f"Error extracting text from page {page_num}: {e}")
+            return ""
+
+    def page_has_images(self, page_num):
+        """Whether a page (0-based) draws any raster images, e.g. a scanned certificate"""
+        try:
+            if self.backend == "pymupdf":
+                return bool(self._doc[page_num].get_images())
+            return bool(self._doc.pages[page_num].images)
+        except Exception as e:
+            print(f"Error listing images on page {page_num}: {e}")
+            return False
+
+    def render_page(self, page_num, image_path, dpi=300):
+        """Render a page (0-based) to a PNG file for OCR; only PyMuPDF can render pages"""
+        if self.backend != "pymupdf":
+            raise RuntimeError("Rendering PDF pages requires the pymupdf backend")
+        self._doc[page_num].get_pixmap(dpi=dpi).save(image_path)
+
+    def iter_pages(self):
+        """Yield (page_num, text) for every page in order, extracting each page only when reached"""
+        for page_num in range(self.page_count):
+            yield page_num, self.page_text(page_num)
+
+    def close(self):
+        if self.backend == "pymupdf" and self._doc is not None:
+            self._doc.close()
+        self._doc = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,139 @@
+from collections import Counter
+from difflib import SequenceMatcher
+
+# Words of the other fields (names, titles) also index records, so a page whose
+# year or amount was misread as another record's still reaches its own record.
+# Words this short, or shared by more records than this, are not selective.
+MIN_INDEX_WORD_LENGTH = 3
+MAX_WORD_BUCKET = 5
+
+
+def is_blocking_field(field):
+    """Year and amount fields are selective enough to index records by"""
+    return "year" in field or "amount" in field
+
+
+class RecordMatcher:
+    """
+    Assigns document pages to database records by their extracted fields
+
+    Each page is scored against candidate records field by field: the
+    similarity of the normalized values (1.0 when they are equal, as the
+    validator compares them), divided by how many records share the
+    record's value, so a year common to every record counts for little
+    while a misread but unique project name still counts. Candidates come from an
+    index of records by their year and amount values: a page is compared
+    only with the records sharing its most selective value (an amount is
+    usually unique, a year is not), or with every record if none of its
+    year/amount values appear in the index, plus the records sharing a
+    selective word of its other fields. Pairs are then taken greedily,
+    best score first, ties going to the record closest to the page's position. Pages
+    and records left over are paired in order, as before matching existed.
+    """
+
+    def __init__(self, validator):
+        self.validator = validator
+
+    def match(self, page_fields, records):
+        """
+        Assign pages to records
+
+        page_fields is a list of (page_number, extracted_fields) in page
+        order. Returns {"pairs": [{"page_number", "record_index", "score",
+        "method"}], "unmatched_pages": [page_number], "unmatched_records":
+        [record_index]}. method is "matched" for pairs chosen by score and
+        "positional" for leftovers paired in order.
+        """
+        normalized_records = [
+            {field: self.validator.normalize_value(value) for field, value in record.items()}
+            for record in records
+        ]
+        value_counts = Counter(
+            (field, value) for record in normalized_records for field, value in record.items() if value
+        )
+        index = self._build_index(normalized_records)
+        word_index = self._build_word_index(normalized_records)
+        candidate_pairs = []
+        for position, (page_number, fields) in enumerate(page_fields):
+            page_values = {field: self.validator.normalize_value(value) for field, value in fields.items()}
+            for record_index in self._candidates(page_values, index, word_index, len(records)):
+                score = self._score(page_values, normalized_records[record_index], value_counts)
+                if score > 0:
+                    candidate_pairs.append((-score, abs(position - record_index), position, record_index))
+        candidate_pairs.sort()
+
+        page_records = {}
+        used_records = set()
+        scores = {}
+        for negative_score, _, position, record_index in candidate_pairs:
+            if position in page_records or record_index in used_records:
+                continue
+            page_records[position] = record_index
+            used_records.add(record_index)
+            scores[position] = -negative_score
+
+        leftover_records = [i for i in range(len(records)) if i not in used_records]
+        leftover_pages = [position for position in range(len(page_fields)) if position not in page_records]
+        positional = dict(zip(leftover_pages, leftover_records))
+
+        pairs = []
+        for position, (page_number, fields) in enumerate(page_fields):
+            if position in page_records:
+                pairs.append({"page_number": page_number, "record_index": page_records[position],
+                              "score": round(scores[position], 3), "method": "matched"})
+            elif position in positional:
+                pairs.append({"page_number": page_number, "record_index": positional[position],
+                              "score": 0, "method": "positional"})
+
+        return {
+            "pairs": pairs,
+            "unmatched_pages": [page_fields[position][0] for position in leftover_pages[len(positional):]],
+            "unmatched_records": leftover_records[len(positional):]
+        }
+
+    def _score(self, page_values, record_values, value_counts):
+        score = 0.0
+        for field, page_value in page_values.items():
+            record_value = record_values.get(field, "")
+            if not page_value or not record_value:
+                continue
+            if page_value == record_value:
+                similarity = 1.0
+            else:
+                similarity = SequenceMatcher(None, page_value, record_value).ratio()
+            score += similarity / value_counts[(field, record_value)]
+        return score
+
+    def _build_index(self, normalized_records):
+        """(field, normalized value) -> indices of records with that year/amount value"""
+        index = {}
+        for record_index, record in enumerate(normalized_records):
+            for field, value in record.items():
+                if value and is_blocking_field(field):
+                    index.setdefault((field, value), []).append(record_index)
+        return index
+
+    def _build_word_index(self, normalized_records):
+        """(field, word) -> indices of records with that word in a non-year/amount value, for selective words"""
+        index = {}
+        for record_index, record in enumerate(normalized_records):
+            for field, value in record.items():
+                if value and not is_blocking_field(field):
+                    for word in set(value.split()):
+                        if len(word) >= MIN_INDEX_WORD_LENGTH:
+                            index.setdefault((field, word), []).append(record_index)
+        return {key: indices for key, indices in index.items() if len(indices) <= MAX_WORD_BUCKET}
+
+    def _candidates(self, page_values, index, word_index, record_count):
+        buckets = [
+            index[(field, value)] for field, value in page_values.items()
+            if value and is_blocking_field(field) and (field, value) in index
+        ]
+        if not buckets:
+            return range(record_count)
+        candidates = set(min(buckets, key=len))
+        for field, value in page_values.items():
+            if value and not is_blocking_field(field):
+                for word in set(value.split()):
+                    candidates.update(word_index.get((field, word), ()))
+        return sorted(candidates)
@@ -46,6 +46,10 @@ class DocumentValidator:
         
         return validation_result
     
+    def normalize_value(self, value):
+        """Normalized form of a field value, as used for comparison (empty string for missing values)"""
+        return self._normalize_text(str(value)) if value else ""
+    
     def _fields_match(self, extracted, database):
         """Check if extracted field matches database field with normalization"""
         if not extracted or not database:
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Test Suite for NAAC Validator
+
+Offline tests of the page-to-record matching used by /validate.
+No database or PDF is needed.
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+GRANT_RECORDS = [
+    {"name_of_project": "Solar Desalination Membranes", "name_of_principal_investigator": "Dr. Anita Rao",
+     "year_of_award": "2021-22", "amount_sanctioned": "12.5"},
+    {"name_of_project": "Graphene Battery Anodes", "name_of_principal_investigator": "Dr. Vikram Sen",
+     "year_of_award": "2021-22", "amount_sanctioned": "18.5"},
+    {"name_of_project": "Rural Water Quality Sensors", "name_of_principal_investigator": "Dr. Meera Iyer",
+     "year_of_award": "2022-23", "amount_sanctioned": "7.0"},
+    {"name_of_project": "Bamboo Composite Panels", "name_of_principal_investigator": "Dr. Kiran Das",
+     "year_of_award": "2023-24", "amount_sanctioned": "4.2"}
+]
+
+def _matcher():
+    from core.record_matcher import RecordMatcher
+    from core.validator import DocumentValidator
+
+    return RecordMatcher(DocumentValidator("3.1.1"))
+
+def _page_records(match):
+    """page_number -> (record_index, method)"""
+    return {pair["page_number"]: (pair["record_index"], pair["method"]) for pair in match["pairs"]}
+
+def test_cover_page_and_shuffled_records():
+    """Test that pages find their records by content when a cover page shifts them"""
+    print("📄 Testing Cover Page + Shuffled Records...")
+
+    # Certificates are in a different order than the database rows, after a cover page
+    page_fields = [(1, {})] + [
+        (page_number, dict(GRANT_RECORDS[record_index]))
+        for page_number, record_index in [(2, 2), (3, 0), (4, 3), (5, 1)]
+    ]
+    # OCR noise on one certificate
+    page_fields[2][1]["name_of_principal_investigator"] = "Dr. Anlta Ra0"
+
+    match = _matcher().match(page_fields, GRANT_RECORDS)
+
+    assert _page_records(match) == {
+        2: (2, "matched"), 3: (0, "matched"), 4: (3, "matched"), 5: (1, "matched")
+    }, match["pairs"]
+    assert match["unmatched_pages"] == [1], "the cover page is left over, not given a record"
+    assert match["unmatched_records"] == []
+
+    print("   ✅ Every certificate matched its own record; the cover page is left over")
+    return True
+
+def test_misread_amount_of_another_record():
+    """Test that a page whose amount was misread as another record's amount still finds its record"""
+    print("🔢 Testing Misread Amount Equal to Another Record's...")
+
+    page_fields = [
+        (1, {}),
+        (2, dict(GRANT_RECORDS[2])),
+        # 12.5 misread as 18.5, which is record 1's amount: the amount index alone
+        # would only offer record 1 for this page
+        (3, dict(GRANT_RECORDS[0], amount_sanctioned="18.5")),
+        (4, dict(GRANT_RECORDS[1]))
+    ]
+
+    match = _matcher().match(page_fields, GRANT_RECORDS)
+
+    assert _page_records(match) == {
+        2: (2, "matched"), 3: (0, "matched"), 4: (1, "matched"), 1: (3, "positional")
+    }, match["pairs"]
+
+    print("   ✅ The misread page matched its own record, not the one sharing its amount")
+    return True
+
+def test_positional_fallback():
+    """Test that pages with no usable fields are paired with leftover records in order"""
+    print("↔️  Testing Positional Fallback...")
+
+    page_fields = [(1, dict(GRANT_RECORDS[1])), (2, {}), (3, {}), (4, {})]
+    match = _matcher().match(page_fields, GRANT_RECORDS[:3])
+
+    assert _page_records(match) == {1: (1, "matched"), 2: (0, "positional"), 3: (2, "positional")}, match["pairs"]
+    assert match["unmatched_pages"] == [4]
+    assert match["unmatched_records"] == []
+
+    print("   ✅ Leftover pages and records are paired in order")
+    return True
+
+class _FakeOCR:
+    """OCRProcessor stand-in that answers every image with the same text and records the images"""
+
+    available = True
+
+    def __init__(self, text):
+        self.text = text
+        self.images = []
+
+    def extract_text_from_images(self, image_paths):
+        self.images.extend(Path(path).name for path in image_paths)
+        return [self.text] * len(image_paths)
+
+    def close(self):
+        pass
+
+def test_image_page_ocr():
+    """Test that image-only pages are sent to OCR and get their fields extracted"""
+    print("🖼️  Testing OCR of Image-Only Pages...")
+
+    import io
+    import tempfile
+    import fitz
+    from PIL import Image
+    from core.page_processor import PageProcessor
+
+    certificate = ("Name of the Project: Solar Desalination Membranes\n"
+                   "Principal Investigator: Dr. Anita Rao\nYear of Award: 2021-22")
+    scan = io.BytesIO()
+    Image.new("L", (850, 1100), 255).save(scan, format="PNG")
+
+    with tempfile.TemporaryDirectory() as directory:
+        pdf_path = Path(directory) / "certificates.pdf"
+        doc = fitz.open()
+        doc.new_page().insert_text((72, 72), certificate, fontsize=11)
+        doc.new_page().insert_image(fitz.Rect(0, 0, 595, 842), stream=scan.getvalue())
+        doc.new_page()  # Blank: nothing to OCR
+        doc.save(str(pdf_path))
+        doc.close()
+
+        ocr = _FakeOCR(certificate)
+        processor = PageProcessor(max_workers=1, ocr=ocr)
+        try:
+            pages = processor.process_pages(str(pdf_path), "3.1.1")
+        finally:
+            processor.close()
+
+    assert ocr.images == ["page_2.png"], ocr.images
+    assert [(page["has_text"], page["ocr"]) for page in pages] == [(True, False), (True, True), (False, False)]
+    assert pages[1]["fields"] == pages[0]["fields"] and pages[1]["fields"], pages[1]["fields"]
+
+    print("   ✅ Only the scanned page was OCR'd, and its fields match the text page's")
+    return True
+
+def main():
+    """Main test runner"""
+    print("🧪 NAAC Validator - Test Suite")
+    print("=" * 50)
+
+    tests = [
+        test_cover_page_and_shuffled_records,
+        test_misread_amount_of_another_record,
+        test_positional_fallback,
+        test_image_page_ocr,
+    ]
+
+    tests_passed = 0
+    for test in tests:
+        try:
+            if test():
+                tests_passed += 1
+        except AssertionError as e:
+            print(f"   ❌ {test.__name__} failed: {str(e) or 'assertion failed'}")
+        except Exception as e:
+            print(f"   ❌ {test.__name__} errored: {type(e).__name__}: {str(e)}")
+
+    print(f"\n📊 Test Results: {tests_passed}/{len(tests)} tests passed")
+    return tests_passed == len(tests)
+
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,8 @@ class JSONOutput:
     def __init__(self):
         pass
     
-    def generate_validation_report(self, criteria_code, validation_results, failed_page=None):
-        """Generate final validation JSON report"""
+    def generate_validation_report(self, criteria_code, validation_results, failed_page=None, record_mapping=None):
+        """Generate final validation JSON report (with the page-to-record mapping when pages were matched)"""
         report = {
             "criteria_code": criteria_code,
             "timestamp": datetime.now().isoformat(),
@@ -19,6 +19,8 @@ class JSONOutput:
             "page_results": validation_results,
             "failed_page": failed_page
         }
+        if record_mapping is not None:
+            report["record_mapping"] = record_mapping
         
         # Calculate summary
         for result in validation_results: